@@ -0,0 +1,46 @@
+# bench_constraint_plan.py
+
+import time
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import PhonemeGenerator
+
+from bench_generate import INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS
+
+
+def generate_by_constraint(generator, syllable_length, rng):
+    # The syllable loop before constraint plans: the constraint is chosen and
+    # the inventory looked up for every syllable
+    syllables = []
+    for i in range(syllable_length):
+        syllable = []
+        for cons in generator.syllable_constraint(i):
+            if (cons.optional and rng.random() < cons.probability) or not cons.optional:
+                syllable.append(rng.choice(generator.inventory[cons.phoneme]))
+        syllables.append(syllable)
+    return syllables
+
+
+def main(syllable_length: int = 3, n: int = 100000):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=1)
+    print(f"{n} words of {syllable_length} syllables")
+    rng = generator.rng.spawn()[0]
+    start = time.perf_counter()
+    for _ in range(n):
+        generate_by_constraint(generator, syllable_length, rng)
+    constraints = time.perf_counter() - start
+    print(f"per syllable lookups:  {constraints / n * 1e6:8.2f} us/word")
+    rng = generator.rng.spawn()[0]
+    start = time.perf_counter()
+    for _ in range(n):
+        list(generator._generate_syllables(syllable_length, rng))
+    plan = time.perf_counter() - start
+    print(f"constraint plan:       {plan / n * 1e6:8.2f} us/word  ({constraints / plan:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
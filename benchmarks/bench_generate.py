@@ -0,0 +1,55 @@
+# bench_generate.py
+
+import time
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+
+from ipapy.ipachar import IPAChar
+
+INVENTORY = [
+    IPAChar("plosive bilabial voiceless consonant"),
+    IPAChar("plosive alveolar voiceless consonant"),
+    IPAChar("plosive velar voiceless consonant"),
+    IPAChar("nasal bilabial voiced consonant"),
+    IPAChar("nasal alveolar voiced consonant"),
+    IPAChar("open front unrounded vowel"),
+    IPAChar("close front unrounded vowel"),
+    IPAChar("close back rounded vowel"),
+]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.VOWEL),
+)
+
+SECONDARY_CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT),
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+
+def time_call(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(syllable_length: int = 3, n: int = 100000):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+    print(f"{n} words of {syllable_length} syllables")
+    scalar = time_call(generator.generate_random, syllable_length, n)
+    print(f"generate_random:          {scalar:8.3f} s")
+    batch = time_call(generator.generate_batch, syllable_length, n)
+    print(f"generate_batch:           {batch:8.3f} s  ({scalar / batch:.1f}x)")
+    rendered = time_call(lambda: generator.generate_batch(syllable_length, n).to_strings())
+    print(f"generate_batch + render:  {rendered:8.3f} s  ({scalar / rendered:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# bench_import.py
+
+import subprocess
+import sys
+from os import path
+
+SRC_DIR = path.abspath(path.join(path.dirname(__file__), '../src'))
+
+IMPORT_SCRIPT = """
+import sys, time
+sys.path.append({src!r})
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+CASES = {
+    "import ipapy": "import ipapy",
+    "import phonology": "import phonology",
+    "import phonology + first use": "import phonology\nphonology.index_phoneme_types()",
+}
+
+
+def time_statement(statement: str, repeat: int) -> float:
+    """Time a statement in fresh interpreters and return the fastest run in seconds."""
+    script = IMPORT_SCRIPT.format(src=SRC_DIR, statement=statement)
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        timings.append(float(result.stdout))
+    return min(timings)
+
+
+def main(repeat: int = 7):
+    for name, statement in CASES.items():
+        print(f"{name:30} {time_statement(statement, repeat) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
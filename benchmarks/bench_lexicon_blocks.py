@@ -0,0 +1,52 @@
+# bench_lexicon_blocks.py
+
+import tempfile
+import time
+
+# Add the source directory to the path so we can import the modules we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import PhonemeGenerator
+from project_reader import ProjectReader
+from wordweaver_project import WordweaverProject
+
+from bench_generate import INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS
+
+FORMATS = (
+    ("version 1", 1, None),
+    ("version 2", 2, None),
+    ("version 2 zlib", 2, "zlib"),
+    ("version 2 lzma", 2, "lzma"),
+)
+
+
+def main(syllable_length: int = 5, n: int = 200000):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=1)
+    symbols = [char.unicode_repr for char in INVENTORY]
+    lexicon = dict.fromkeys(map(str, generator.word_space(syllable_length).sample(n, rng=n)), "")
+    print(f"{len(lexicon)} words")
+    print(f"{'format':16} {'bytes':>10} {'save':>8} {'load':>8} {'lookup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        project = WordweaverProject("Benchmark", path.join(directory, "lexicon.wwproj"),
+                                    pulmonic_inventory=symbols[:5], vowel_inventory=symbols[5:], lexicon=lexicon)
+        for name, version, compression in FORMATS:
+            start = time.perf_counter()
+            project.save(version=version, compression=compression)
+            save = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded = WordweaverProject.from_file(project.file)
+            load = time.perf_counter() - start
+            assert loaded.lexicon.keys() == lexicon.keys()
+            # a cold lookup, which builds the offset index of an uncompressed lexicon in the
+            # temporary directory rather than the user cache
+            start = time.perf_counter()
+            with ProjectReader(project.file, path.join(directory, f"{version}{compression}.idx")) as reader:
+                reader.lexicon[len(reader) // 2]
+            lookup = time.perf_counter() - start
+            print(f"{name:16} {path.getsize(project.file):10} {save:8.3f} {load:8.3f} {lookup:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# bench_markov.py
+
+import random
+import time
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology_markov import MarkovGenerator
+
+SYLLABLES = ["pa", "ta", "ka", "ni", "mu", "so", "le", "ri", "t͡ʃa", "ŋo"]
+
+
+def main(order: int = 2, lexicon_size: int = 20000, n: int = 500000):
+    rng = random.Random(0)
+    lexicon = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(lexicon_size)]
+    generator = MarkovGenerator(order, rng=1)
+    start = time.perf_counter()
+    generator.train(lexicon)
+    train = time.perf_counter() - start
+    print(f"train {lexicon_size} words:     {train:8.3f} s  ({generator.nbytes} bytes of counts)")
+    start = time.perf_counter()
+    generator.generate(n)
+    sample = time.perf_counter() - start
+    print(f"sample {n} words:   {sample:8.3f} s  ({n / sample:,.0f} words/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# bench_parallel.py
+
+import time
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import cpu_count, path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import PhonemeGenerator
+
+from bench_generate import INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS
+
+
+def main(syllable_length: int = 3, n: int = 1000000):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=0)
+    print(f"{n} words of {syllable_length} syllables")
+    serial = None
+    workers = 1
+    while workers <= (cpu_count() or 1):
+        start = time.perf_counter()
+        generator.generate_parallel(syllable_length, n, workers=workers)
+        elapsed = time.perf_counter() - start
+        serial = serial or elapsed
+        print(f"{workers:3} workers: {elapsed:8.3f} s  ({serial / elapsed:.1f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
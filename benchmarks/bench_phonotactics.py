@@ -0,0 +1,41 @@
+# bench_phonotactics.py
+
+import re
+import time
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import PhonemeGenerator
+from phonotactics import PhonotacticRule, PhonotacticFilter
+
+from bench_generate import INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS
+
+CONSONANTS = ["p", "t", "k", "m", "n"]
+
+RULES = [PhonotacticRule.geminates("geminate", CONSONANTS)] + [
+    PhonotacticRule.sequence(f"no {a}{b}", a, b) for a in CONSONANTS for b in CONSONANTS if a != b and b in "ptk"
+]
+
+
+def main(syllable_length: int = 3, n: int = 200000):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=1)
+    words = list(generator.iter_words(syllable_length, n))
+    print(f"{n} words of {syllable_length} syllables, {len(RULES)} rules")
+    start = time.perf_counter()
+    patterns = [re.compile('|'.join(''.join(p) for p in rule.patterns)) for rule in RULES]
+    kept_regex = [word for word in words if not any(pattern.search(word) for pattern in patterns)]
+    regex = time.perf_counter() - start
+    print(f"regex per rule:  {regex:8.3f} s")
+    start = time.perf_counter()
+    phonotactics = PhonotacticFilter(RULES, generator.alphabet)
+    kept = list(phonotactics.filter(words))
+    automaton = time.perf_counter() - start
+    print(f"automaton:       {automaton:8.3f} s  ({regex / automaton:.1f}x)")
+    assert kept == kept_regex
+
+
+if __name__ == "__main__":
+    main()
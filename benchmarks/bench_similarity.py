@@ -0,0 +1,45 @@
+# bench_similarity.py
+
+import time
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import PhonemeGenerator
+from similarity import SimilarityIndex
+from wordweaver_project import WordweaverProject
+
+from bench_generate import INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS
+
+
+def main(syllable_length: int = 2, n: int = 20000, queries: int = 100, k: float = 1):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=1)
+    words = list(dict.fromkeys(generator.iter_words(syllable_length, n)))
+    candidates = list(generator.iter_words(syllable_length, queries))
+    symbols = [char.unicode_repr for char in INVENTORY]
+    project = WordweaverProject("Benchmark", pulmonic_inventory=symbols[:5], vowel_inventory=symbols[5:],
+                                lexicon=dict.fromkeys(words, ""))
+    print(f"{len(words)} words, {queries} candidates within {k}")
+    start = time.perf_counter()
+    index = SimilarityIndex.from_project(project)
+    print(f"build index:     {time.perf_counter() - start:8.3f} s")
+    distance = index.distance
+    encoded = [distance.encode(word) for word in words]
+    start = time.perf_counter()
+    linear = {}
+    for candidate in candidates:
+        ids = distance.encode(candidate)
+        linear[candidate] = sorted((d, w) for w, other in zip(words, encoded) if (d := distance.between(ids, other)) <= k)
+    scan = time.perf_counter() - start
+    print(f"linear scan:     {scan:8.3f} s")
+    start = time.perf_counter()
+    results = index.screen(candidates, k)
+    tree = time.perf_counter() - start
+    print(f"BK-tree:         {tree:8.3f} s  ({scan / tree:.1f}x)")
+    assert results == linear
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# bench_sort_inventory.py
+
+import timeit
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeGenerator
+
+from ipapy import IPA_CHARS
+
+
+def sort_inventory_scan(inventory):
+    """Classify an inventory by comparing each phoneme against every enum member."""
+    inv = {t: [] for t in Phonemes}
+    for phoneme in inventory:
+        for phoneme_name in Phonemes._member_names_:
+            t = Phonemes[phoneme_name]
+            for char in t.value:
+                if char.is_equivalent(phoneme):
+                    inv[t].append(phoneme)
+    return inv
+
+
+def main(repeat: int = 5, number: int = 20):
+    inventory = [char for char in IPA_CHARS if char.is_consonant or char.is_vowel][::8]
+    generator = PhonemeGenerator(inventory)
+    if generator.inventory != sort_inventory_scan(inventory):
+        raise AssertionError("Indexed classification differs from the scan.")
+    scan = min(timeit.repeat(lambda: sort_inventory_scan(inventory), repeat=repeat, number=number)) / number
+    indexed = min(timeit.repeat(lambda: generator._sort_inventory(inventory), repeat=repeat, number=number)) / number
+    print(f"inventory size: {len(inventory)} phonemes")
+    print(f"scan:           {scan * 1e6:10.1f} us")
+    print(f"indexed:        {indexed * 1e6:10.1f} us")
+    print(f"speedup:        {scan / indexed:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
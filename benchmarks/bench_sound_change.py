@@ -0,0 +1,45 @@
+# bench_sound_change.py
+
+import random
+import time
+
+# Add the source directory to the path so we can import the module we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from sound_change import SoundChangeCascade
+
+SYLLABLES = ["pa", "ta", "ka", "pi", "ti", "ki", "se", "mo", "nu", "la", "ap", "ek"]
+
+RULES = [
+    "[voiceless plosive] > [voiced] / V_V",
+    "p > f / V_V",
+    "e > ∅ / _#",
+    "∅ > ə / C_C#",
+    "{s,z} > {ʃ,ʒ} / _i",
+    "k > t͡ʃ / _[front]",
+    "a > ɑ / _[nasal]",
+    "u > o / _#",
+    "l > ɾ / V_V",
+    "m > n / _#",
+] * 3
+
+
+def main(n: int = 100000):
+    rng = random.Random(0)
+    words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(n)]
+    cascade = SoundChangeCascade(RULES)
+    start = time.perf_counter()
+    cascade.apply(words)
+    full = time.perf_counter() - start
+    print(f"{len(RULES)} rules over {n} words:  {full:8.3f} s")
+    cascade[-2] = "l > r / V_V"
+    start = time.perf_counter()
+    cascade.apply(words)
+    edited = time.perf_counter() - start
+    print(f"after editing rule {len(RULES) - 2}:     {edited:8.3f} s  ({cascade.applied} rules applied)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# suite.py
+
+import argparse
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+from glob import glob
+
+# Add the source directory to the path so we can import the modules we want to benchmark
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import PhonemeGenerator
+from project_reader import ProjectReader
+from wordweaver_project import WordweaverProject
+
+from bench_generate import INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS
+from bench_import import SRC_DIR, time_statement
+
+from ipapy import IPA_CHARS
+
+# Version of the results file format
+RESULTS_VERSION = 1
+
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+QUICK_SIZES = (10 ** 3, 10 ** 4)
+
+
+def best_time(function, repeat: int) -> float:
+    """Run a function ``repeat`` times and return the fastest run in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def repeats_for(n: int) -> int:
+    # Large cases take long enough that one run is stable
+    return 5 if n <= 10 ** 4 else 3 if n <= 10 ** 5 else 1
+
+
+def bench_construction(results: dict, sizes: tuple[int, ...]):
+    results["PhonemeGenerator()"] = {
+        "seconds": best_time(lambda: PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS), 20),
+        "n": 1,
+    }
+    inventory = [char for char in IPA_CHARS if char.is_consonant or char.is_vowel][::8]
+    generator = PhonemeGenerator(inventory)
+    results["_sort_inventory"] = {
+        "seconds": best_time(lambda: generator._sort_inventory(inventory), 20),
+        "n": len(inventory),
+    }
+
+
+def bench_generation(results: dict, sizes: tuple[int, ...]):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=1)
+    for n in sizes:
+        results[f"generate_syllables[{n}]"] = {
+            "seconds": best_time(lambda: list(generator.generate_syllables(n)), repeats_for(n)),
+            "n": n,
+        }
+        results[f"generate_random[{n}]"] = {
+            "seconds": best_time(lambda: generator.generate_random(3, n), repeats_for(n)),
+            "n": n,
+        }
+
+
+def bench_serialization(results: dict, sizes: tuple[int, ...]):
+    generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=1)
+    symbols = [char.unicode_repr for char in INVENTORY]
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            lexicon = dict.fromkeys(generator.word_space(5).sample(n, rng=n), "")
+            project = WordweaverProject("Benchmark", path.join(directory, f"lexicon_{n}.wwproj"),
+                                        pulmonic_inventory=symbols[:5], vowel_inventory=symbols[5:],
+                                        lexicon=lexicon)
+            results[f"save[{n}]"] = {"seconds": best_time(project.save, repeats_for(n)), "n": n}
+            results[f"from_file[{n}]"] = {
+                "seconds": best_time(lambda: WordweaverProject.from_file(project.file), repeats_for(n)),
+                "n": n,
+            }
+            # the first read builds the offset index of an uncompressed lexicon; the timed runs open with it
+            with ProjectReader(project.file) as reader:
+                reader.lexicon[0]
+            results[f"ProjectReader[{n}]"] = {
+                "seconds": best_time(lambda: _read_middle(project.file), repeats_for(n)),
+                "n": n,
+            }
+
+
+def _read_middle(file):
+    with ProjectReader(file) as reader:
+        return reader.lexicon[len(reader) // 2]
+
+
+def bench_imports(results: dict, sizes: tuple[int, ...]):
+    for module in sorted(path.splitext(path.basename(file))[0] for file in glob(path.join(SRC_DIR, "*.py"))):
+        try:
+            seconds = time_statement(f"import {module}", 5)
+        except Exception:
+            # modules that need the GUI toolkit cannot be imported without it
+            continue
+        results[f"import {module}"] = {"seconds": seconds, "n": 1}
+
+
+GROUPS = {
+    "construction": bench_construction,
+    "generation": bench_generation,
+    "serialization": bench_serialization,
+    "imports": bench_imports,
+}
+
+
+def run(groups: list[str], sizes: tuple[int, ...]) -> dict:
+    """Run benchmark groups and return the results in the JSON format.
+
+    Arguments:
+        groups: list[str]: The names of the groups in ``GROUPS`` to run.
+        sizes: tuple[int, ...]: The numbers of words to generate and save.
+
+    Returns:
+        dict: The results, with the fastest time of each case in seconds.
+    """
+    results = {}
+    for group in groups:
+        GROUPS[group](results, sizes)
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print each case against a baseline and return the cases that regressed.
+
+    Arguments:
+        current: dict: The new results.
+        baseline: dict: The stored results.
+        threshold: float: The slowdown that counts as a regression, such as 0.1 for 10%.
+
+    Returns:
+        list[str]: The names of the regressed cases.
+    """
+    regressions = []
+    print(f"{'case':32} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            print(f"{name:32} {'-':>12} {result['seconds']:12.6f} {'new':>8}")
+            continue
+        before = baseline["results"][name]["seconds"]
+        ratio = result["seconds"] / before if before else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:32} {before:12.6f} {result['seconds']:12.6f} {ratio:8.2f}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the generation and serialization hot paths.")
+    parser.add_argument("--output", "-o", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", "-c", help="Compare the results against a baseline JSON file.")
+    parser.add_argument("--threshold", "-t", type=float, default=0.1,
+                        help="The slowdown that counts as a regression (default: 0.1).")
+    parser.add_argument("--group", "-g", action="append", choices=list(GROUPS),
+                        help="Only run this group; may be given more than once.")
+    parser.add_argument("--quick", "-q", action="store_true", help="Only run the sizes up to 10^4.")
+    args = parser.parse_args(argv)
+    current = run(args.group or list(GROUPS), QUICK_SIZES if args.quick else SIZES)
+    if args.output:
+        with open(args.output, "w") as f_out:
+            json.dump(current, f_out, indent=2)
+    if args.compare:
+        with open(args.compare) as f_in:
+            baseline = json.load(f_in)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    else:
+        for name, result in current["results"].items():
+            print(f"{name:32} {result['seconds']:12.6f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+# instrumentation.py
+
+import os
+import time
+from _thread import get_ident
+from functools import wraps
+
+# The recorder of the current session, or None when instrumentation is off.
+# Every hook checks this one global first, so disabled hooks cost a lookup.
+_recorder = None
+
+
+class Recorder:
+    def __init__(self):
+        """
+        Initialize a store of timing spans and counters.
+
+        Spans are kept as ``(name, start, duration, thread, args)`` tuples in
+        nanoseconds from ``time.perf_counter_ns`` and counters as running
+        totals by name.
+        """
+        self.spans = []
+        self.counters = {}
+        self.origin = time.perf_counter_ns()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter_ns()
+        recorder = _recorder
+        if recorder is not None:
+            recorder.spans.append((self.name, self.start, end - self.start, get_ident(), self.args))
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable() -> Recorder:
+    """Start recording spans and counters, discarding any earlier recording.
+
+    Returns:
+        Recorder: The new recorder.
+    """
+    global _recorder
+    _recorder = Recorder()
+    return _recorder
+
+
+def disable() -> Recorder | None:
+    """Stop recording.
+
+    Returns:
+        Recorder | None: The recorder that was in use, or None if recording was off.
+    """
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def span(name: str, **args):
+    """Time a block of code with ``with span("name"):``.
+
+    Arguments:
+        name: str: The name of the span.
+        **args: Values shown with the span in a trace viewer.
+
+    Returns:
+        A context manager; it does nothing while instrumentation is off.
+    """
+    if _recorder is None:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str | None = None):
+    """Decorate a function so every call is recorded as a span.
+
+    Arguments:
+        name: str | None: The name of the span; the qualified name of the function if None.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(function):
+        label = name if name is not None else function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return function(*args, **kwargs)
+            with _Span(label, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: int = 1):
+    """Add to a counter.
+
+    Arguments:
+        name: str: The name of the counter.
+        value: int: The amount to add.
+    """
+    recorder = _recorder
+    if recorder is not None:
+        recorder.counters[name] = recorder.counters.get(name, 0) + value
+
+
+def chrome_trace(recorder: Recorder | None = None) -> dict:
+    """Get the recording as Chrome trace events, for ``chrome://tracing`` or Perfetto.
+
+    Arguments:
+        recorder: Recorder | None: The recording; the current one if None.
+
+    Returns:
+        dict: The trace, ready to be written as JSON.
+    """
+    recorder = recorder if recorder is not None else _recorder
+    if recorder is None:
+        return {"traceEvents": []}
+    pid = os.getpid()
+    events = [
+        {"name": name, "ph": "X", "ts": (start - recorder.origin) / 1000, "dur": duration / 1000,
+         "pid": pid, "tid": thread, "args": args}
+        for name, start, duration, thread, args in recorder.spans
+    ]
+    end = max((start + duration for _, start, duration, _, _ in recorder.spans), default=recorder.origin)
+    events.extend(
+        {"name": name, "ph": "C", "ts": (end - recorder.origin) / 1000, "pid": pid, "args": {name: value}}
+        for name, value in recorder.counters.items()
+    )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def summary(recorder: Recorder | None = None) -> str:
+    """Get the recording as a table of calls and times per span, followed by the counters.
+
+    Arguments:
+        recorder: Recorder | None: The recording; the current one if None.
+
+    Returns:
+        str: The table.
+    """
+    recorder = recorder if recorder is not None else _recorder
+    if recorder is None:
+        return "Instrumentation is disabled."
+    totals = {}
+    for name, _, duration, _, _ in recorder.spans:
+        calls, total, longest = totals.get(name, (0, 0, 0))
+        totals[name] = (calls + 1, total + duration, max(longest, duration))
+    lines = [f"{'span':40} {'calls':>8} {'total ms':>12} {'mean ms':>10} {'max ms':>10}"]
+    for name, (calls, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:40} {calls:8} {total / 1e6:12.3f} {total / calls / 1e6:10.3f} {longest / 1e6:10.3f}")
+    if recorder.counters:
+        lines.append("")
+        lines.append(f"{'counter':40} {'value':>8}")
+        for name, value in sorted(recorder.counters.items()):
+            lines.append(f"{name:40} {value:8}")
+    return "\n".join(lines)
+
+
+def write(file: str, recorder: Recorder | None = None):
+    """Write the recording to a file: Chrome trace JSON for ``.json`` files, otherwise the summary table.
+
+    Arguments:
+        file: str: The path of the file.
+        recorder: Recorder | None: The recording; the current one if None.
+    """
+    with open(file, "w", encoding="utf-8") as f_out:
+        if file.endswith(".json"):
+            import json
+            json.dump(chrome_trace(recorder), f_out)
+        else:
+            f_out.write(summary(recorder) + "\n")
+
+
+__all__ = [
+    "Recorder",
+    "enable",
+    "disable",
+    "enabled",
+    "span",
+    "traced",
+    "count",
+    "chrome_trace",
+    "summary",
+    "write",
+]
@@ -0,0 +1,235 @@
+# lexicon_blocks.py
+
+import lzma
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+# Codec ids, as stored in the header
+CODECS = {
+    None: 0,
+    "zlib": 1,
+    "lzma": 2,
+}
+# Raw LZMA2 streams leave out the container headers of every block
+LZMA_FILTERS = [{"id": lzma.FILTER_LZMA2, "preset": 6}]
+# Words per block; larger blocks compress better, smaller blocks are faster to look up
+BLOCK_SIZE = 256
+
+# Word count, codec, words per block and block count
+HEADER = struct.Struct(">IBHI")
+# Offset of a block from the end of the index, its compressed length and the length of its first word
+INDEX_ENTRY = struct.Struct(">QIH")
+# Bytes shared with the previous word, and the length of the rest of the word
+PREFIX = struct.Struct(">HH")
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == 1:
+        return zlib.compress(data, 9)
+    if codec == 2:
+        return lzma.compress(data, format=lzma.FORMAT_RAW, filters=LZMA_FILTERS)
+    return data
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == 1:
+        return zlib.decompress(data)
+    if codec == 2:
+        return lzma.decompress(data, format=lzma.FORMAT_RAW, filters=LZMA_FILTERS)
+    return data
+
+
+def encode_blocks(words, codec: str | None = "zlib", block_size: int = BLOCK_SIZE) -> bytes:
+    """Encode sorted words as front-coded, compressed blocks.
+
+    .. code-block::
+
+        Encoding is as follows:
+        Word count:           4 bytes     len(words)
+        Codec:                1 byte      0 none, 1 zlib, 2 lzma
+        Block size:           2 bytes     words per block
+        Block count:          4 bytes     len(blocks)
+        Block index:
+            Offset:           8 bytes     from the end of the index
+            Length:           4 bytes     len(block)
+            First length:     2 bytes     len(first_word)
+            First word:       n bytes     first_word
+        Blocks:               n bytes     compressed
+            Shared:           2 bytes     bytes shared with the previous word
+            Suffix length:    2 bytes     len(suffix)
+            Suffix:           n bytes     the rest of the word
+
+    The first word of every block shares nothing, so each block can be
+    decompressed on its own, and the first words in the index are enough
+    to find the block of a word with a binary search.
+
+    Arguments:
+        words: Iterable[str]: The words, sorted.
+        codec: str | None: ``"zlib"``, ``"lzma"`` or None to leave the blocks uncompressed.
+        block_size: int: The number of words in each block.
+
+    Returns:
+        bytes: The encoded words.
+
+    Raises:
+        ValueError: If the words are not sorted, or the codec or block size is not supported.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported lexicon codec: {codec}")
+    if not 0 < block_size <= 0xFFFF:
+        raise ValueError(f"Block size must be between 1 and 65535, not {block_size}.")
+    codec_id = CODECS[codec]
+    encoded = [str(word).encode() for word in words]
+    index = []
+    blocks = []
+    offset = 0
+    for start in range(0, len(encoded), block_size):
+        block = encoded[start:start + block_size]
+        parts = []
+        previous = b""
+        for word in block:
+            if word < previous:
+                raise ValueError("Words must be sorted to be front-coded.")
+            limit = min(len(word), len(previous), 0xFFFF)
+            # the XOR of the two prefixes has a leading zero byte for every byte they share
+            difference = int.from_bytes(word[:limit], 'big') ^ int.from_bytes(previous[:limit], 'big')
+            shared = limit - (difference.bit_length() + 7) // 8
+            parts.append(PREFIX.pack(shared, len(word) - shared))
+            parts.append(word[shared:])
+            previous = word
+        data = _compress(codec_id, b"".join(parts))
+        if start and block[0] < encoded[start - 1]:
+            raise ValueError("Words must be sorted to be front-coded.")
+        index.append(INDEX_ENTRY.pack(offset, len(data), len(block[0])) + block[0])
+        blocks.append(data)
+        offset += len(data)
+    return HEADER.pack(len(encoded), codec_id, block_size, len(blocks)) + b"".join(index) + b"".join(blocks)
+
+
+class BlockLexicon(Sequence):
+    def __init__(self, data, start: int = 0, length: int | None = None):
+        """
+        Initialize a sorted lexicon over front-coded blocks from ``encode_blocks``.
+
+        Only the header and the block index are read up front. A word is
+        found by position or by a binary search over the first words of the
+        blocks, and only its block is decompressed. The last block read is
+        kept, so reading nearby words does not decompress it again.
+
+        :param data: bytes | mmap: The buffer holding the encoded words.
+        :param start: int: The offset of the encoded words in the buffer.
+        :param length: int | None: The length of the encoded words; the rest of the buffer if None.
+        :raises ValueError: If the encoded words are truncated or use an unknown codec.
+        """
+        self._data = data
+        end = len(data) if length is None else start + length
+        if end - start < HEADER.size:
+            raise ValueError("The lexicon blocks are truncated.")
+        self._length, self._codec, self.block_size, block_count = HEADER.unpack_from(data, start)
+        if self._codec not in CODECS.values():
+            raise ValueError(f"Unknown lexicon codec: {self._codec}")
+        position = start + HEADER.size
+        self._firsts = []
+        self._blocks = []
+        for _ in range(block_count):
+            if position + INDEX_ENTRY.size > end:
+                raise ValueError("The lexicon block index is truncated.")
+            offset, block_length, first_length = INDEX_ENTRY.unpack_from(data, position)
+            position += INDEX_ENTRY.size
+            self._firsts.append(bytes(data[position:position + first_length]))
+            self._blocks.append((offset, block_length))
+            position += first_length
+        self._blocks = [(position + offset, block_length) for offset, block_length in self._blocks]
+        if self._blocks and sum(self._blocks[-1]) > end:
+            raise ValueError("The lexicon blocks are truncated.")
+        self._cached = (-1, [])
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+words: {self._length} - blocks: {len(self._blocks)}>"
+
+    def block(self, index: int) -> list[bytes]:
+        """Decompress and decode one block.
+
+        Arguments:
+            index: int: The position of the block.
+
+        Returns:
+            list[bytes]: The UTF-8 encoded words of the block.
+        """
+        if self._cached[0] == index:
+            return self._cached[1]
+        offset, length = self._blocks[index]
+        data = _decompress(self._codec, self._data[offset:offset + length])
+        words = []
+        previous = b""
+        position = 0
+        unpack = PREFIX.unpack_from
+        while position < len(data):
+            shared, suffix = unpack(data, position)
+            position += PREFIX.size
+            previous = previous[:shared] + data[position:position + suffix]
+            position += suffix
+            words.append(previous)
+        self._cached = (index, words)
+        return words
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("lexicon index out of range")
+        return self.block(index // self.block_size)[index % self.block_size].decode()
+
+    def __iter__(self):
+        for i in range(len(self._blocks)):
+            for word in self.block(i):
+                yield word.decode()
+
+    def __contains__(self, word) -> bool:
+        try:
+            self.index(word)
+        except ValueError:
+            return False
+        return True
+
+    def index(self, word: str) -> int:
+        """Find a word with a binary search, decompressing one block.
+
+        Arguments:
+            word: str: The word.
+
+        Returns:
+            int: The position of the word.
+
+        Raises:
+            ValueError: If the word is not in the lexicon.
+        """
+        encoded = str(word).encode()
+        b = bisect_right(self._firsts, encoded) - 1
+        if b >= 0:
+            words = self.block(b)
+            i = bisect_left(words, encoded)
+            if i < len(words) and words[i] == encoded:
+                return b * self.block_size + i
+        raise ValueError(f"{word!r} is not in the lexicon")
+
+
+def decode_blocks(data: bytes) -> list[str]:
+    return list(BlockLexicon(data))
+
+
+__all__ = [
+    "CODECS",
+    "BLOCK_SIZE",
+    "encode_blocks",
+    "decode_blocks",
+    "BlockLexicon",
+]
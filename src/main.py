@@ -14,9 +14,12 @@ from platformdirs import user_cache_path, user_log_path
 import logging
 import pyperclip
 
+import instrumentation
+
 from about import About
 from wordweaver_project import WordweaverProject
 from phonology_selector import PhonologySelector
+from word_generator import WordGenerator
 
 WELCOME_TEXT = """Your complete toolbox for all things conglang.
 Start by creating a new project or opening an existing one."""
@@ -88,6 +91,10 @@ class App(QMainWindow):
         self.project_view_layout.addWidget(self.lexicon_text, 2, 1)
         self.project_view_layout.addWidget(lexicon_edit_button, 3, 1)
 
+        generate_button = QPushButton("Generate Words", self.project_view)
+        generate_button.clicked.connect(self.generate_words)
+        self.project_view_layout.addWidget(generate_button, 4, 0, 1, 2)
+
         self._update_project_view()
 
         if self.project is None:
@@ -165,6 +172,7 @@ class App(QMainWindow):
             self.project_view.show()
             self._update_project_view()
 
+    @instrumentation.traced()
     def _update_project_view(self):
         if self.project is not None:
             self.project_name.setText(self.project.name)
@@ -285,6 +293,14 @@ class App(QMainWindow):
     def edit_lexicon(self):
         pass
 
+    def generate_words(self):
+        if not hasattr(self, "word_generator"):
+            self.word_generator = WordGenerator(self.project)
+            self.logger.debug("Created new word generator window")
+        self.word_generator.show()
+        self.word_generator.activateWindow()
+        self.word_generator.closeEvent = self._close_word_generator
+
     def _close_about_window(self, a0: QCloseEvent | None) -> None:
         delattr(self, "about_window")
         return super().closeEvent(a0)
@@ -297,7 +313,17 @@ class App(QMainWindow):
         delattr(self, "phonology_selector")
         return super().closeEvent(a0)
 
+    def _close_word_generator(self, a0: QCloseEvent | None) -> None:
+        # Let the window stop its worker thread before it is dropped
+        WordGenerator.closeEvent(self.word_generator, a0)
+        self._update_project_view()
+        self.logger.debug("Closed word generator window and updated lexicon")
+        delattr(self, "word_generator")
+
     def closeEvent(self, a0: QCloseEvent | None) -> None:
+        # Stop any background generation before the application quits
+        if hasattr(self, "word_generator"):
+            self.word_generator.close()
         # If there is an unsaved project, then prompt the user to save it
         if self.project is not None:
             if not self.prompt_save():
@@ -323,7 +349,15 @@ if __name__ == "__main__":
                         help="Enable verbose logging",
                         default="WARNING",
                         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
+    parser.add_argument("-p", "--profile",
+                        action="store",
+                        metavar="FILE",
+                        help="Record timings of project I/O, generation and GUI refreshes and write them to FILE "
+                             "on exit; a .json file is written as a Chrome trace, any other file as a summary table",
+                        default=None)
     args = parser.parse_args()
+    if args.profile is not None:
+        instrumentation.enable()
     # Setup logging defaults
     logging.basicConfig(filename=user_log_path("Wordweaver", False, ensure_exists=True).joinpath(Path("wordweaver.log")),
                         encoding="utf-8",
@@ -366,3 +400,6 @@ if __name__ == "__main__":
         app.exec()
     except Exception as e:
         logger.critical(f"Unhandled exception: {e}")
+    if args.profile is not None:
+        instrumentation.write(args.profile)
+        logger.info(f"Wrote profile to {args.profile}")
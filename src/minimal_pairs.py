@@ -0,0 +1,121 @@
+# minimal_pairs.py
+
+from phoneme_word import PhonemeAlphabet, PhonemeWord
+
+# Characters that mark syllables or join parts of an entry but are not phonemes
+SEPARATORS = ".-' "
+
+
+class MinimalPairFinder:
+    def __init__(self, alphabet: PhonemeAlphabet | None = None, separators: str = SEPARATORS):
+        """
+        Initialize a finder of minimal pairs and homophones in a lexicon.
+
+        Words are split into phonemes and compared by their phoneme ids, so
+        ``t͡ʃ`` is one phoneme and entries that only differ in separators are
+        homophones. Minimal pairs are found by bucketing every word under a
+        key with one position masked, one position at a time. Each key is a
+        copy of the word, so this takes O(N·L²) time for N words of up to L
+        phonemes, instead of comparing every pair of words in O(N²·L).
+
+        :param alphabet: PhonemeAlphabet | None: The phonemes words are split into; words
+            may add new phonemes to it.
+        :param separators: str: Characters that are removed before a word is split.
+        """
+        self.alphabet = alphabet if alphabet is not None else PhonemeAlphabet()
+        self.separators = separators
+        self._strip = str.maketrans('', '', separators)
+
+    @staticmethod
+    def from_project(project) -> "MinimalPairFinder":
+        """Create a finder over the phonemes of a project.
+
+        Arguments:
+            project: WordweaverProject: The project.
+
+        Returns:
+            MinimalPairFinder: The finder.
+        """
+        return MinimalPairFinder(PhonemeAlphabet(project.alphabet.symbols))
+
+    def encode(self, word: str | PhonemeWord) -> bytes:
+        """Split a word into phoneme ids, one byte per phoneme.
+
+        Arguments:
+            word: str | PhonemeWord: The word as a unicode string or a PhonemeWord.
+
+        Returns:
+            bytes: The phoneme ids.
+        """
+        return bytes(self.alphabet.tokenize(str(word).translate(self._strip)))
+
+    def minimal_pairs(self, words, contrast: tuple[str, str] | None = None):
+        """Find the pairs of words that differ in exactly one phoneme.
+
+        Each pair is yielded once, as soon as the bucket of its position is
+        complete, so only one position's buckets are held at a time.
+
+        Arguments:
+            words: Iterable[str | PhonemeWord]: The words, such as ``WordweaverProject.lexicon``.
+            contrast: tuple[str, str] | None: Only find pairs that differ in these two
+                phonemes, such as ``("p", "b")``.
+
+        Yields:
+            pair: tuple[str, str, int]: The two words as unicode strings and the index of
+            the phoneme they differ in. With a contrast, the first word has its first phoneme.
+
+        Raises:
+            ValueError: If the contrast is not two different phonemes.
+        """
+        encoded = [(str(word), self.encode(word)) for word in words]
+        allowed = None
+        if contrast is not None:
+            first, second = (self.alphabet.tokenize(phoneme) for phoneme in contrast)
+            if len(first) != 1 or len(second) != 1 or first == second:
+                raise ValueError(f"A contrast must be two different phonemes, not {contrast}.")
+            allowed = (first[0], second[0])
+        longest = max((len(data) for _, data in encoded), default=0)
+        for i in range(longest):
+            buckets = {}
+            for word, data in encoded:
+                if len(data) > i and (allowed is None or data[i] in allowed):
+                    buckets.setdefault(data[:i] + data[i + 1:], []).append((data[i], word))
+            for bucket in buckets.values():
+                if len(bucket) < 2:
+                    continue
+                if allowed is not None:
+                    firsts = [word for phoneme, word in bucket if phoneme == allowed[0]]
+                    seconds = [word for phoneme, word in bucket if phoneme == allowed[1]]
+                    for a in firsts:
+                        for b in seconds:
+                            yield a, b, i
+                    continue
+                # words with the same phoneme here are homophones, not minimal pairs
+                bucket.sort()
+                for j, (phoneme, a) in enumerate(bucket):
+                    for other, b in bucket[j + 1:]:
+                        if other != phoneme:
+                            yield a, b, i
+
+    def homophones(self, words):
+        """Find the groups of words with exactly the same phonemes.
+
+        Arguments:
+            words: Iterable[str | PhonemeWord]: The words, such as ``WordweaverProject.lexicon``.
+
+        Yields:
+            group: tuple[str, ...]: Two or more words that sound the same, as unicode strings
+            in lexicon order.
+        """
+        groups = {}
+        for word in words:
+            groups.setdefault(self.encode(word), []).append(str(word))
+        for group in groups.values():
+            if len(group) > 1:
+                yield tuple(group)
+
+
+__all__ = [
+    "SEPARATORS",
+    "MinimalPairFinder",
+]
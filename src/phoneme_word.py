@@ -0,0 +1,281 @@
+# phoneme_word.py
+
+import re
+from array import array
+from functools import total_ordering
+
+# Phoneme ids are stored one per byte
+MAX_PHONEMES = 256
+
+
+class PhonemeAlphabet:
+    def __init__(self, symbols=()):
+        """
+        Initialize an alphabet mapping phoneme unicode strings to integer ids.
+
+        Ids are assigned in order of insertion and are stored in a single byte,
+        so an alphabet holds at most 256 phonemes. Strings are split into
+        phonemes by greedy longest match; characters that are not in the
+        alphabet are added as new single character phonemes.
+
+        :param symbols: Iterable[str]: The unicode representation of each phoneme.
+        :raises ValueError: If there are more than 256 phonemes.
+        """
+        self.symbols = []
+        self.ids = {}
+        self._max_length = 1
+        self._pattern = None
+        for symbol in symbols:
+            self.add(symbol)
+
+    @staticmethod
+    def from_inventory(inventory) -> "PhonemeAlphabet":
+        """Create an alphabet from a list of IPAChar objects.
+
+        Arguments:
+            inventory: list[IPAChar]: The phonemes in id order.
+
+        Returns:
+            PhonemeAlphabet: The alphabet.
+        """
+        from phonology import phoneme_symbol
+        return PhonemeAlphabet(phoneme_symbol(phoneme) for phoneme in inventory)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.ids
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PhonemeAlphabet) and self.symbols == other.symbols
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} of {', '.join(self.symbols)}>"
+
+    def add(self, symbol: str) -> int:
+        """Add a phoneme to the alphabet if it is not already in it.
+
+        Arguments:
+            symbol: str: The unicode representation of the phoneme.
+
+        Returns:
+            int: The id of the phoneme.
+
+        Raises:
+            ValueError: If the alphabet is full.
+        """
+        if symbol in self.ids:
+            return self.ids[symbol]
+        if len(self.symbols) >= MAX_PHONEMES:
+            raise ValueError(f"An alphabet is limited to {MAX_PHONEMES} phonemes.")
+        self.ids[symbol] = len(self.symbols)
+        self.symbols.append(symbol)
+        self._max_length = max(self._max_length, len(symbol))
+        self._pattern = None
+        return self.ids[symbol]
+
+    def tokenize(self, text: str) -> list[int]:
+        """Split a unicode string into phoneme ids by greedy longest match.
+
+        Arguments:
+            text: str: The string to split.
+
+        Returns:
+            list[int]: The phoneme ids.
+        """
+        ids = self.ids
+        if self._max_length > 1:
+            if self._pattern is None:
+                # an alternation tried longest first splits by greedy longest match
+                symbols = sorted((s for s in self.symbols if len(s) > 1), key=len, reverse=True)
+                self._pattern = re.compile('|'.join(map(re.escape, symbols)) + '|.', re.DOTALL)
+            text = self._pattern.findall(text)
+        # unknown characters are single phonemes, so adding them never changes the split
+        return [ids[token] if token in ids else self.add(token) for token in text]
+
+    def encode(self, word, separator: str | None = None) -> "PhonemeWord":
+        """Encode a word into a PhonemeWord.
+
+        Arguments:
+            word: str | PhonemeWord | list[list[IPAChar | str]]: The word as a unicode
+                string, or as syllables of phonemes like ``PhonemeGenerator.generate_random``.
+            separator: str | None: The syllable separator in a unicode string.
+
+        Returns:
+            PhonemeWord: The encoded word.
+        """
+        if isinstance(word, PhonemeWord):
+            return word if word.alphabet is self else self.encode(str(word))
+        if isinstance(word, str):
+            syllables = word.split(separator) if separator else [word]
+            syllables = [self.tokenize(syllable) for syllable in syllables]
+        else:
+            syllables = [[self._phoneme_id(phoneme) for phoneme in syllable] for syllable in word]
+        ids = []
+        starts = []
+        for syllable in syllables:
+            starts.append(len(ids))
+            ids.extend(syllable)
+        return PhonemeWord.from_ids(ids, starts[1:], self)
+
+    def _phoneme_id(self, phoneme) -> int:
+        if isinstance(phoneme, str):
+            return self.add(phoneme)
+        from phonology import phoneme_symbol
+        return self.add(phoneme_symbol(phoneme))
+
+    def decode(self, word: "PhonemeWord", separator: str = '') -> str:
+        """Render a PhonemeWord as a unicode string.
+
+        Arguments:
+            word: PhonemeWord: The word to render.
+            separator: str: The string placed between syllables.
+
+        Returns:
+            str: The rendered word.
+        """
+        symbols = self.symbols
+        ids = word.ids
+        bounds = (0,) + word.syllable_starts + (len(ids),)
+        return separator.join(
+            ''.join(symbols[i] for i in ids[bounds[s]:bounds[s + 1]]) for s in range(len(bounds) - 1)
+        )
+
+
+@total_ordering
+class PhonemeWord:
+    __slots__ = ("data", "alphabet")
+
+    def __init__(self, data: bytes, alphabet: PhonemeAlphabet | None = None):
+        """
+        Initialize a word stored as phoneme ids in a single bytes buffer.
+
+        The buffer holds the number of syllable boundaries, the offset of each
+        syllable after the first, and then one byte per phoneme id. Words are
+        hashed and compared by their buffer only; the alphabet is used to
+        render them.
+
+        :param data: bytes: The encoded word.
+        :param alphabet: PhonemeAlphabet | None: The alphabet of the phoneme ids.
+        """
+        self.data = data
+        self.alphabet = alphabet
+
+    @staticmethod
+    def from_ids(ids, syllable_starts=(), alphabet: PhonemeAlphabet | None = None) -> "PhonemeWord":
+        """Create a word from phoneme ids and syllable offsets.
+
+        Arguments:
+            ids: Iterable[int]: The phoneme ids.
+            syllable_starts: Iterable[int]: The offset of each syllable after the first.
+            alphabet: PhonemeAlphabet | None: The alphabet of the phoneme ids.
+
+        Returns:
+            PhonemeWord: The word.
+
+        Raises:
+            ValueError: If the word has more than 255 phonemes or syllables.
+        """
+        syllable_starts = bytes(syllable_starts)
+        ids = bytes(ids)
+        if len(ids) > 255 or len(syllable_starts) > 255:
+            raise ValueError("A word is limited to 255 phonemes.")
+        return PhonemeWord(bytes((len(syllable_starts),)) + syllable_starts + ids, alphabet)
+
+    @property
+    def ids(self) -> bytes:
+        return self.data[self.data[0] + 1:]
+
+    @property
+    def syllable_starts(self) -> tuple[int, ...]:
+        return tuple(self.data[1:self.data[0] + 1])
+
+    @property
+    def syllable_count(self) -> int:
+        return self.data[0] + 1
+
+    def __len__(self) -> int:
+        return len(self.data) - self.data[0] - 1
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PhonemeWord):
+            return NotImplemented
+        return self.data == other.data
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, PhonemeWord):
+            return NotImplemented
+        return (self.ids, self.syllable_starts) < (other.ids, other.syllable_starts)
+
+    def __str__(self) -> str:
+        if self.alphabet is None:
+            raise ValueError("The word has no alphabet to render it with.")
+        return self.alphabet.decode(self)
+
+    def __repr__(self) -> str:
+        text = self.alphabet.decode(self, '.') if self.alphabet is not None else self.ids.hex()
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} {text}>"
+
+    def __reduce__(self):
+        return self.__class__, (self.data, self.alphabet)
+
+
+class PhonemeWordList:
+    def __init__(self, alphabet: PhonemeAlphabet, words=()):
+        """
+        Initialize a list of words packed into one buffer.
+
+        Each word costs its encoded bytes plus an 8 byte offset, instead of a
+        Python object per word. Items are returned as PhonemeWord objects.
+
+        :param alphabet: PhonemeAlphabet: The alphabet of the words.
+        :param words: Iterable[PhonemeWord | str]: The words to add.
+        """
+        self.alphabet = alphabet
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+        self.extend(words)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> PhonemeWord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PhonemeWordList index out of range")
+        return PhonemeWord(bytes(self._data[self._offsets[index]:self._offsets[index + 1]]), self.alphabet)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the packed words and their offsets."""
+        return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+    def append(self, word: PhonemeWord | str):
+        """Add a word, encoding it with the list's alphabet if needed.
+
+        Arguments:
+            word: PhonemeWord | str: The word to add.
+        """
+        self._data += self.alphabet.encode(word).data
+        self._offsets.append(len(self._data))
+
+    def extend(self, words):
+        """Add every word from an iterable.
+
+        Arguments:
+            words: Iterable[PhonemeWord | str]: The words to add.
+        """
+        for word in words:
+            self.append(word)
+
+
+__all__ = ["MAX_PHONEMES", "PhonemeAlphabet", "PhonemeWord", "PhonemeWordList"]
@@ -1,10 +1,24 @@
 # phonology.py
 
+from __future__ import annotations
+
 import random
+from collections.abc import Sequence
 from enum import Enum
+from functools import cache
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from instrumentation import count, traced
+from phonology_random import WORD_BLOCK_SIZE, AliasTable, RandomStream, as_stream
 
-from ipapy import IPA_TO_UNICODE
-from ipapy.ipachar import IPAChar
+# ipapy loads its whole IPA database on import, so it is only imported
+# when the phoneme tables or an inventory are actually used.
+if TYPE_CHECKING:
+    from ipapy.ipachar import IPAChar
+    from phoneme_word import PhonemeAlphabet, PhonemeWordList
+    from phonotactics import PhonotacticFilter, PhonotacticRule
+    from syllabifier import Syllabifier
 
 
 # Declare the Phonemes class to include current IPA characters
@@ -20,30 +34,249 @@ def define_phoneme_types():
     return {"CONSONANT": consonants, "VOWEL": vowels}
 
 
-# Call the function to define the enum
-Phonemes = Enum("Phonemes", define_phoneme_types())
+@cache
+def _phoneme_tables() -> dict[str, list[IPAChar]]:
+    return define_phoneme_types()
+
+
+class PhonemeTable(Sequence):
+    """The IPA characters of one phoneme type, built on first use.
+
+    Reading any item builds every table with ``define_phoneme_types``, so
+    importing this module does not load the ipapy database.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getitem__(self, index):
+        return _phoneme_tables()[self.name][index]
+
+    def __len__(self) -> int:
+        return len(_phoneme_tables()[self.name])
+
+    def __iter__(self):
+        return iter(_phoneme_tables()[self.name])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PhonemeTable):
+            return self.name == other.name
+        return list(self) == other
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} of type {self.name}>"
+
+
+# Call the function to define the enum; the values are lazy phoneme tables
+Phonemes = Enum("Phonemes", {name: PhonemeTable(name) for name in ("CONSONANT", "VOWEL")})
+
+
+@cache
+def index_phoneme_types() -> dict[str, tuple[Phonemes, ...]]:
+    """Build an index from canonical representation to phoneme types.
+
+    A phoneme is listed once for every member of a ``Phonemes`` value it is
+    equivalent to, so a single lookup gives the same classification as
+    comparing it against every enum member with ``IPAChar.is_equivalent``.
+
+    Returns:
+        dict[str, tuple[Phonemes, ...]]: The phoneme types keyed by canonical representation.
+        The index is built on the first call and shared afterwards.
+    """
+    index = {}
+    for t in Phonemes:
+        for char in t.value:
+            key = char.canonical_representation
+            index[key] = index.get(key, ()) + (t,)
+    return index
+
+
+def phoneme_symbol(phoneme: IPAChar) -> str:
+    """Get the unicode representation of a phoneme, looking it up if it is not set.
+
+    Arguments:
+        phoneme: IPAChar: The phoneme.
+
+    Returns:
+        str: The unicode representation.
+    """
+    if phoneme.unicode_repr is not None:
+        return phoneme.unicode_repr
+    from ipapy import IPA_TO_UNICODE
+    return IPA_TO_UNICODE[phoneme.canonical_representation]
 
 
 class PhonemeConstraint:
-    def __init__(self, phoneme: Phonemes, optional: bool = False):
+    def __init__(self, phoneme: Phonemes, optional: bool = False, probability: float = 0.5):
+        """
+        Initialize a phoneme slot of a syllable template.
+
+        :param phoneme: Phonemes: The type of phoneme in the slot.
+        :param optional: bool: Whether the slot may be left out.
+        :param probability: float: The probability that an optional slot is generated.
+        :raises ValueError: If the probability is not between 0 and 1.
+        """
+        if not 0.0 <= probability <= 1.0:
+            raise ValueError("Probability must be between 0 and 1.")
         self.phoneme = phoneme
         self.optional = optional
+        self.probability = probability
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
-of type {self.phoneme} - optional: {self.optional}>"
+of type {self.phoneme} - optional: {self.optional} - probability: {self.probability}>"
+
+
+class ConstraintPlan:
+    def __init__(self, generator):
+        """
+        Initialize a flat plan of the slots of every syllable position of a generator.
+
+        The constraint of each syllable position is resolved once, and each
+        slot holds the list of phonemes it chooses from, their pre-rendered
+        unicode strings, the probability that the slot is generated (None if
+        it is required) and the alias table of the phoneme weights (None if
+        they are uniform). Words longer than the plan repeat its last position.
+
+        :param generator: PhonemeGenerator: The generator to compile.
+        """
+        inventory = generator.inventory
+        tables = generator.alias_tables
+        symbols = {t: tuple(phoneme_symbol(p) for p in phonemes) for t, phonemes in inventory.items()}
+        self.syllables = tuple(
+            tuple((inventory.get(cons.phoneme, []), symbols.get(cons.phoneme, ()),
+                   cons.probability if cons.optional else None, tables.get(cons.phoneme))
+                  for cons in generator.syllable_constraint(i))
+            for i in range(len(generator.secondary_constraints) + 1)
+        )
+
+    def syllable(self, i: int) -> tuple:
+        """Get the slots of the syllable at index ``i`` of a word.
+
+        Arguments:
+            i: int: The index of the syllable in the word.
+
+        Returns:
+            tuple: The slots of the syllable.
+        """
+        syllables = self.syllables
+        return syllables[i] if i < len(syllables) else syllables[-1]
+
+    def render(self, word: list[list[IPAChar]], separator: str = '') -> str:
+        """Render a word of the generator's phonemes as a unicode string.
+
+        Arguments:
+            word: list[list[IPAChar]]: The word as a list of syllables.
+            separator: str: The string placed between syllables.
+
+        Returns:
+            str: The rendered word.
+        """
+        # unicode_repr is a plain attribute, which is faster to read than any lookup table
+        return separator.join([''.join([p.unicode_repr or phoneme_symbol(p) for p in syllable]) for syllable in word])
+
+
+class GeneratorSpec:
+    def __init__(self, syllables: tuple[tuple[tuple[tuple[str, ...], float | None, AliasTable | None], ...], ...]):
+        """
+        Initialize a compact, picklable description of a word template.
+
+        Each syllable is a tuple of slots. A slot is the tuple of unicode
+        phonemes it chooses from, the probability that it is generated (None if
+        it is required) and the alias table of the phoneme weights (None if
+        they are uniform). Pools are kept in inventory order, so drawing from a
+        spec uses the random stream exactly like ``PhonemeGenerator.generate_range``.
+
+        :param syllables: tuple: The slots of every syllable in the word.
+        """
+        self.syllables = syllables
+
+    @staticmethod
+    def from_generator(generator, syllable_length: int) -> "GeneratorSpec":
+        """Describe the words of ``syllable_length`` syllables made by a PhonemeGenerator.
+
+        Arguments:
+            generator: PhonemeGenerator: The generator to describe.
+            syllable_length: int: The number of syllables in each word.
+
+        Returns:
+            GeneratorSpec: The compact description.
+        """
+        plan = generator.plan
+        return GeneratorSpec(tuple(
+            tuple((symbols, probability, table) for pool, symbols, probability, table in plan.syllable(i))
+            for i in range(syllable_length)
+        ))
+
+    def iter_range(self, start: int, stop: int | None, stream: RandomStream, separator: str = ''):
+        """Lazily generate the words from ``start`` up to ``stop`` of a random stream as strings.
+
+        Arguments:
+            start: int: The index of the first word.
+            stop: int | None: The index after the last word; words are generated
+                without end if None.
+            stream: RandomStream: The stream the words are drawn from.
+            separator: str: The string placed between syllables.
+
+        Yields:
+            word: str: The rendered word.
+        """
+        syllables = self.syllables
+        block = start // WORD_BLOCK_SIZE
+        while stop is None or block * WORD_BLOCK_SIZE < stop:
+            rng = stream.child(block)
+            random, choice = rng.random, rng.choice
+            first = block * WORD_BLOCK_SIZE
+            last = first + WORD_BLOCK_SIZE if stop is None else min(first + WORD_BLOCK_SIZE, stop)
+            for k in range(first, last):
+                word = separator.join(
+                    ''.join(choice(pool) if table is None else pool[table.sample(rng)]
+                            for pool, probability, table in syllable
+                            if probability is None or random() < probability)
+                    for syllable in syllables
+                )
+                if k >= start:
+                    yield word
+            block += 1
+
+    def generate_range(self, start: int, stop: int, stream: RandomStream, separator: str = '') -> list[str]:
+        """Generate the words from ``start`` up to ``stop`` of a random stream as strings.
+
+        Arguments:
+            start: int: The index of the first word.
+            stop: int: The index after the last word.
+            stream: RandomStream: The stream the words are drawn from.
+            separator: str: The string placed between syllables.
+
+        Returns:
+            list[str]: The rendered words.
+        """
+        return list(self.iter_range(start, stop, stream, separator))
 
 
 class PhonemeGenerator:
+    @traced()
     def __init__(self, inventory: list[IPAChar] | dict[Phonemes, list[IPAChar]],
                  constraint: tuple[PhonemeConstraint] = (PhonemeConstraint(Phonemes.VOWEL),),
-                 *secondary_constraints: tuple[PhonemeConstraint]):
+                 *secondary_constraints: tuple[PhonemeConstraint],
+                 rng: RandomStream | random.Random | int | None = None,
+                 weights: dict[str, float] | None = None,
+                 rules: list[PhonotacticRule] | None = None):
         """
         Initialize the PhonemeGenerator class with an inventory of IPAChar objects and specified constraint(s).
 
         :param inventory: list[IPAChar] | dict[Phonemes, list[IPAChar]]: A list or dictionary of IPAChar objects.
         :param constraint: tuple[PhonemeConstraint]: A tuple of PhonemeConstraint objects.
         :param *secondary_constraints: tuple[PhonemeConstraint]: A tuple of PhonemeConstraint objects.
+        :param rng: RandomStream | random.Random | int | None: The seed or random generator used for
+            generation. Generators with the same seed produce the same words.
+        :param weights: dict[str, float] | None: The relative frequency of phonemes keyed
+            by their unicode representation. Phonemes that are not listed have a weight of 1.
+        :param rules: list[PhonotacticRule] | None: Forbidden phoneme sequences. Words
+            that break a rule are left out of every generation method.
         """
         # Check all types
         if not isinstance(inventory, dict) and not isinstance(inventory, list):
@@ -53,9 +286,15 @@ class PhonemeGenerator:
         if len(secondary_constraints) > 0 and all(not isinstance(i, tuple) for i in secondary_constraints):
             raise TypeError("Secondary constraints must be a tuple.")
         # Assign values
+        self._plan = None
+        self._syllabifier = None
         self.constraint = constraint
         self.secondary_constraints = list(secondary_constraints)
+        self.rng = as_stream(rng)
         self._inventory = self._sort_inventory(inventory)
+        self._alphabet = None
+        self.weights = weights
+        self.rules = rules
         # Ensure all phoneme constraint types are defined in the inventory
         for t in [i.phoneme for p in self.secondary_constraints + [self.constraint] for i in p]:
             # Check if the phoneme type is defined in the inventory
@@ -69,11 +308,119 @@ class PhonemeGenerator:
     @inventory.setter
     def inventory(self, inventory: list[IPAChar] | list[str]):
         self._inventory = self._sort_inventory(inventory)
+        self._alphabet = None
+        self._phonotactics = None
+        self._alias_tables = self._build_alias_tables()
+        self._plan = None
+        self._syllabifier = None
+
+    @property
+    def weights(self) -> dict[str, float]:
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: dict[str, float] | None):
+        self._weights = dict(weights) if weights is not None else {}
+        self._alias_tables = self._build_alias_tables()
+        self._plan = None
+
+    @property
+    def constraint(self) -> tuple[PhonemeConstraint]:
+        return self._constraint
+
+    @constraint.setter
+    def constraint(self, constraint: tuple[PhonemeConstraint]):
+        self._constraint = constraint
+        self._plan = None
+        self._syllabifier = None
+
+    @property
+    def secondary_constraints(self) -> list[tuple[PhonemeConstraint]]:
+        return self._secondary_constraints
+
+    @secondary_constraints.setter
+    def secondary_constraints(self, secondary_constraints: list[tuple[PhonemeConstraint]]):
+        self._secondary_constraints = secondary_constraints
+        self._plan = None
+        self._syllabifier = None
+
+    @property
+    def plan(self) -> ConstraintPlan:
+        """The constraints compiled against the inventory.
+
+        The plan is compiled on first use and again after the constraints,
+        inventory or weights change.
+        """
+        if self._plan is None:
+            self._plan = ConstraintPlan(self)
+        return self._plan
+
+    @property
+    def syllabifier(self) -> Syllabifier:
+        """The constraints compiled into an automaton that checks and syllabifies words.
+
+        The automaton is compiled on first use and again after the constraints
+        or inventory change.
+        """
+        if self._syllabifier is None:
+            from syllabifier import Syllabifier
+            self._syllabifier = Syllabifier.from_generator(self)
+        return self._syllabifier
+
+    @property
+    def alias_tables(self) -> dict[Phonemes, AliasTable]:
+        """The alias tables of the phoneme types whose phonemes are not equally weighted."""
+        return self._alias_tables
+
+    def _build_alias_tables(self) -> dict[Phonemes, AliasTable]:
+        tables = {}
+        if not self._weights:
+            return tables
+        for t, phonemes in self._inventory.items():
+            weights = [self._weights.get(phoneme_symbol(p), 1.0) for p in phonemes]
+            if len(set(weights)) > 1:
+                tables[t] = AliasTable(weights)
+        return tables
+
+    @property
+    def rules(self) -> list[PhonotacticRule]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: list[PhonotacticRule] | None):
+        self._rules = list(rules) if rules is not None else []
+        self._phonotactics = None
+
+    @property
+    def phonotactics(self) -> PhonotacticFilter | None:
+        """The rules compiled over the generator's alphabet, or None if there are no rules.
+
+        The filter is compiled on first use and keeps counting the words each
+        rule rejects until the rules or the inventory change.
+        """
+        if not self._rules:
+            return None
+        if self._phonotactics is None:
+            from phonotactics import PhonotacticFilter
+            self._phonotactics = PhonotacticFilter(self._rules, self.alphabet)
+        return self._phonotactics
+
+    @property
+    def alphabet(self) -> PhonemeAlphabet:
+        """The alphabet of phoneme ids for the inventory, in ``Phonemes`` order."""
+        if self._alphabet is None:
+            from phoneme_word import PhonemeAlphabet
+            self._alphabet = PhonemeAlphabet.from_inventory(
+                [phoneme for t in Phonemes for phoneme in self._inventory.get(t, [])]
+            )
+        return self._alphabet
 
     def _sort_inventory(self, inventory: list[IPAChar] | dict[Phonemes, list[IPAChar]]) -> dict[Phonemes, list[IPAChar]]:
         if isinstance(inventory, dict):
             return inventory
         else:
+            from ipapy import IPA_TO_UNICODE
+            index = index_phoneme_types()
             inv = {t: [] for t in Phonemes}
             # Loop through each phoneme in the inventory
             # and assign it to the appropriate enum member
@@ -88,12 +435,9 @@ class PhonemeGenerator:
                             f"Phoneme {phoneme} does not have a unicode",
                             "representation; probably because it doesn't exist."
                         )
-                for phoneme_name in Phonemes._member_names_:
-                    t = Phonemes[phoneme_name]
-                    # loop through the enum members to find a match
-                    for char in t.value:
-                        if char.is_equivalent(phoneme):
-                            inv[t].append(phoneme)
+                # look up every enum member the phoneme is equivalent to
+                for t in index.get(phoneme.canonical_representation, ()):
+                    inv[t].append(phoneme)
             return inv
 
     def constrain(self, constraint: tuple[PhonemeConstraint], *secondary_constraints: tuple[tuple[PhonemeConstraint]]):
@@ -111,6 +455,22 @@ class PhonemeGenerator:
             self.secondary_constraints = secondary_constraints
         return self
 
+    def syllable_constraint(self, i: int) -> tuple[PhonemeConstraint]:
+        """Get the constraint used for the syllable at index ``i`` of a word.
+
+        Arguments:
+            i: int: The index of the syllable in the word.
+
+        Returns:
+            tuple[PhonemeConstraint]: The constraint for that syllable.
+        """
+        if i == 0 or len(self.secondary_constraints) == 0:
+            return self.constraint
+        elif i < len(self.secondary_constraints):
+            return self.secondary_constraints[i]
+        else:
+            return self.secondary_constraints[-1]
+
     def generate_syllables(self, n: int):
         """Generate a list of syllables based on the constraints set for the PhonemeGenerator object.
 
@@ -128,32 +488,235 @@ class PhonemeGenerator:
         Raises:
             ValueError: If the phoneme type is not defined in the inventory.
         """
+        return self._generate_syllables(n, self.rng)
+
+    def _generate_syllables(self, n: int, rng: random.Random):
+        syllables = self.plan.syllables
+        last = len(syllables) - 1
+        random, choice = rng.random, rng.choice
         for i in range(n):
             syllable = []
-            if i == 0 or len(self.secondary_constraints) == 0:
-                constraint = self.constraint
-            elif i < len(self.secondary_constraints):
-                constraint = self.secondary_constraints[i]
-            else:
-                constraint = self.secondary_constraints[-1]
-            for cons in constraint:
-                if (cons.optional and random.random() < 0.5) or not cons.optional:
-                    # optional phoneme so we generate it half the time
-                    syllable.append(random.choice(self._inventory[cons.phoneme]))
+            for pool, symbols, probability, table in syllables[i if i < last else last]:
+                # optional phonemes are generated with the constraint's probability
+                if probability is None or random() < probability:
+                    syllable.append(choice(pool) if table is None else pool[table.sample(rng)])
             yield syllable
 
     def generate_random(self, syllable_length: int, n: int) -> list[list[IPAChar]]:
-        return [
-            [j for j in self.generate_syllables(syllable_length)] for i in range(n)
-        ]
+        """Generate ``n`` words of ``syllable_length`` syllables.
+
+        Each call draws from a new child stream of the generator's RNG, so the
+        words can also be generated in shards with ``generate_range``. Words
+        that break the phonotactic rules are skipped, and more words are drawn
+        from the stream until ``n`` are kept.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+            n: int: The number of words to generate.
+
+        Returns:
+            list[list[IPAChar]]: The words as lists of syllables.
+
+        Raises:
+            ValueError: If more than ``phonotactics.MAX_REJECTED_IN_ROW`` words in a row
+                break the rules.
+        """
+        stream = self.rng.spawn()[0]
+        if self.phonotactics is None:
+            return self.generate_range(syllable_length, 0, n, stream)
+        return [word for words in self._generate_kept(syllable_length, n, stream, max(n, WORD_BLOCK_SIZE))
+                for word in words]
+
+    def _generate_kept(self, syllable_length: int, n: int, stream: RandomStream, size: int):
+        # Yield the first ``n`` kept words of a stream, drawing ranges of at
+        # most ``size`` words; without rules every word is kept
+        from phonotactics import MAX_REJECTED_IN_ROW
+        start = 0
+        kept = 0
+        rejected = 0
+        while kept < n:
+            # after a run of rejected words draw as many again, so a strict rule
+            # takes few ranges; the words past ``n`` are dropped
+            stop = start + min(size, max(n - kept, rejected))
+            words = self.generate_range(syllable_length, start, stop, stream)[:n - kept]
+            kept += len(words)
+            rejected = rejected + stop - start if not words else 0
+            if rejected > MAX_REJECTED_IN_ROW:
+                raise self.phonotactics.rejection_error(rejected)
+            start = stop
+            yield words
+
+    @traced()
+    def generate_range(self, syllable_length: int, start: int, stop: int,
+                       stream: RandomStream) -> list[list[IPAChar]]:
+        """Generate the words from ``start`` up to ``stop`` of a random stream.
+
+        Word ``k`` of a stream only depends on the stream and ``k``, so joining
+        the ranges generated by several workers from the same stream gives the
+        same words as generating the whole range at once. Words that break the
+        phonotactic rules are left out, so a range can hold fewer than
+        ``stop - start`` words.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+            start: int: The index of the first word.
+            stop: int: The index after the last word.
+            stream: RandomStream: The stream the words are drawn from.
+
+        Returns:
+            list[list[IPAChar]]: The words as lists of syllables.
+        """
+        words = []
+        phonotactics = self.phonotactics
+        if phonotactics is not None:
+            check, encode = phonotactics.check, self.alphabet.encode
+        for block in range(start // WORD_BLOCK_SIZE, -(-stop // WORD_BLOCK_SIZE)):
+            rng = stream.child(block)
+            first = block * WORD_BLOCK_SIZE
+            for k in range(first, min(first + WORD_BLOCK_SIZE, stop)):
+                word = list(self._generate_syllables(syllable_length, rng))
+                if k >= start and (phonotactics is None or check(encode(word).ids)):
+                    words.append(word)
+        count("words generated", len(words))
+        return words
+
+    @traced()
+    def generate_words(self, syllable_length: int, n: int) -> PhonemeWordList:
+        """Generate ``n`` words like ``generate_random``, packed as phoneme ids.
+
+        The words are the same as those of ``generate_random`` for the same
+        stream, including the words skipped for the phonotactic rules.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+            n: int: The number of words to generate.
+
+        Returns:
+            PhonemeWordList: The words encoded with the generator's alphabet.
+
+        Raises:
+            ValueError: If more than ``phonotactics.MAX_REJECTED_IN_ROW`` words in a row
+                break the rules.
+        """
+        from phoneme_word import PhonemeWordList
+        alphabet = self.alphabet
+        stream = self.rng.spawn()[0]
+        words = PhonemeWordList(alphabet)
+        # encode a block at a time so the IPAChar lists are never all held at once
+        for block in self._generate_kept(syllable_length, n, stream, WORD_BLOCK_SIZE):
+            words.extend(alphabet.encode(word) for word in block)
+        return words
+
+    @traced()
+    def generate_unique(self, syllable_length: int, n: int, exclude=(), separator: str = '',
+                        patience: int = 10000):
+        """Generate distinct words not in ``exclude``; see ``phonology_unique.generate_unique``.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+            n: int: The number of words wanted.
+            exclude: Iterable[str | PhonemeWord]: Words to leave out, such as a project lexicon.
+            separator: str: The string placed between syllables.
+            patience: int: The number of rejections in a row before giving up.
+
+        Returns:
+            tuple[list[str], GenerationStats]: The words and the statistics of the run.
+        """
+        from phonology_unique import generate_unique
+        return generate_unique(self, syllable_length, n, exclude, separator, patience)
+
+    def word_space(self, syllable_length: int):
+        """Get the space of distinct words; see ``phonology_space.WordSpace``.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+
+        Returns:
+            WordSpace: The exactly counted, rankable space of words.
+        """
+        from phonology_space import WordSpace
+        return WordSpace(self, syllable_length)
+
+    @traced()
+    def generate_batch(self, syllable_length: int, n: int, rng=None):
+        """Generate a batch of words with NumPy; see ``phonology_batch.generate_batch``.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+            n: int: The number of words to generate.
+            rng: numpy.random.Generator | random.Random | int | None: The generator or seed to
+                draw from; a child stream of the generator's RNG is used if None.
+
+        Returns:
+            WordBatch: The generated words.
+        """
+        from phonology_batch import generate_batch
+        return generate_batch(self, syllable_length, n, self.rng.spawn()[0] if rng is None else rng)
+
+    @traced()
+    def generate_parallel(self, syllable_length: int, n: int, workers: int | None = None,
+                          sink: str | None = None, separator: str = '') -> list[str]:
+        """Generate words in worker processes; see ``phonology_parallel.generate_parallel``.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+            n: int: The number of words to generate.
+            workers: int | None: The number of processes; defaults to the CPU count.
+            sink: str | None: A path containing ``{shard}`` to write each shard to.
+            separator: str: The string placed between syllables.
+
+        Returns:
+            list[str]: The rendered words, or the shard file paths if ``sink`` is given.
+
+        Raises:
+            ValueError: If ``sink`` does not contain ``{shard}``.
+        """
+        from phonology_parallel import generate_parallel
+        return generate_parallel(self, syllable_length, n, workers, separator=separator, sink=sink)
+
+    def iter_words(self, syllable_length: int, n: int | None = None, separator: str = '',
+                   stream: RandomStream | None = None):
+        """Lazily generate words as unicode strings in constant memory.
+
+        The words are the same as the rendered output of ``generate_random``
+        for the same stream, but only one block of state is held at a time.
+        If the generator has phonotactic rules, words that break them are
+        skipped and ``n`` counts the words that are kept.
+
+        Arguments:
+            syllable_length: int: The number of syllables in each word.
+            n: int | None: The number of words to generate; words are generated
+                without end if None.
+            separator: str: The string placed between syllables.
+            stream: RandomStream | None: The stream the words are drawn from; a new
+                child stream of the generator's RNG is used if None.
+
+        Yields:
+            word: str: The rendered word.
+
+        Raises:
+            ValueError: If more than ``phonotactics.MAX_REJECTED_IN_ROW`` words in a row
+                break the rules.
+        """
+        stream = stream if stream is not None else self.rng.spawn()[0]
+        phonotactics = self.phonotactics
+        if phonotactics is None:
+            return GeneratorSpec.from_generator(self, syllable_length).iter_range(0, n, stream, separator)
+        from phonotactics import MAX_REJECTED_IN_ROW
+        words = phonotactics.filter(
+            GeneratorSpec.from_generator(self, syllable_length).iter_range(0, None, stream, separator), separator,
+            MAX_REJECTED_IN_ROW
+        )
+        return words if n is None else islice(words, n)
 
     def print_word(self, syllable_list: list[IPAChar], seperator: str = ''):
-        print(seperator.join([''.join([j.unicode_repr for j in i]) for i in syllable_list]))
+        print(self.plan.render(syllable_list, seperator))
 
 
-__all__ = ["Phonemes", "PhonemeConstraint", "PhonemeGenerator"]
+__all__ = ["Phonemes", "PhonemeConstraint", "GeneratorSpec", "PhonemeGenerator"]
 
 if __name__ == "__main__":
+    from ipapy.ipachar import IPAChar
     inventory = [
         IPAChar(descriptors="open front unrounded vowel"),
         IPAChar(descriptors="close front unrounded vowel"),
@@ -0,0 +1,201 @@
+# phonology_batch.py
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from phonology import phoneme_symbol
+from phonotactics import MAX_REJECTED_IN_ROW
+
+
+class WordBatch:
+    def __init__(self, symbols: list[str], ids, mask, syllable_starts: tuple[int]):
+        """
+        Initialize a batch of words stored as arrays of phoneme ids.
+
+        Every word in a batch follows the same syllable template, so each word
+        is one row of ``ids`` with one column per phoneme slot. ``mask`` marks
+        the slots that were generated; optional slots that were skipped are
+        ``False`` and are left out when the word is rendered.
+
+        :param symbols: list[str]: The unicode representation of each phoneme id.
+        :param ids: numpy.ndarray: A (words, slots) array of phoneme ids.
+        :param mask: numpy.ndarray: A (words, slots) boolean array of generated slots.
+        :param syllable_starts: tuple[int]: The first slot of each syllable.
+        """
+        self.symbols = symbols
+        self.ids = ids
+        self.mask = mask
+        self.syllable_starts = syllable_starts
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> str:
+        return self.word(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.word(i)
+
+    def word(self, index: int, separator: str = '') -> str:
+        """Render the word at ``index`` as a unicode string.
+
+        Arguments:
+            index: int: The index of the word in the batch.
+            separator: str: The string placed between syllables.
+
+        Returns:
+            str: The rendered word.
+        """
+        symbols = self.symbols
+        ids = self.ids[index].tolist()
+        mask = self.mask[index].tolist()
+        bounds = self.syllable_starts + (len(ids),)
+        return separator.join(
+            ''.join(symbols[ids[j]] for j in range(bounds[s], bounds[s + 1]) if mask[j])
+            for s in range(len(self.syllable_starts))
+        )
+
+    def to_strings(self, separator: str = '') -> list[str]:
+        """Render every word in the batch as a unicode string.
+
+        Arguments:
+            separator: str: The string placed between syllables.
+
+        Returns:
+            list[str]: The rendered words.
+        """
+        if len(self) == 0:
+            return []
+        # Skipped slots render as the empty string at the end of the table
+        table = np.array(self.symbols + [''], dtype=object)
+        parts = table[np.where(self.mask, self.ids, len(self.symbols))]
+        bounds = self.syllable_starts + (parts.shape[1],)
+        words = None
+        for s in range(len(self.syllable_starts)):
+            syllable = np.full(len(self), '', dtype=object)
+            for j in range(bounds[s], bounds[s + 1]):
+                syllable = syllable + parts[:, j]
+            words = syllable if words is None else words + separator + syllable
+        if words is None:
+            return [''] * len(self)
+        return words.tolist()
+
+
+def generate_batch(generator, syllable_length: int, n: int, rng=None) -> WordBatch:
+    """Generate ``n`` words of ``syllable_length`` syllables from a PhonemeGenerator.
+
+    The inventory is mapped to integer ids and every slot choice and optional
+    slot coin flip of the batch is drawn as a single NumPy array. Constraints
+    are applied per syllable exactly as in ``PhonemeGenerator.generate_syllables``.
+    Words that break the generator's phonotactic rules are dropped, and more
+    words are drawn until ``n`` are kept.
+
+    Arguments:
+        generator: PhonemeGenerator: The generator providing the inventory and constraints.
+        syllable_length: int: The number of syllables in each word.
+        n: int: The number of words to generate.
+        rng: numpy.random.Generator | random.Random | int | None: The generator or seed to draw
+            from. A ``random.Random`` seeds a new NumPy generator from its next 128 bits.
+
+    Returns:
+        WordBatch: The generated words.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If a constrained phoneme type is not defined in the inventory, or more
+            than ``phonotactics.MAX_REJECTED_IN_ROW`` words in a row break the rules.
+    """
+    if np is None:
+        raise ImportError("Batch generation requires NumPy; install it with the `numpy` extra.")
+    if isinstance(rng, random.Random):
+        rng = rng.getrandbits(128)
+    rng = np.random.default_rng(rng)
+    # Map the inventory to ids; each phoneme type becomes a pool of ids
+    symbols = []
+    ids = {}
+    pools = {}
+    for t, phonemes in generator.inventory.items():
+        pool = []
+        for phoneme in phonemes:
+            symbol = phoneme_symbol(phoneme)
+            if symbol not in ids:
+                ids[symbol] = len(symbols)
+                symbols.append(symbol)
+            pool.append(ids[symbol])
+        pools[t] = pool
+    # Lay out the phoneme slots of every syllable in the word
+    slot_pools = []
+    slot_tables = []
+    probabilities = []
+    syllable_starts = []
+    for i in range(syllable_length):
+        syllable_starts.append(len(slot_pools))
+        for cons in generator.syllable_constraint(i):
+            pool = pools.get(cons.phoneme, [])
+            if len(pool) == 0:
+                raise ValueError(f"Phonemes of type {cons.phoneme} are not defined in the inventory.")
+            slot_pools.append(pool)
+            slot_tables.append(generator.alias_tables.get(cons.phoneme))
+            # required phonemes are always generated
+            probabilities.append(cons.probability if cons.optional else 1.0)
+    slots = len(slot_pools)
+    pool_sizes = np.array([len(pool) for pool in slot_pools], dtype=np.int64)
+    pool_table = np.zeros((slots, int(pool_sizes.max(initial=1))), dtype=np.uint16)
+    for j, pool in enumerate(slot_pools):
+        pool_table[j, :len(pool)] = pool
+    weighted = any(table is not None for table in slot_tables)
+    if weighted:
+        # Weighted pools keep the column or take its alias, as in AliasTable.sample
+        keep_table = np.ones(pool_table.shape)
+        alias_table = np.tile(np.arange(pool_table.shape[1]), (slots, 1))
+        for j, table in enumerate(slot_tables):
+            if table is not None:
+                keep_table[j, :len(table)] = table.probability
+                alias_table[j, :len(table)] = table.alias
+    probabilities = np.array(probabilities)
+
+    def draw(count):
+        # Draw every choice and coin flip in one shot
+        choices = (rng.random((count, slots)) * pool_sizes).astype(np.int64)
+        if weighted:
+            keep = rng.random((count, slots)) < keep_table[np.arange(slots), choices]
+            choices = np.where(keep, choices, alias_table[np.arange(slots), choices])
+        return pool_table[np.arange(slots), choices], rng.random((count, slots)) < probabilities
+
+    word_ids, mask = draw(n)
+    phonotactics = generator.phonotactics
+    if phonotactics is not None:
+        # Check the generated slots of each row against the rules, drawing
+        # more rows until enough are allowed
+        filter_ids = [phonotactics.alphabet.ids[symbol] for symbol in symbols]
+        check = phonotactics.check
+        kept_ids = []
+        kept_mask = []
+        kept = 0
+        rejected = 0
+        while True:
+            allowed = np.array([
+                check([filter_ids[i] for i, generated in zip(row, row_mask) if generated])
+                for row, row_mask in zip(word_ids.tolist(), mask.tolist())
+            ], dtype=bool)
+            kept_ids.append(word_ids[allowed])
+            kept_mask.append(mask[allowed])
+            kept += int(allowed.sum())
+            if kept >= n:
+                break
+            rejected = rejected + len(allowed) if not allowed.any() else 0
+            if rejected > MAX_REJECTED_IN_ROW:
+                raise phonotactics.rejection_error(rejected)
+            # after a run of rejected rows draw as many again; rows past ``n`` are dropped
+            word_ids, mask = draw(max(n - kept, rejected))
+        word_ids = np.concatenate(kept_ids)[:n]
+        mask = np.concatenate(kept_mask)[:n]
+    return WordBatch(symbols, word_ids, mask, tuple(syllable_starts))
+
+
+__all__ = ["WordBatch", "generate_batch"]
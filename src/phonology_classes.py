@@ -0,0 +1,169 @@
+# phonology_classes.py
+
+from functools import reduce
+from operator import and_, or_
+
+from phonology_const import CHART_CLASSES, CHART_NAMES
+
+
+class NaturalClassIndex:
+    def __init__(self, phonemes=()):
+        """
+        Initialize an index of the natural classes of an inventory.
+
+        Every phoneme gets one bit, and every feature value, such as
+        ``voiceless``, ``plosive`` or ``front``, gets a bitset of the phonemes
+        that have it, so a query is a few bitwise operations on integers.
+        The feature values are the ipapy descriptors of the phonemes, named
+        as in the tables of ``phonology_const`` (see ``CHART_NAMES``) so the
+        same class is spelled the same way in ``phonology_features``; queries
+        accept the ipapy names too. A sibilant fricative is also a
+        ``fricative``, as in the tables. A phoneme keeps its bit while it is in the index, and the bits of
+        removed phonemes are given to the next phonemes added.
+
+        :param phonemes: Iterable[IPAChar]: The phonemes to index.
+        """
+        # The symbol of each bit, or None for a bit freed by a removed phoneme
+        self.symbols = []
+        self.bits = {}
+        self.classes = {}
+        # The bitset of every phoneme in the index
+        self.everything = 0
+        self._features = {}
+        self._free = []
+        for phoneme in phonemes:
+            self.add(phoneme)
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.bits
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+phonemes: {len(self.bits)} - classes: {len(self.classes)}>"
+
+    def add(self, phoneme) -> int:
+        """Add a phoneme to the index if it is not already in it.
+
+        Arguments:
+            phoneme: IPAChar: The phoneme.
+
+        Returns:
+            int: The bit of the phoneme.
+        """
+        from phonology import phoneme_symbol
+        symbol = phoneme_symbol(phoneme)
+        if symbol in self.bits:
+            return self.bits[symbol]
+        if self._free:
+            bit = self._free.pop()
+            self.symbols[bit] = symbol
+        else:
+            bit = len(self.symbols)
+            self.symbols.append(symbol)
+        self.bits[symbol] = bit
+        self.everything |= 1 << bit
+        self._features[symbol] = tuple(dict.fromkeys(
+            name for value in phoneme.descriptors
+            for name in (CHART_NAMES.get(value, value), CHART_CLASSES.get(value)) if name is not None
+        ))
+        for value in self._features[symbol]:
+            self.classes[value] = self.classes.get(value, 0) | 1 << bit
+        return bit
+
+    def remove(self, symbol: str):
+        """Remove a phoneme from the index.
+
+        Arguments:
+            symbol: str: The unicode representation of the phoneme.
+
+        Raises:
+            KeyError: If the phoneme is not in the index.
+        """
+        bit = self.bits.pop(symbol)
+        for value in self._features.pop(symbol):
+            self.classes[value] &= ~(1 << bit)
+            if not self.classes[value]:
+                del self.classes[value]
+        self.everything &= ~(1 << bit)
+        self.symbols[bit] = None
+        self._free.append(bit)
+
+    def update(self, phonemes):
+        """Make the index hold exactly the given phonemes, only touching the ones that changed.
+
+        Arguments:
+            phonemes: Iterable[IPAChar]: The phonemes.
+        """
+        from phonology import phoneme_symbol
+        phonemes = {phoneme_symbol(phoneme): phoneme for phoneme in phonemes}
+        for symbol in [symbol for symbol in self.bits if symbol not in phonemes]:
+            self.remove(symbol)
+        for symbol, phoneme in phonemes.items():
+            if symbol not in self.bits:
+                self.add(phoneme)
+
+    def features(self, symbol: str) -> tuple[str, ...]:
+        """Get the feature values of a phoneme.
+
+        Arguments:
+            symbol: str: The unicode representation of the phoneme.
+
+        Returns:
+            tuple[str, ...]: The feature values.
+        """
+        return self._features[symbol]
+
+    def all_of(self, *values: str) -> int:
+        """Get the bitset of the phonemes that have every one of the feature values.
+
+        Arguments:
+            *values: str: Feature values such as ``"voiceless"`` and ``"plosive"``.
+
+        Returns:
+            int: The bitset; every phoneme if no values are given.
+        """
+        classes = self.classes
+        return reduce(and_, (classes.get(CHART_NAMES.get(value, value), 0) for value in values), self.everything)
+
+    def any_of(self, *values: str) -> int:
+        """Get the bitset of the phonemes that have at least one of the feature values.
+
+        Arguments:
+            *values: str: Feature values such as ``"front"`` and ``"central"``.
+
+        Returns:
+            int: The bitset; no phonemes if no values are given.
+        """
+        classes = self.classes
+        return reduce(or_, (classes.get(CHART_NAMES.get(value, value), 0) for value in values), 0)
+
+    def phonemes(self, bits: int) -> list[str]:
+        """Get the phonemes of a bitset.
+
+        Arguments:
+            bits: int: The bitset, from ``all_of``, ``any_of`` or combining them.
+
+        Returns:
+            list[str]: The unicode representations of the phonemes, in bit order.
+        """
+        symbols = self.symbols
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(symbols[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+    def select(self, *values: str) -> list[str]:
+        """Get the phonemes that have every one of the feature values; see ``all_of``.
+
+        Returns:
+            list[str]: The unicode representations of the phonemes, in bit order.
+        """
+        return self.phonemes(self.all_of(*values))
+
+
+__all__ = ["NaturalClassIndex"]
@@ -244,8 +244,24 @@ VOWELS = {
     }
 }
 
+# ipapy descriptors that the tables above name differently
+CHART_NAMES = {
+    "bilabial": "bi-labial",
+    "palato-alveolar": "post-alveolar",
+    "flap": "tap",
+    "near-close": "medial-close-mid",
+    "near-open": "medial-open-mid",
+}
+# ipapy descriptors of kinds of a feature in the tables, which belong to that feature too
+CHART_CLASSES = {
+    "sibilant-fricative": "fricative",
+    "non-sibilant-fricative": "fricative",
+}
+
 __all__ = [
     "PULMONIC_CONSONANTS",
     "NON_PULMONIC_CONSONANTS",
     "VOWELS",
+    "CHART_NAMES",
+    "CHART_CLASSES",
 ]
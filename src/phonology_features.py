@@ -0,0 +1,347 @@
+# phonology_features.py
+
+import hashlib
+import json
+import os
+import struct
+from functools import cache
+from glob import glob
+from importlib.util import find_spec
+from os import path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from phonology_const import CHART_NAMES, PULMONIC_CONSONANTS, NON_PULMONIC_CONSONANTS, VOWELS
+
+# Version of the cached matrix format
+FEATURES_VERSION = 2
+CACHE_FILE = "features.bin"
+
+# The columns of the matrix; a vowel's backness is its place
+COLUMNS = ("manner", "place", "voicing", "height", "rounding")
+# The code of a feature that does not apply, such as the height of a consonant
+NONE = -1
+
+# The values of each column in chart order, so codes can be compared and sorted
+CONSONANT_PLACES = ("bi-labial", "labio-dental", "dental", "alveolar", "post-alveolar", "retroflex",
+                    "palatal", "velar", "uvular", "pharyngeal", "glottal")
+VOWEL_PLACES = ("front", "central", "back")
+VOICINGS = ("voiceless", "voiced")
+ROUNDINGS = ("unrounded", "rounded")
+
+
+@cache
+def phoneme_features() -> dict[str, dict[str, str]]:
+    """Get the features of every phoneme in ``phonology_const``.
+
+    Consonants have a manner, place and voicing, and vowels a height,
+    backness and rounding, named after the keys of the tables. The place
+    and voicing of a consonant are taken from ipapy where it has them.
+
+    Returns:
+        dict[str, dict[str, str]]: The features of each phoneme by unicode representation.
+    """
+    from ipapy import UNICODE_TO_IPA
+    features = {}
+    chart_places = {place for table in (PULMONIC_CONSONANTS, NON_PULMONIC_CONSONANTS)
+                    for places in table.values() for place in places}
+    for table in (PULMONIC_CONSONANTS, NON_PULMONIC_CONSONANTS):
+        for manner, places in table.items():
+            for place, voicings in places.items():
+                for voicing, symbol in voicings.items():
+                    # the place and voicing keys follow the cells of the chart,
+                    # which are not all aligned with the phonemes in them, so the
+                    # place and voicing of the phoneme itself are taken from ipapy
+                    char = UNICODE_TO_IPA.get(symbol)
+                    if char is not None and char.voicing in ("voiced", "voiceless"):
+                        voicing = char.voicing
+                    if char is not None and getattr(char, "place", None):
+                        ipapy_place = CHART_NAMES.get(char.place, char.place)
+                        if ipapy_place in chart_places:
+                            place = ipapy_place
+                    features[symbol] = {"manner": manner, "place": place, "voicing": voicing}
+    for height, backnesses in VOWELS.items():
+        for backness, roundings in backnesses.items():
+            for rounding, symbol in roundings.items():
+                features[symbol] = {"height": height, "backness": backness, "rounding": rounding}
+    return features
+
+
+@cache
+def natural_classes() -> dict[str, tuple[str, ...]]:
+    """Get the phonemes of every feature in ``phonology_const``.
+
+    Besides each feature value, such as ``plosive`` or ``front``, there are
+    the classes ``consonant`` and ``vowel``.
+
+    Returns:
+        dict[str, tuple[str, ...]]: The phonemes with each feature, in table order.
+    """
+    classes = {"consonant": [], "vowel": []}
+    for symbol, features in phoneme_features().items():
+        classes["vowel" if "height" in features else "consonant"].append(symbol)
+        for value in features.values():
+            classes.setdefault(value, []).append(symbol)
+    return {name: tuple(symbols) for name, symbols in classes.items()}
+
+
+def _ipapy_version() -> str:
+    # Read from the installed distribution, since importing ipapy is what the cache avoids
+    spec = find_spec("ipapy")
+    if spec is None or spec.origin is None:
+        return ""
+    site = path.dirname(path.dirname(spec.origin))
+    distributions = sorted(path.basename(name) for name in glob(path.join(site, "ipapy-*")))
+    return " ".join(distributions) or str(os.stat(spec.origin).st_mtime_ns)
+
+
+def _table_key() -> str:
+    # The cache is rebuilt whenever the tables in phonology_const or ipapy, which
+    # gives the place and voicing of consonants, change
+    tables = repr((FEATURES_VERSION, _ipapy_version(), PULMONIC_CONSONANTS, NON_PULMONIC_CONSONANTS, VOWELS,
+                   CHART_NAMES))
+    return hashlib.sha1(tables.encode("utf-8")).hexdigest()
+
+
+class FeatureMatrix:
+    def __init__(self, symbols: list[str], matrix, values: tuple[tuple[str, ...], ...]):
+        """
+        Initialize a matrix of phonological features with one row per phoneme.
+
+        Each column of ``matrix`` holds the code of one feature in ``COLUMNS``:
+        the index of the value in ``values`` for that column, or ``NONE`` if the
+        feature does not apply. Row ``i`` is the phoneme ``symbols[i]``.
+
+        :param symbols: list[str]: The unicode representation of each phoneme id.
+        :param matrix: numpy.ndarray: A (phonemes, features) array of int8 codes.
+        :param values: tuple[tuple[str, ...], ...]: The names of the codes of each column.
+        """
+        self.symbols = list(symbols)
+        self.ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.matrix = matrix
+        self.values = tuple(tuple(names) for names in values)
+        # Every value name is in one column, so a bare name like "plosive" is enough
+        self._codes = {name: (column, code) for column, names in enumerate(self.values)
+                       for code, name in enumerate(names)}
+
+    @staticmethod
+    def build() -> "FeatureMatrix":
+        """Build the matrix from the tables in ``phonology_const``.
+
+        Returns:
+            FeatureMatrix: The matrix.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("The feature matrix requires NumPy; install it with the `numpy` extra.")
+        manners = tuple(dict.fromkeys(m for table in (PULMONIC_CONSONANTS, NON_PULMONIC_CONSONANTS) for m in table))
+        values = (manners, CONSONANT_PLACES + VOWEL_PLACES, VOICINGS, tuple(VOWELS), ROUNDINGS)
+        features = phoneme_features()
+        symbols = list(features)
+        matrix = np.full((len(symbols), len(COLUMNS)), NONE, dtype=np.int8)
+        for i, symbol in enumerate(symbols):
+            row = features[symbol]
+            if "height" in row:
+                # vowels are voiced and their backness fills the place column
+                row = {"place": row["backness"], "voicing": "voiced",
+                       "height": row["height"], "rounding": row["rounding"]}
+            for column, name in enumerate(COLUMNS):
+                if name in row:
+                    matrix[i, column] = values[column].index(row[name])
+        return FeatureMatrix(symbols, matrix, values)
+
+    @staticmethod
+    def load(file) -> "FeatureMatrix":
+        """Load a matrix written with ``save``.
+
+        The file is the 40 character key of the tables, the length of a JSON
+        header of the symbols and value names, the header, and the codes as
+        raw bytes, so loading it is a single read.
+
+        Arguments:
+            file: str | Path: The path of the file.
+
+        Returns:
+            FeatureMatrix: The matrix.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the file was written from different tables or in another format.
+        """
+        if np is None:
+            raise ImportError("The feature matrix requires NumPy; install it with the `numpy` extra.")
+        with open(file, "rb") as f_in:
+            data = f_in.read()
+        if data[:40].decode("ascii", "replace") != _table_key():
+            raise ValueError("The cached feature matrix is out of date.")
+        length, = struct.unpack_from(">I", data, 40)
+        header = json.loads(data[44:44 + length].decode("utf-8"))
+        matrix = np.frombuffer(data, dtype=np.int8, offset=44 + length).reshape(-1, len(COLUMNS))
+        return FeatureMatrix(header["symbols"], matrix, header["values"])
+
+    def save(self, file):
+        """Write the matrix so it can be loaded without walking the tables.
+
+        Arguments:
+            file: str | Path: The path of the file.
+        """
+        header = json.dumps({"symbols": self.symbols, "values": self.values}).encode("utf-8")
+        with open(file, "wb") as f_out:
+            f_out.write(_table_key().encode("ascii"))
+            f_out.write(struct.pack(">I", len(header)))
+            f_out.write(header)
+            f_out.write(np.ascontiguousarray(self.matrix, dtype=np.int8).tobytes())
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.ids
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+phonemes: {len(self.symbols)} - features: {', '.join(COLUMNS)}>"
+
+    def column(self, name: str):
+        """Get the codes of one feature of every phoneme.
+
+        Arguments:
+            name: str: The name of the feature in ``COLUMNS``.
+
+        Returns:
+            numpy.ndarray: The codes, as a view of the matrix.
+        """
+        return self.matrix[:, COLUMNS.index(name)]
+
+    def features(self, symbol: str) -> dict[str, str]:
+        """Get the features of a phoneme by name.
+
+        Arguments:
+            symbol: str: The unicode representation of the phoneme.
+
+        Returns:
+            dict[str, str]: The value of each feature that applies to the phoneme.
+        """
+        row = self.matrix[self.ids[symbol]]
+        return {name: self.values[column][row[column]] for column, name in enumerate(COLUMNS)
+                if row[column] != NONE}
+
+    def mask(self, *values: str):
+        """Select the phonemes that have every one of the given feature values.
+
+        Arguments:
+            *values: str: Feature values such as ``"voiceless"`` and ``"plosive"``, or
+                ``"consonant"`` or ``"vowel"``. The ipapy names in ``CHART_NAMES``, such
+                as ``"bilabial"``, are accepted too.
+
+        Returns:
+            numpy.ndarray: A boolean array with one entry per phoneme id.
+
+        Raises:
+            KeyError: If a value is not a feature value.
+        """
+        mask = np.ones(len(self.symbols), dtype=bool)
+        for value in values:
+            if value == "consonant":
+                mask &= self.column("manner") != NONE
+            elif value == "vowel":
+                mask &= self.column("height") != NONE
+            else:
+                column, code = self._codes[CHART_NAMES.get(value, value)]
+                mask &= self.matrix[:, column] == code
+        return mask
+
+    def natural_class(self, *values: str) -> list[str]:
+        """Get the phonemes that have every one of the given feature values; see ``mask``.
+
+        Returns:
+            list[str]: The phonemes, in id order.
+        """
+        return [self.symbols[i] for i in np.flatnonzero(self.mask(*values))]
+
+    def distances(self, symbol: str):
+        """Count the features in which every phoneme differs from one phoneme.
+
+        Arguments:
+            symbol: str: The unicode representation of the phoneme.
+
+        Returns:
+            numpy.ndarray: The number of differing features of each phoneme id.
+        """
+        return (self.matrix != self.matrix[self.ids[symbol]]).sum(axis=1)
+
+    def distance_matrix(self, symbols: list[str] | None = None):
+        """Count the features in which every pair of phonemes differs.
+
+        Arguments:
+            symbols: list[str] | None: The phonemes to compare; every phoneme if None.
+
+        Returns:
+            numpy.ndarray: A (phonemes, phonemes) array of distances in the order given.
+        """
+        rows = self.matrix if symbols is None else self.matrix[[self.ids[s] for s in symbols]]
+        return (rows[:, None, :] != rows[None, :, :]).sum(axis=2)
+
+    def sort(self, symbols, by: tuple[str, ...] = COLUMNS) -> list[str]:
+        """Sort phonemes by their features in chart order.
+
+        Arguments:
+            symbols: Iterable[str]: The phonemes to sort.
+            by: tuple[str, ...]: The features to sort by, most significant first.
+
+        Returns:
+            list[str]: The sorted phonemes; ties keep their order.
+        """
+        symbols = list(symbols)
+        rows = self.matrix[[self.ids[s] for s in symbols]]
+        # lexsort sorts by its last key first
+        order = np.lexsort([rows[:, COLUMNS.index(name)] for name in reversed(by)])
+        return [symbols[i] for i in order]
+
+
+@cache
+def feature_matrix(cache_dir=None) -> FeatureMatrix:
+    """Get the feature matrix of ``phonology_const``, loading it from a cache file if possible.
+
+    Building the matrix imports ipapy to look up place and voicing, so the
+    result is written to the cache directory, which is created if needed,
+    and later sessions only load the arrays.
+
+    Arguments:
+        cache_dir: str | Path | None: The directory of the cache file; the user
+            cache directory if None.
+
+    Returns:
+        FeatureMatrix: The matrix, shared by every call with the same directory.
+    """
+    if cache_dir is None:
+        from platformdirs import user_cache_path
+        cache_dir = user_cache_path("Wordweaver", False, ensure_exists=True)
+    file = path.join(cache_dir, CACHE_FILE)
+    try:
+        return FeatureMatrix.load(file)
+    except (OSError, ValueError, KeyError, struct.error):
+        pass
+    matrix = FeatureMatrix.build()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        matrix.save(file)
+    except OSError:
+        # the cache is an optimization; an unwritable directory only costs the rebuild
+        pass
+    return matrix
+
+
+__all__ = [
+    "COLUMNS",
+    "NONE",
+    "phoneme_features",
+    "natural_classes",
+    "FeatureMatrix",
+    "feature_matrix",
+]
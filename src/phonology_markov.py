@@ -0,0 +1,208 @@
+# phonology_markov.py
+
+import random
+from array import array
+from bisect import bisect_right
+
+from phoneme_word import PhonemeAlphabet, PhonemeWord
+from phonology_random import RandomStream, as_stream
+
+# Column of the word boundary in a row of counts; phoneme id i is column i + 1
+BOUNDARY = 0
+
+
+class MarkovGenerator:
+    def __init__(self, order: int = 2, alphabet: PhonemeAlphabet | None = None,
+                 rng: RandomStream | random.Random | int | None = None, max_length: int = 255):
+        """
+        Initialize a phoneme n-gram model that generates words like the words it was trained on.
+
+        Each context of ``order`` phonemes is a row of a single flat array of
+        counts, with one column per phoneme id and one for the end of the
+        word; a dict only maps contexts to rows. Training adds to the counts,
+        so words can be added at any time, and only the cumulative counts of
+        the rows that were used are rebuilt before sampling again.
+
+        :param order: int: The number of previous phonemes each phoneme depends on.
+        :param alphabet: PhonemeAlphabet | None: The alphabet used to split words into
+            phonemes; unknown characters are added to it.
+        :param rng: RandomStream | random.Random | int | None: The seed or random generator
+            used for generation.
+        :param max_length: int: The maximum number of phonemes in a generated word.
+        :raises ValueError: If the order is less than 1.
+        """
+        if order < 1:
+            raise ValueError("The order of a Markov generator must be at least 1.")
+        self.order = order
+        self.alphabet = alphabet if alphabet is not None else PhonemeAlphabet()
+        self.rng = as_stream(rng)
+        self.max_length = max_length
+        self.words = 0
+        self._width = len(self.alphabet) + 1
+        self._counts = array('L')
+        self._rows = {}
+        self._contexts = []
+        self._tables = {}
+
+    @staticmethod
+    def from_project(project, order: int = 2, rng=None) -> "MarkovGenerator":
+        """Train a generator on the lexicon of a project.
+
+        Arguments:
+            project: WordweaverProject: The project.
+            order: int: The number of previous phonemes each phoneme depends on.
+            rng: RandomStream | random.Random | int | None: The seed or random generator.
+
+        Returns:
+            MarkovGenerator: The trained generator.
+        """
+        generator = MarkovGenerator(order, PhonemeAlphabet(project.alphabet.symbols), rng)
+        generator.train(project.lexicon)
+        return generator
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+order: {self.order} - words: {self.words} - contexts: {len(self._contexts)}>"
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the count table."""
+        return self._counts.itemsize * len(self._counts)
+
+    def _row(self, context: tuple[int, ...]) -> int:
+        row = self._rows.get(context)
+        if row is None:
+            row = self._rows[context] = len(self._contexts)
+            self._contexts.append(context)
+            self._counts.extend(bytes(self._counts.itemsize * self._width))
+        return row
+
+    def _widen(self):
+        # Lay the rows out again with a column for every phoneme of the alphabet
+        width = len(self.alphabet) + 1
+        counts = array('L', bytes(self._counts.itemsize * width * len(self._contexts)))
+        for row in range(len(self._contexts)):
+            counts[row * width:row * width + self._width] = self._counts[row * self._width:(row + 1) * self._width]
+        self._counts = counts
+        self._width = width
+        self._tables = {}
+
+    def train(self, words, separator: str | None = None):
+        """Add the phoneme n-grams of words to the model.
+
+        Arguments:
+            words: Iterable[str | PhonemeWord]: The words, such as ``WordweaverProject.lexicon``.
+            separator: str | None: The syllable separator to remove from unicode strings.
+        """
+        order = self.order
+        start = (BOUNDARY,) * order
+        touched = set()
+        for word in words:
+            if isinstance(word, PhonemeWord):
+                ids = self.alphabet.encode(word).ids
+            else:
+                ids = self.alphabet.tokenize(word.replace(separator, '') if separator else word)
+            if len(self.alphabet) + 1 > self._width:
+                self._widen()
+            columns = start + tuple(i + 1 for i in ids) + (BOUNDARY,)
+            width = self._width
+            counts = self._counts
+            for i in range(len(columns) - order):
+                row = self._row(columns[i:i + order])
+                counts[row * width + columns[i + order]] += 1
+                touched.add(row)
+            self.words += 1
+        for row in touched:
+            self._tables.pop(row, None)
+
+    def _table(self, row: int) -> tuple[list[int], list[int], list[int]]:
+        # The cumulative counts, columns and following rows of a context
+        table = self._tables.get(row)
+        if table is None:
+            width = self._width
+            context = self._contexts[row][1:]
+            cumulative = []
+            columns = []
+            rows = []
+            total = 0
+            for column, count in enumerate(self._counts[row * width:(row + 1) * width]):
+                if count:
+                    total += count
+                    cumulative.append(total)
+                    columns.append(column)
+                    # contexts that follow a trained transition were trained too
+                    rows.append(-1 if column == BOUNDARY else self._rows[context + (column,)])
+            table = self._tables[row] = (cumulative, columns, rows)
+        return table
+
+    def probability(self, context, phoneme: str | None) -> float:
+        """Get the probability of a phoneme following a context.
+
+        Arguments:
+            context: Sequence[str]: The previous phonemes; shorter contexts are
+                taken to follow the start of the word.
+            phoneme: str | None: The next phoneme, or None for the end of the word.
+
+        Returns:
+            float: The probability, or 0 if the context was never seen.
+        """
+        ids = [self.alphabet.ids[p] + 1 if p in self.alphabet else -1 for p in context][-self.order:]
+        row = self._rows.get(tuple([BOUNDARY] * (self.order - len(ids)) + ids))
+        if row is None:
+            return 0.0
+        column = BOUNDARY if phoneme is None else self.alphabet.ids.get(phoneme, -2) + 1
+        counts = self._counts[row * self._width:(row + 1) * self._width]
+        return counts[column] / sum(counts) if 0 <= column < self._width else 0.0
+
+    def iter_words(self, n: int | None = None, rng: random.Random | None = None):
+        """Lazily sample words from the model.
+
+        Arguments:
+            n: int | None: The number of words; words are generated without end if None.
+            rng: random.Random | None: The generator to draw from; a new child stream
+                of the generator's RNG is used if None.
+
+        Yields:
+            word: str: The next word.
+
+        Raises:
+            ValueError: If the model has not been trained.
+        """
+        if not self.words:
+            raise ValueError("The Markov generator has not been trained.")
+        return self._iter_words(n, rng if rng is not None else self.rng.spawn()[0])
+
+    def _iter_words(self, n: int | None, rng: random.Random):
+        random_ = rng.random
+        tables = self._tables
+        table = self._table
+        symbols = [''] + self.alphabet.symbols
+        start = self._rows[(BOUNDARY,) * self.order]
+        max_length = self.max_length
+        count = 0
+        while n is None or count < n:
+            row = start
+            word = []
+            while len(word) < max_length:
+                cumulative, columns, rows = tables[row] if row in tables else table(row)
+                j = bisect_right(cumulative, random_() * cumulative[-1])
+                if columns[j] == BOUNDARY:
+                    break
+                word.append(symbols[columns[j]])
+                row = rows[j]
+            yield ''.join(word)
+            count += 1
+
+    def generate(self, n: int) -> list[str]:
+        """Sample ``n`` words from the model.
+
+        Arguments:
+            n: int: The number of words.
+
+        Returns:
+            list[str]: The words.
+        """
+        return list(self.iter_words(n))
+
+
+__all__ = ["BOUNDARY", "MarkovGenerator"]
@@ -0,0 +1,135 @@
+# phonology_parallel.py
+
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count, remove
+
+from phoneme_word import PhonemeAlphabet
+from phonology import GeneratorSpec
+from phonology_random import WORD_BLOCK_SIZE, RandomStream, shard_ranges
+from phonotactics import MAX_REJECTED_IN_ROW, PhonotacticFilter
+from word_sink import WordSink, read_words
+
+
+def _generate_shard(spec: GeneratorSpec, shard: int, start: int, stop: int, stream: RandomStream,
+                    separator: str, sink: str | None, rules: list, symbols: list[str]):
+    words = spec.iter_range(start, stop, stream, separator)
+    # each worker compiles its own filter and sends back its counts
+    phonotactics = PhonotacticFilter(rules, PhonemeAlphabet(symbols)) if rules else None
+    if phonotactics is not None:
+        words = phonotactics.filter(words, separator)
+    if sink is None:
+        result = list(words)
+    else:
+        result = sink.format(shard=shard)
+        with WordSink(result) as word_sink:
+            word_sink.write_all(words)
+    if phonotactics is None:
+        return result, 0, []
+    return result, phonotactics.checked, phonotactics.rejection_counts
+
+
+def _truncate_shards(paths: list[str], shard_kept: list[int], excess: int) -> list[str]:
+    # Drop the last ``excess`` words of the shard files, removing the files left empty
+    paths = list(paths)
+    while excess > 0:
+        path = paths.pop()
+        if shard_kept[len(paths)] <= excess:
+            excess -= shard_kept[len(paths)]
+            remove(path)
+            continue
+        words = list(read_words(path))[:shard_kept[len(paths)] - excess]
+        with WordSink(path) as word_sink:
+            word_sink.write_all(words)
+        paths.append(path)
+        excess = 0
+    return paths
+
+
+def _block_ranges(start: int, stop: int, shards: int) -> list[tuple[int, int]]:
+    # Split words ``start`` to ``stop`` into ranges aligned to WORD_BLOCK_SIZE
+    first = start // WORD_BLOCK_SIZE
+    blocks = -(-stop // WORD_BLOCK_SIZE) - first
+    return [(max((first + b_start) * WORD_BLOCK_SIZE, start), min((first + b_stop) * WORD_BLOCK_SIZE, stop))
+            for b_start, b_stop in shard_ranges(blocks, min(shards, blocks) or 1)]
+
+
+def generate_parallel(generator, syllable_length: int, n: int, workers: int | None = None,
+                      shards: int | None = None, separator: str = '', sink: str | None = None,
+                      stream: RandomStream | None = None) -> list[str]:
+    """Generate ``n`` words across a pool of worker processes.
+
+    The words are split into shards aligned to ``WORD_BLOCK_SIZE`` and each
+    worker receives a ``GeneratorSpec`` rather than IPAChar objects. Shards
+    are merged in order, so the result equals the rendered output of
+    ``generator.generate_range(syllable_length, 0, n, stream)``.
+
+    Each worker drops the words that break the generator's phonotactic rules
+    and its counts are added to ``generator.phonotactics``. Words are then
+    generated from where the stream left off until ``n`` are kept, so the
+    result equals the rendered output of ``generator.generate_random`` for
+    the same stream.
+
+    Arguments:
+        generator: PhonemeGenerator: The generator providing the inventory and constraints.
+        syllable_length: int: The number of syllables in each word.
+        n: int: The number of words to generate.
+        workers: int | None: The number of processes; defaults to the CPU count.
+        shards: int | None: The number of shards; defaults to four per worker.
+        separator: str: The string placed between syllables.
+        sink: str | None: A path containing ``{shard}``. If given, each worker writes
+            its words to its own file, one per line, and the file paths are returned.
+        stream: RandomStream | None: The stream the words are drawn from; a new child
+            stream of the generator's RNG is used if None.
+
+    Returns:
+        list[str]: The words, or the shard file paths if ``sink`` is given.
+
+    Raises:
+        ValueError: If ``sink`` does not contain ``{shard}``, or more than
+            ``phonotactics.MAX_REJECTED_IN_ROW`` words in a row break the rules.
+    """
+    if sink is not None and "{shard}" not in sink:
+        # every shard would overwrite the same file, even with a single worker
+        raise ValueError(f"The sink path must contain {{shard}}: {sink}")
+    workers = workers if workers is not None else cpu_count() or 1
+    shards = shards if shards is not None else workers * 4
+    stream = stream if stream is not None else generator.rng.spawn()[0]
+    spec = GeneratorSpec.from_generator(generator, syllable_length)
+    phonotactics = generator.phonotactics
+    rules = phonotactics.rules if phonotactics is not None else []
+    symbols = phonotactics.alphabet.symbols if phonotactics is not None else []
+    results = []
+    shard_kept = []
+    start = 0
+    kept = 0
+    rejected = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            # after a run of rejected words draw as many again, like PhonemeGenerator.generate_random
+            ranges = _block_ranges(start, start + max(n - kept, rejected), shards)
+            shard = len(results)
+            round_kept = kept
+            for result, checked, rejections in executor.map(
+                _generate_shard,
+                [spec] * len(ranges), range(shard, shard + len(ranges)),
+                [r[0] for r in ranges], [r[1] for r in ranges],
+                [stream] * len(ranges), [separator] * len(ranges), [sink] * len(ranges),
+                [rules] * len(ranges), [symbols] * len(ranges),
+            ):
+                results.append(result)
+                if phonotactics is not None:
+                    phonotactics.add_counts(checked, rejections)
+                shard_kept.append(checked - sum(rejections))
+                kept += shard_kept[-1]
+            if phonotactics is None or kept >= n:
+                break
+            rejected = rejected + ranges[-1][1] - start if kept == round_kept else 0
+            if rejected > MAX_REJECTED_IN_ROW:
+                raise phonotactics.rejection_error(rejected)
+            start = ranges[-1][1]
+    if sink is not None:
+        return _truncate_shards(results, shard_kept, kept - n)
+    return [word for words in results for word in words][:n]
+
+
+__all__ = ["generate_parallel"]
@@ -0,0 +1,212 @@
+# phonology_random.py
+
+import random
+from os import urandom
+
+# Words are generated in blocks that each draw from their own child stream,
+# so any range of words can be generated without the words before it.
+WORD_BLOCK_SIZE = 1024
+
+
+class RandomStream(random.Random):
+    def __init__(self, entropy: int | None = None, key: tuple[int, ...] = ()):
+        """
+        Initialize a reproducible random stream that can be split into child streams.
+
+        The stream is seeded from a hash of ``entropy`` and ``key``, so a child
+        stream depends only on its parent's entropy and its own key. Children
+        can be created in any process and never share a seed with their
+        parent or siblings.
+
+        :param entropy: int | None: The seed of the stream; fresh entropy is used if None.
+        :param key: tuple[int, ...]: The path of child indices from the root stream.
+        """
+        if entropy is None:
+            entropy = int.from_bytes(urandom(16), 'big')
+        self.entropy = entropy
+        self.key = tuple(key)
+        self._spawned = 0
+        super().__init__(self._derive_seed())
+
+    def __reduce__(self):
+        return self.__class__, (self.entropy, self.key), (self.getstate(), self._spawned)
+
+    def __setstate__(self, state):
+        state, self._spawned = state
+        self.setstate(state)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+entropy: {self.entropy} - key: {self.key}>"
+
+    def _derive_seed(self) -> str:
+        # random.Random hashes string seeds with SHA-512, which unlike hash()
+        # is the same in every process
+        return ",".join(str(i) for i in (self.entropy,) + self.key)
+
+    def child(self, index: int) -> "RandomStream":
+        """Get the child stream at ``index``; the same index always gives the same stream.
+
+        Arguments:
+            index: int: The index of the child stream.
+
+        Returns:
+            RandomStream: The child stream.
+        """
+        return RandomStream(self.entropy, self.key + (index,))
+
+    def spawn(self, n: int = 1) -> list["RandomStream"]:
+        """Create ``n`` new child streams that have not been spawned before.
+
+        Arguments:
+            n: int: The number of child streams to create.
+
+        Returns:
+            list[RandomStream]: The child streams.
+        """
+        children = [self.child(self._spawned + i) for i in range(n)]
+        self._spawned += n
+        return children
+
+
+class AliasTable:
+    def __init__(self, weights: list[float]):
+        """
+        Initialize a Walker alias table for sampling indices by weight in O(1).
+
+        Sampling picks a column uniformly and then either the column or its
+        alias, so each draw costs two random numbers whatever the number of
+        weights.
+
+        :param weights: list[float]: The non-negative weight of each index.
+        :raises ValueError: If there are no weights, a weight is negative or
+            all weights are zero.
+        """
+        n = len(weights)
+        total = sum(weights)
+        if n == 0 or total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("Weights must be non-negative with a positive total.")
+        scaled = [w * n / total for w in weights]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self.probability[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def sample(self, rng: random.Random) -> int:
+        """Draw an index with probability proportional to its weight.
+
+        Arguments:
+            rng: random.Random: The generator to draw from.
+
+        Returns:
+            int: The index.
+        """
+        i = int(rng.random() * len(self.probability))
+        return i if rng.random() < self.probability[i] else self.alias[i]
+
+
+class RandomPermutation:
+    def __init__(self, n: int, rng: random.Random, rounds: int = 4):
+        """
+        Initialize a random permutation of ``range(n)`` that is computed on demand.
+
+        Indices are shuffled by a keyed Feistel network over the smallest even
+        number of bits that holds ``n``; results outside the range are
+        encrypted again until they fall inside it. Each item costs O(1) time
+        and no memory, so ``n`` can be far larger than could be shuffled.
+
+        :param n: int: The size of the permutation; may be a big integer.
+        :param rng: random.Random: The generator the round keys are drawn from.
+        :param rounds: int: The number of Feistel rounds.
+        :raises ValueError: If n is negative.
+        """
+        if n < 0:
+            raise ValueError("The size of a permutation cannot be negative.")
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._mask = (1 << self._half) - 1
+        self._keys = [rng.getrandbits(max(64, self._half)) for _ in range(rounds)]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _round(self, value: int, key: int) -> int:
+        value = ((value ^ key) * 0x9E3779B97F4A7C15 + key) & self._mask
+        return value ^ (value >> (self._half // 2 + 1))
+
+    def _encrypt(self, value: int) -> int:
+        half = self._half
+        mask = self._mask
+        left, right = value >> half, value & mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << half) | right
+
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("RandomPermutation index out of range")
+        # cycle walking stays inside the range because the network is a bijection
+        value = self._encrypt(index)
+        while value >= self.n:
+            value = self._encrypt(value)
+        return value
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield self[i]
+
+
+def as_stream(rng: "RandomStream | random.Random | int | None") -> RandomStream:
+    """Convert a seed or random generator into a RandomStream.
+
+    Arguments:
+        rng: RandomStream | random.Random | int | None: The seed or generator.
+            A ``random.Random`` is used to seed a new stream.
+
+    Returns:
+        RandomStream: The random stream.
+    """
+    if isinstance(rng, RandomStream):
+        return rng
+    if isinstance(rng, random.Random):
+        return RandomStream(rng.getrandbits(128))
+    if rng is None or isinstance(rng, int):
+        return RandomStream(rng)
+    raise TypeError("RNG must be a seed, random.Random or RandomStream.")
+
+
+def shard_ranges(n: int, shards: int) -> list[tuple[int, int]]:
+    """Split ``n`` words into ``shards`` contiguous ranges of near equal size.
+
+    Arguments:
+        n: int: The number of words.
+        shards: int: The number of ranges.
+
+    Returns:
+        list[tuple[int, int]]: The start and stop of each range.
+    """
+    if shards < 1:
+        raise ValueError("The number of shards must be at least 1.")
+    size, extra = divmod(n, shards)
+    ranges = []
+    start = 0
+    for i in range(shards):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+__all__ = ["WORD_BLOCK_SIZE", "RandomStream", "AliasTable", "RandomPermutation", "as_stream", "shard_ranges"]
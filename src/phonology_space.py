@@ -0,0 +1,210 @@
+# phonology_space.py
+
+from bisect import bisect_right
+from itertools import product
+
+from phonology import phoneme_symbol
+from phonology_random import RandomPermutation, as_stream
+
+
+class SyllableSpace:
+    def __init__(self, constraint, inventory: dict):
+        """
+        Initialize the space of distinct syllables a syllable template can produce.
+
+        Every choice of optional slots gives a sequence of phoneme types, or
+        shape. Shapes that occur more than once are counted once, and since
+        each phoneme has a single type a syllable determines its shape, so
+        the syllables of different shapes never overlap. Syllables are ordered
+        by shape, then by the inventory order of each phoneme.
+
+        :param constraint: tuple[PhonemeConstraint]: The slots of the syllable.
+        :param inventory: dict[Phonemes, list[IPAChar]]: The phonemes of each type.
+        """
+        self.pools = {t: list(phonemes) for t, phonemes in inventory.items()}
+        self._index = {phoneme_symbol(p): (t, i) for t, phonemes in self.pools.items() for i, p in enumerate(phonemes)}
+        shapes = {}
+        for choice in product(*([(cons.phoneme,), ()] if cons.optional else [(cons.phoneme,)] for cons in constraint)):
+            shapes.setdefault(sum(choice, ()), None)
+        self.shapes = list(shapes)
+        self._shape_index = {shape: i for i, shape in enumerate(self.shapes)}
+        self.offsets = [0]
+        for shape in self.shapes:
+            count = 1
+            for t in shape:
+                count *= len(self.pools[t])
+            self.offsets.append(self.offsets[-1] + count)
+
+    @property
+    def count(self) -> int:
+        return self.offsets[-1]
+
+    def unrank(self, rank: int) -> list:
+        """Get the syllable at ``rank``.
+
+        Arguments:
+            rank: int: The rank, from 0 to ``count - 1``.
+
+        Returns:
+            list[IPAChar]: The phonemes of the syllable.
+        """
+        s = bisect_right(self.offsets, rank) - 1
+        rank -= self.offsets[s]
+        syllable = []
+        for t in reversed(self.shapes[s]):
+            rank, i = divmod(rank, len(self.pools[t]))
+            syllable.append(self.pools[t][i])
+        syllable.reverse()
+        return syllable
+
+    def rank(self, syllable) -> int:
+        """Get the rank of a syllable.
+
+        Arguments:
+            syllable: list[IPAChar | str]: The phonemes of the syllable.
+
+        Returns:
+            int: The rank.
+
+        Raises:
+            ValueError: If the template cannot produce the syllable.
+        """
+        try:
+            types, indices = zip(*(self._index[p if isinstance(p, str) else phoneme_symbol(p)]
+                                   for p in syllable)) if syllable else ((), ())
+            s = self._shape_index[types]
+        except KeyError:
+            raise ValueError(f"The syllable {syllable} cannot be generated.") from None
+        rank = 0
+        for t, i in zip(types, indices):
+            rank = rank * len(self.pools[t]) + i
+        return self.offsets[s] + rank
+
+
+class WordSpace:
+    def __init__(self, generator, syllable_length: int):
+        """
+        Initialize the space of distinct words a generator can produce.
+
+        Words are counted as sequences of syllables, so ``pa.ta`` and ``pat.a``
+        are different words. The count is exact and never enumerates the
+        space; it ignores phoneme weights, slot probabilities and phonotactic
+        rules. Word ranks are mixed radix numbers with the first syllable as
+        the most significant digit, so ranking and unranking take one step
+        per phoneme.
+
+        :param generator: PhonemeGenerator: The generator providing the inventory and constraints.
+        :param syllable_length: int: The number of syllables in each word.
+        """
+        self.generator = generator
+        self.syllable_length = syllable_length
+        spaces = {}
+        self.syllables = []
+        for i in range(syllable_length):
+            constraint = generator.syllable_constraint(i)
+            # syllables that share a template share its space
+            if id(constraint) not in spaces:
+                spaces[id(constraint)] = SyllableSpace(constraint, generator.inventory)
+            self.syllables.append(spaces[id(constraint)])
+        self.count = 1
+        for space in self.syllables:
+            self.count *= space.count
+
+    def __contains__(self, word) -> bool:
+        try:
+            self.rank(word)
+        except ValueError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+syllables: {self.syllable_length} - count: {self.count}>"
+
+    def unrank(self, rank: int) -> list[list]:
+        """Get the word at ``rank``.
+
+        Arguments:
+            rank: int: The rank, from 0 to ``count - 1``.
+
+        Returns:
+            list[list[IPAChar]]: The word as a list of syllables, like ``PhonemeGenerator.generate_random``.
+
+        Raises:
+            IndexError: If the rank is out of range.
+        """
+        if not 0 <= rank < self.count:
+            raise IndexError("WordSpace rank out of range")
+        word = []
+        for space in reversed(self.syllables):
+            rank, syllable = divmod(rank, space.count)
+            word.append(space.unrank(syllable))
+        word.reverse()
+        return word
+
+    def rank(self, word) -> int:
+        """Get the rank of a word.
+
+        Arguments:
+            word: list[list[IPAChar | str]]: The word as a list of syllables.
+
+        Returns:
+            int: The rank.
+
+        Raises:
+            ValueError: If the generator cannot produce the word.
+        """
+        if len(word) != self.syllable_length:
+            raise ValueError(f"A word must have {self.syllable_length} syllables.")
+        rank = 0
+        for space, syllable in zip(self.syllables, word):
+            rank = rank * space.count + space.rank(syllable)
+        return rank
+
+    def render(self, rank: int, separator: str = '') -> str:
+        """Get the word at ``rank`` as a unicode string.
+
+        Arguments:
+            rank: int: The rank of the word.
+            separator: str: The string placed between syllables.
+
+        Returns:
+            str: The rendered word.
+        """
+        return separator.join(''.join(phoneme_symbol(p) for p in syllable) for syllable in self.unrank(rank))
+
+    def __iter__(self):
+        for rank in range(self.count):
+            yield self.unrank(rank)
+
+    def sample(self, n: int | None = None, separator: str = '', rng=None):
+        """Lazily draw distinct words uniformly at random without replacement.
+
+        The ranks are taken from a ``RandomPermutation`` of the space, so each
+        word costs O(1) whatever the size of the space and no words need to
+        be remembered.
+
+        Arguments:
+            n: int | None: The number of words; every word of the space if None.
+            separator: str: The string placed between syllables.
+            rng: RandomStream | random.Random | int | None: The seed or random generator
+                of the permutation; a new child stream of the generator's RNG is used if None.
+
+        Yields:
+            word: str: The next rendered word.
+
+        Raises:
+            ValueError: If more words are requested than the space holds.
+        """
+        n = self.count if n is None else n
+        if n > self.count:
+            raise ValueError(f"Only {self.count} distinct words can be generated.")
+        stream = self.generator.rng.spawn()[0] if rng is None else as_stream(rng)
+        return self._sample(RandomPermutation(self.count, stream), n, separator)
+
+    def _sample(self, permutation: RandomPermutation, n: int, separator: str):
+        for i in range(n):
+            yield self.render(permutation[i], separator)
+
+
+__all__ = ["SyllableSpace", "WordSpace"]
@@ -0,0 +1,144 @@
+# phonology_unique.py
+
+import math
+from hashlib import blake2b
+
+# Exclusion lists larger than this are kept in a Bloom filter instead of a set
+BLOOM_THRESHOLD = 1000000
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize a Bloom filter sized for ``capacity`` words.
+
+        Membership tests never miss a word that was added, but may report a
+        word that was not added with probability ``error_rate``.
+
+        :param capacity: int: The number of words expected.
+        :param error_rate: float: The false positive rate at capacity.
+        """
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, word: str):
+        digest = blake2b(word.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, word: str):
+        for position in self._positions(word):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, word: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(word))
+
+
+class GenerationStats:
+    def __init__(self):
+        """Initialize the counters of a unique word generation run."""
+        self.attempts = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.excluded = 0
+        self.exhausted = False
+
+    @property
+    def rejected(self) -> int:
+        return self.duplicates + self.excluded
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejected / self.attempts if self.attempts else 0.0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+attempts: {self.attempts} - accepted: {self.accepted} - duplicates: {self.duplicates} - \
+excluded: {self.excluded} - rejection rate: {self.rejection_rate:.3f} - exhausted: {self.exhausted}>"
+
+
+def max_distinct_words(generator, syllable_length: int) -> int:
+    """Get an upper bound on the number of distinct words a generator can produce.
+
+    Every slot can be any phoneme in its pool, or left out if it is optional.
+
+    Arguments:
+        generator: PhonemeGenerator: The generator.
+        syllable_length: int: The number of syllables in each word.
+
+    Returns:
+        int: The upper bound.
+    """
+    bound = 1
+    for i in range(syllable_length):
+        for cons in generator.syllable_constraint(i):
+            bound *= len(generator.inventory[cons.phoneme]) + (1 if cons.optional else 0)
+    return bound
+
+
+def generate_unique(generator, syllable_length: int, n: int, exclude=(), separator: str = '',
+                    patience: int = 10000) -> tuple[list[str], GenerationStats]:
+    """Generate up to ``n`` distinct words that are not in ``exclude``.
+
+    Candidates come from ``PhonemeGenerator.iter_words`` and are rejected
+    inline if they were already emitted or are excluded. Generation stops
+    early once every word the constraints allow has been emitted, or after
+    ``patience`` rejections in a row.
+
+    Arguments:
+        generator: PhonemeGenerator: The generator.
+        syllable_length: int: The number of syllables in each word.
+        n: int: The number of words wanted.
+        exclude: Iterable[str | PhonemeWord]: Words to leave out, such as
+            ``WordweaverProject.lexicon``. Collections larger than
+            ``BLOOM_THRESHOLD`` are held in a Bloom filter, which can reject
+            a small fraction of new words.
+        separator: str: The string placed between syllables; it is ignored when
+            comparing words.
+        patience: int: The number of rejections in a row before giving up.
+
+    Returns:
+        tuple[list[str], GenerationStats]: The words and the statistics of the run.
+    """
+    stats = GenerationStats()
+    exclude = exclude if hasattr(exclude, '__len__') else list(exclude)
+    if len(exclude) > BLOOM_THRESHOLD:
+        excluded = BloomFilter(len(exclude))
+    else:
+        excluded = set()
+    for word in exclude:
+        excluded.add(str(word))
+    space = max_distinct_words(generator, syllable_length)
+    words = []
+    emitted = set()
+    streak = 0
+    for word in generator.iter_words(syllable_length, separator=separator):
+        if len(words) >= n:
+            break
+        if streak >= patience:
+            stats.exhausted = True
+            break
+        stats.attempts += 1
+        key = word.replace(separator, '') if separator else word
+        if key in emitted:
+            stats.duplicates += 1
+            streak += 1
+        elif key in excluded:
+            stats.excluded += 1
+            streak += 1
+        else:
+            emitted.add(key)
+            words.append(word)
+            stats.accepted += 1
+            streak = 0
+            if len(emitted) >= space and len(words) < n:
+                stats.exhausted = True
+                break
+    return words, stats
+
+
+__all__ = ["BLOOM_THRESHOLD", "BloomFilter", "GenerationStats", "max_distinct_words", "generate_unique"]
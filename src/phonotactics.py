@@ -0,0 +1,265 @@
+# phonotactics.py
+
+from collections import deque
+from itertools import product
+
+from phoneme_word import PhonemeAlphabet, PhonemeWord
+
+# Generators give up after this many words in a row break the rules, which
+# happens when the rules reject every word the template can make
+MAX_REJECTED_IN_ROW = 10000
+
+
+class PhonotacticRule:
+    def __init__(self, name: str, patterns):
+        """
+        Initialize a rule forbidding one or more phoneme sequences.
+
+        Patterns are matched anywhere in a word, including across syllable
+        boundaries.
+
+        :param name: str: The name the rule's rejections are reported under.
+        :param patterns: Iterable[Sequence[str]]: The forbidden sequences of
+            phoneme unicode strings.
+        :raises ValueError: If a pattern is empty.
+        """
+        self.name = name
+        self.patterns = tuple(tuple(pattern) for pattern in patterns)
+        if any(len(pattern) == 0 for pattern in self.patterns):
+            raise ValueError("A forbidden sequence must have at least one phoneme.")
+
+    @staticmethod
+    def sequence(name: str, *positions) -> "PhonotacticRule":
+        """Create a rule forbidding every sequence of one phoneme per position.
+
+        Arguments:
+            name: str: The name of the rule.
+            *positions: str | Iterable[str]: A phoneme, or a class of phonemes, for
+                each position of the sequence.
+
+        Returns:
+            PhonotacticRule: The rule.
+        """
+        return PhonotacticRule(name, product(*((p,) if isinstance(p, str) else tuple(p) for p in positions)))
+
+    @staticmethod
+    def geminates(name: str, symbols) -> "PhonotacticRule":
+        """Create a rule forbidding any of the phonemes twice in a row.
+
+        Arguments:
+            name: str: The name of the rule.
+            symbols: Iterable[str]: The phonemes that may not be doubled.
+
+        Returns:
+            PhonotacticRule: The rule.
+        """
+        return PhonotacticRule(name, ((symbol, symbol) for symbol in symbols))
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+{self.name} - patterns: {len(self.patterns)}>"
+
+
+class PhonotacticFilter:
+    def __init__(self, rules, alphabet: PhonemeAlphabet | None = None):
+        """
+        Initialize a filter that compiles rules into a single automaton.
+
+        The forbidden sequences of every rule are compiled once into an
+        Aho-Corasick automaton over phoneme ids, so checking a word takes one
+        table lookup per phoneme whatever the number of rules. A rejected word
+        is counted against the first rule that matches while scanning it.
+
+        :param rules: Iterable[PhonotacticRule]: The rules to enforce.
+        :param alphabet: PhonemeAlphabet | None: The alphabet of the words that
+            will be checked; an alphabet of the phonemes of the rules if None. The
+            alphabet is not changed: patterns with phonemes it does not have can
+            never match, so they are left out until it has them.
+        """
+        self.rules = list(rules)
+        if alphabet is None:
+            alphabet = PhonemeAlphabet(symbol for rule in self.rules for pattern in rule.patterns
+                                       for symbol in pattern)
+        self.alphabet = alphabet
+        self.checked = 0
+        self._rejections = [0] * len(self.rules)
+        self._compile()
+
+    def _compile(self):
+        # Build the trie of every pattern the alphabet can spell
+        ids = self.alphabet.ids
+        children = [{}]
+        output = [-1]
+        self._missing = False
+        for index, rule in enumerate(self.rules):
+            for pattern in rule.patterns:
+                if any(symbol not in ids for symbol in pattern):
+                    self._missing = True
+                    continue
+                state = 0
+                for symbol in pattern:
+                    phoneme_id = ids[symbol]
+                    if phoneme_id not in children[state]:
+                        children[state][phoneme_id] = len(children)
+                        children.append({})
+                        output.append(-1)
+                    state = children[state][phoneme_id]
+                if output[state] == -1 or index < output[state]:
+                    output[state] = index
+        # Follow failure links breadth first to fill in every transition
+        self._width = len(self.alphabet)
+        delta = [[0] * self._width for _ in children]
+        fail = [0] * len(children)
+        queue = deque()
+        for phoneme_id, child in children[0].items():
+            delta[0][phoneme_id] = child
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            # a state matches every rule its longest proper suffix matches
+            inherited = output[fail[state]]
+            if inherited != -1 and (output[state] == -1 or inherited < output[state]):
+                output[state] = inherited
+            for phoneme_id in range(self._width):
+                child = children[state].get(phoneme_id)
+                if child is None:
+                    delta[state][phoneme_id] = delta[fail[state]][phoneme_id]
+                else:
+                    fail[child] = delta[fail[state]][phoneme_id]
+                    delta[state][phoneme_id] = child
+                    queue.append(child)
+        self._delta = delta
+        self._output = output
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @property
+    def states(self) -> int:
+        """The number of states of the compiled automaton."""
+        return len(self._delta)
+
+    def match(self, ids) -> PhonotacticRule | None:
+        """Find the first rule a sequence of phoneme ids breaks.
+
+        Arguments:
+            ids: Iterable[int]: The phoneme ids of the word.
+
+        Returns:
+            PhonotacticRule | None: The rule, or None if the word is allowed.
+        """
+        index = self._match(ids)
+        return None if index == -1 else self.rules[index]
+
+    def _match(self, ids) -> int:
+        if self._missing and len(self.alphabet) != self._width:
+            # the alphabet has grown, maybe with phonemes of patterns that were left out
+            self._compile()
+        delta = self._delta
+        output = self._output
+        width = self._width
+        state = 0
+        for phoneme_id in ids:
+            # phonemes added to the alphabet after compiling are in no pattern
+            state = delta[state][phoneme_id] if phoneme_id < width else 0
+            if output[state] != -1:
+                return output[state]
+        return -1
+
+    def check(self, word, separator: str = '') -> bool:
+        """Check a word against the rules, counting the rule that rejects it.
+
+        Arguments:
+            word: str | PhonemeWord | Iterable[int]: The word as a unicode string,
+                a PhonemeWord of the filter's alphabet, or phoneme ids.
+            separator: str: The syllable separator in a unicode string.
+
+        Returns:
+            bool: True if the word is allowed.
+        """
+        if isinstance(word, str):
+            ids = self.alphabet.tokenize(word.replace(separator, '') if separator else word)
+        elif isinstance(word, PhonemeWord):
+            ids = self.alphabet.encode(word).ids
+        else:
+            ids = word
+        self.checked += 1
+        index = self._match(ids)
+        if index == -1:
+            return True
+        self._rejections[index] += 1
+        return False
+
+    def filter(self, words, separator: str = '', max_rejected: int | None = None):
+        """Lazily yield the words that are allowed by the rules.
+
+        Arguments:
+            words: Iterable[str | PhonemeWord]: The words to check.
+            separator: str: The syllable separator in unicode strings.
+            max_rejected: int | None: The number of words in a row that may be rejected;
+                there is no limit if None.
+
+        Yields:
+            word: str | PhonemeWord: The next allowed word.
+
+        Raises:
+            ValueError: If more than ``max_rejected`` words in a row are rejected.
+        """
+        check = self.check
+        rejected = 0
+        for word in words:
+            if check(word, separator):
+                rejected = 0
+                yield word
+                continue
+            rejected += 1
+            if max_rejected is not None and rejected > max_rejected:
+                raise self.rejection_error(rejected)
+
+    def rejection_error(self, rejected: int) -> ValueError:
+        """Describe a run of rejected words, for generators that give up on the rules.
+
+        Arguments:
+            rejected: int: The number of words in a row that were rejected.
+
+        Returns:
+            ValueError: The error, naming the rules that rejected words.
+        """
+        names = ", ".join(name for name, count in self.rejections.items() if count)
+        return ValueError(f"{rejected} words in a row broke the phonotactic rules ({names}); "
+                          f"the rules may forbid every word the template can make.")
+
+    @property
+    def rejections(self) -> dict[str, int]:
+        """The number of words rejected by each rule, by rule name."""
+        counts = {}
+        for rule, count in zip(self.rules, self._rejections):
+            counts[rule.name] = counts.get(rule.name, 0) + count
+        return counts
+
+    @property
+    def rejection_counts(self) -> list[int]:
+        """The number of words rejected by each rule, in rule order, as taken by ``add_counts``."""
+        return list(self._rejections)
+
+    @property
+    def rejected(self) -> int:
+        return sum(self._rejections)
+
+    def add_counts(self, checked: int, rejections: list[int]):
+        """Add the counters of another filter over the same rules, such as one in a worker process.
+
+        Arguments:
+            checked: int: The number of words the other filter checked.
+            rejections: list[int]: The number of words rejected by each rule, in rule order.
+        """
+        self.checked += checked
+        self._rejections = [count + other for count, other in zip(self._rejections, rejections)]
+
+    def reset(self):
+        """Clear the counters of checked and rejected words."""
+        self.checked = 0
+        self._rejections = [0] * len(self.rules)
+
+
+__all__ = ["MAX_REJECTED_IN_ROW", "PhonotacticRule", "PhonotacticFilter"]
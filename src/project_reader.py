@@ -0,0 +1,356 @@
+# project_reader.py
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from collections.abc import Sequence
+
+from instrumentation import count, traced
+from lexicon_blocks import BlockLexicon
+import project_sections
+
+# The offset index is a cache file in the user cache directory
+INDEX_DIRECTORY = "indexes"
+INDEX_MAGIC = b"WWIX"
+INDEX_VERSION = 1
+# Magic, version and padding, then the size and modification time of the
+# project, the number of words and the offset of the end of the lexicon
+INDEX_HEADER = struct.Struct("<4sB3xQQQQ")
+
+
+def index_path(file) -> str:
+    """Get the path of the offset index of a project in the user cache directory.
+
+    Arguments:
+        file: str | Path: The path of the project file.
+
+    Returns:
+        str: The path of the index, named after a hash of the absolute project path.
+    """
+    from platformdirs import user_cache_path
+    key = hashlib.sha1(os.path.abspath(file).encode("utf-8")).hexdigest()
+    return os.path.join(user_cache_path("Wordweaver", False), INDEX_DIRECTORY, key + ".idx")
+
+
+class LexiconView(Sequence):
+    """The words of a memory-mapped lexicon, decoded when they are read."""
+
+    def __init__(self, reader: "ProjectReader"):
+        self._reader = reader
+
+    def __len__(self) -> int:
+        return self._reader.lexicon_length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._reader.word(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("lexicon index out of range")
+        return self._reader.word(index)
+
+    def __iter__(self):
+        return self._reader.iter_words()
+
+    def index(self, word: str) -> int:
+        """Find the position of a word, with a binary search if the lexicon is in blocks.
+
+        Arguments:
+            word: str: The word.
+
+        Returns:
+            int: The position of the word.
+
+        Raises:
+            ValueError: If the word is not in the lexicon.
+        """
+        if self._reader.blocks is not None:
+            return self._reader.blocks.index(word)
+        return super().index(word)
+
+
+class ProjectReader:
+    @traced()
+    def __init__(self, file, index_file=None):
+        """
+        Initialize a reader that memory-maps a project file.
+
+        Only the header is decoded when the file is opened. Words are decoded
+        when they are read, through an index of the offset of every word.
+        The index is loaded from ``index_file`` if it matches the project,
+        and is otherwise built with one pass over the lexicon and written
+        there for next time; nothing is written next to the project. Reading
+        only touches the pages of the words read, so opening a project with
+        millions of words takes milliseconds once its index exists. A lexicon
+        saved in compressed blocks needs no offset index: its block index is
+        read with the header, as ``blocks``, and reading a word only
+        decompresses its block. Such a lexicon is read in sorted order;
+        ``to_project`` puts it back in the order it was saved in.
+
+        Every section of a version 2 file is checked against its checksum
+        when it is decoded. The lexicon is checked when it is read in full,
+        which includes building the offset index.
+
+        :param file: str | Path: The path of the project file.
+        :param index_file: str | Path | None: The path of the offset index; a file in the
+            user cache directory from ``index_path`` if None.
+        :raises FileNotFoundError: If the file does not exist.
+        :raises ValueError: If the file is not a project file of a supported version,
+            or a section does not match its checksum.
+        """
+        self.file = file
+        self._index_file = index_file
+        with open(file, 'rb') as f_in:
+            stat = os.fstat(f_in.fileno())
+            self._stat = (stat.st_size, stat.st_mtime_ns)
+            self._map = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        self._offsets = None
+        self._index_map = None
+        self._end = None
+        self._sections = {}
+        self._verified = set()
+        self.blocks = None
+        try:
+            self._read_header()
+        except ValueError:
+            self.close()
+            raise
+        self.lexicon = LexiconView(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.lexicon_length
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+{self.name} - words: {self.lexicon_length}>"
+
+    def close(self):
+        """Unmap the project and its index; words can no longer be read."""
+        # views of a map must be released before it can be closed
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._offsets = None
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    @property
+    def index_file(self) -> str:
+        """The path of the offset index, only looked up when the index is needed."""
+        if self._index_file is None:
+            self._index_file = index_path(self.file)
+        return self._index_file
+
+    def _read_header(self):
+        data = self._map
+        if len(data) < 5 or int.from_bytes(data[0:4], 'big') != 0x87AFFA87:
+            raise ValueError(f"Not a Wordweaver project: {self.file}")
+        self.version = data[4]
+        if self.version == 0x02:
+            self._read_directory()
+            return
+        if self.version != 0x01:
+            raise ValueError(f"Unsupported project version {self.version}: {self.file}")
+        # Version 1 words have a 1 byte length
+        self._length_size = 1
+        name_length = int.from_bytes(data[5:7], 'big')
+        self.name = data[7:7 + name_length].decode()
+        position = 7 + name_length
+        self.pulmonic_inventory, position = self._read_strings(position)
+        self.non_pulmonic_inventory, position = self._read_strings(position)
+        self.vowel_inventory, position = self._read_strings(position)
+        self.lexicon_length = int.from_bytes(data[position:position + 3], 'big')
+        self.lexicon_offset = position + 3
+
+    def _read_directory(self):
+        data = self._map
+        if len(data) < project_sections.HEADER.size:
+            raise ValueError(f"Not a Wordweaver project: {self.file}")
+        section_count = project_sections.HEADER.unpack_from(data)[2]
+        entry = project_sections.DIRECTORY_ENTRY
+        if len(data) < project_sections.HEADER.size + entry.size * section_count:
+            raise ValueError(f"The section directory of {self.file} is truncated.")
+        for i in range(section_count):
+            tag, offset, length, checksum = entry.unpack_from(data, project_sections.HEADER.size + i * entry.size)
+            if offset + length > len(data):
+                raise ValueError(f"Section {tag.decode()} of {self.file} is truncated.")
+            self._sections[tag] = (offset, length, checksum)
+        self.name = self._decode_section(project_sections.SECTION_NAME, "")
+        self.pulmonic_inventory, self.non_pulmonic_inventory, self.vowel_inventory = \
+            self._decode_section(project_sections.SECTION_INVENTORIES, [[], [], []])
+        if project_sections.SECTION_LEXICON_BLOCKS in self._sections:
+            # Blocks have their own index, so words are read through it
+            offset, length, _ = self._sections[project_sections.SECTION_LEXICON_BLOCKS]
+            self.blocks = BlockLexicon(self._map, offset, length)
+            self.lexicon_length = len(self.blocks)
+            return
+        # The lexicon is the one section that is not decoded up front, or checked
+        offset, length, _ = self._sections.get(project_sections.SECTION_LEXICON, (0, 0, 0))
+        self.lexicon_length = int.from_bytes(data[offset:offset + 4], 'big') if length else 0
+        self.lexicon_offset = offset + 4
+        self._length_size = 2
+
+    def _decode_section(self, tag: bytes, default):
+        if tag not in self._sections:
+            return default
+        self._verify(tag)
+        offset, length, _ = self._sections[tag]
+        return project_sections.DECODERS[tag](self._map[offset:offset + length])
+
+    def _verify(self, tag: bytes):
+        # Check a section against its checksum once; version 1 files have none
+        if tag not in self._sections or tag in self._verified:
+            return
+        offset, length, checksum = self._sections[tag]
+        with memoryview(self._map)[offset:offset + length] as view:
+            if zlib.crc32(view) != checksum:
+                raise ValueError(f"Section {tag.decode()} of {self.file} is corrupt.")
+        self._verified.add(tag)
+
+    def _verify_lexicon(self):
+        self._verify(project_sections.SECTION_LEXICON)
+        self._verify(project_sections.SECTION_LEXICON_BLOCKS)
+
+    def _read_strings(self, position: int) -> tuple[list[str], int]:
+        data = self._map
+        strings = []
+        for _ in range(data[position]):
+            length = data[position + 1]
+            strings.append(data[position + 2:position + 2 + length].decode())
+            position += 1 + length
+        return strings, position + 1
+
+    @property
+    def offsets(self) -> Sequence:
+        """The offset of every word in the file, loaded or built on first use."""
+        if self._offsets is None and not self._load_index():
+            self._build_index()
+        return self._offsets
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_file, 'rb') as f_in:
+                index_map = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(index_map) >= INDEX_HEADER.size:
+            magic, version, size, mtime, length, end = INDEX_HEADER.unpack_from(index_map)
+            if (magic, version, (size, mtime), length) == (INDEX_MAGIC, INDEX_VERSION, self._stat,
+                                                           self.lexicon_length) \
+                    and len(index_map) == INDEX_HEADER.size + 8 * length:
+                self._index_map = index_map
+                self._offsets = memoryview(index_map)[INDEX_HEADER.size:].cast('Q')
+                self._end = end
+                return True
+        index_map.close()
+        return False
+
+    @traced("ProjectReader.build_index")
+    def _build_index(self):
+        self._verify_lexicon()
+        data = self._map
+        offsets = array('Q', bytes(8 * self.lexicon_length))
+        position = self.lexicon_offset
+        size = self._length_size
+        for i in range(self.lexicon_length):
+            offsets[i] = position
+            position += size + int.from_bytes(data[position:position + size], 'big')
+        count("lexicon words indexed", self.lexicon_length)
+        self._offsets = offsets
+        self._end = position
+        # The index is only a cache, so a project still opens if it cannot be written
+        temporary = str(self.index_file) + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.index_file)), exist_ok=True)
+            with open(temporary, 'wb') as f_out:
+                f_out.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, *self._stat, self.lexicon_length, position))
+                f_out.write(offsets.tobytes())
+            os.replace(temporary, self.index_file)
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    def word(self, index: int) -> str:
+        """Decode one word of the lexicon.
+
+        Arguments:
+            index: int: The position of the word in the lexicon.
+
+        Returns:
+            str: The word.
+        """
+        if self.blocks is not None:
+            return self.blocks[index]
+        offset = self.offsets[index]
+        data = self._map
+        size = self._length_size
+        return data[offset + size:offset + size + int.from_bytes(data[offset:offset + size], 'big')].decode()
+
+    def iter_words(self):
+        """Decode the words of the lexicon in order, without the offset index.
+
+        Yields:
+            word: str: The word.
+
+        Raises:
+            ValueError: If the lexicon does not match its checksum.
+        """
+        self._verify_lexicon()
+        if self.blocks is not None:
+            yield from self.blocks
+            return
+        data = self._map
+        size = self._length_size
+        position = self.lexicon_offset
+        for _ in range(self.lexicon_length):
+            length = int.from_bytes(data[position:position + size], 'big')
+            yield data[position + size:position + size + length].decode()
+            position += size + length
+
+    @property
+    def phoneme_weights(self) -> dict[str, float]:
+        """The phoneme weights in the generator settings; version 1 files have none."""
+        if self.version == 0x02:
+            return self._decode_section(project_sections.SECTION_GENERATOR, {}).get("phoneme_weights", {})
+        return {}
+
+    def to_project(self):
+        """Decode the whole file into a project, like ``WordweaverProject.from_file``.
+
+        Returns:
+            WordweaverProject: The project.
+        """
+        from wordweaver_project import WordweaverProject
+        words = self.iter_words()
+        order = self._decode_section(project_sections.SECTION_LEXICON_ORDER, None)
+        if order is not None:
+            sorted_words = list(words)
+            words = (sorted_words[position] for position in order)
+        glosses = self._decode_section(project_sections.SECTION_GLOSSES, []) if self.version == 0x02 else []
+        if glosses:
+            lexicon = dict(zip(words, glosses))
+        else:
+            lexicon = dict.fromkeys(words, "")
+        return WordweaverProject(self.name, self.file, self.pulmonic_inventory, self.non_pulmonic_inventory,
+                                 self.vowel_inventory, lexicon, self.phoneme_weights)
+
+
+__all__ = [
+    "index_path",
+    "LexiconView",
+    "ProjectReader",
+]
@@ -0,0 +1,295 @@
+# project_sections.py
+
+import json
+import struct
+import zlib
+
+from lexicon_blocks import decode_blocks
+
+MAGIC_NUMBER = 0x87AFFA87
+VERSION = 0x02
+
+# Section tags, in the order they are written
+SECTION_NAME = b"NAME"
+SECTION_INVENTORIES = b"INVT"
+SECTION_LEXICON = b"LEXI"
+# The lexicon sorted into front-coded, compressed blocks; see ``lexicon_blocks``
+SECTION_LEXICON_BLOCKS = b"LEXB"
+# The position in the blocks of each word, in lexicon order, if the lexicon was not sorted
+SECTION_LEXICON_ORDER = b"ORDR"
+SECTION_GLOSSES = b"GLOS"
+SECTION_GENERATOR = b"GENR"
+SECTIONS = {
+    "name": SECTION_NAME,
+    "inventories": SECTION_INVENTORIES,
+    "lexicon": SECTION_LEXICON,
+    "glosses": SECTION_GLOSSES,
+    "generator": SECTION_GENERATOR,
+}
+
+# Magic number, version and number of sections
+HEADER = struct.Struct(">IBH")
+# Tag, offset from the start of the file, length and CRC-32 of a section
+DIRECTORY_ENTRY = struct.Struct(">4sQQI")
+
+
+class SectionFile:
+    def __init__(self, file):
+        """
+        Initialize a reader of the sections of a version 2 project file.
+
+        .. code-block::
+
+            File format is as follows:
+            Magic number:         4 bytes     0x87AFFA87
+            Version:              1 byte      0x02
+            Section count:        2 bytes     len(sections)
+            Section directory:
+                Tag:              4 bytes     such as b"LEXI"
+                Offset:           8 bytes     from the start of the file
+                Length:           8 bytes     len(section)
+                Checksum:         4 bytes     CRC-32 of the section
+            Sections:             n bytes     in directory order
+
+        Only the header and the directory are read when the file is opened;
+        each section is read and checked on its own, so a reader that only
+        needs the name never reads the lexicon.
+
+        :param file: str | Path: The path of the project file.
+        :raises FileNotFoundError: If the file does not exist.
+        :raises ValueError: If the file is not a version 2 project file.
+        """
+        self.file = file
+        self._f_in = open(file, 'rb')
+        try:
+            header = self._f_in.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"Not a Wordweaver project: {file}")
+            magic_number, self.version, count = HEADER.unpack(header)
+            if magic_number != MAGIC_NUMBER:
+                raise ValueError(f"Not a Wordweaver project: {file}")
+            if self.version != VERSION:
+                raise ValueError(f"Not a version {VERSION} project: {file}")
+            directory = self._f_in.read(DIRECTORY_ENTRY.size * count)
+            if len(directory) < DIRECTORY_ENTRY.size * count:
+                raise ValueError(f"The section directory of {file} is truncated.")
+            self.directory = {}
+            for i in range(count):
+                tag, offset, length, checksum = DIRECTORY_ENTRY.unpack_from(directory, i * DIRECTORY_ENTRY.size)
+                self.directory[tag] = (offset, length, checksum)
+        except ValueError:
+            self._f_in.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, tag: bytes) -> bool:
+        return tag in self.directory
+
+    def close(self):
+        self._f_in.close()
+
+    def read(self, tag: bytes, verify: bool = True) -> bytes | None:
+        """Read one section.
+
+        Arguments:
+            tag: bytes: The tag of the section, such as ``SECTION_LEXICON``.
+            verify: bool: Whether to check the section against its checksum.
+
+        Returns:
+            bytes | None: The section, or None if the file does not have it.
+
+        Raises:
+            ValueError: If the section is truncated or does not match its checksum.
+        """
+        if tag not in self.directory:
+            return None
+        offset, length, checksum = self.directory[tag]
+        self._f_in.seek(offset)
+        data = self._f_in.read(length)
+        if len(data) != length or (verify and zlib.crc32(data) != checksum):
+            raise ValueError(f"Section {tag.decode()} of {self.file} is corrupt.")
+        return data
+
+
+def write_sections(f_out, sections: list[tuple[bytes, bytes]]):
+    """Write a version 2 project file; see ``SectionFile`` for the layout.
+
+    Arguments:
+        f_out: BinaryIO: The file to write to.
+        sections: list[tuple[bytes, bytes]]: The tag and content of each section.
+    """
+    f_out.write(HEADER.pack(MAGIC_NUMBER, VERSION, len(sections)))
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(sections)
+    for tag, data in sections:
+        f_out.write(DIRECTORY_ENTRY.pack(tag, offset, len(data), zlib.crc32(data)))
+        offset += len(data)
+    for _, data in sections:
+        f_out.write(data)
+
+
+def encode_name(name: str) -> bytes:
+    return name.encode()
+
+
+def decode_name(data: bytes) -> str:
+    return data.decode()
+
+
+def encode_inventories(inventories: list[list[str]]) -> bytes:
+    """Encode inventories as a 2 byte count of phonemes each, with a 1 byte length before every phoneme.
+
+    Arguments:
+        inventories: list[list[str]]: The unicode representation of the phonemes of each inventory.
+
+    Returns:
+        bytes: The section.
+    """
+    parts = []
+    for inventory in inventories:
+        parts.append(len(inventory).to_bytes(2, 'big'))
+        for symbol in inventory:
+            symbol_bytes = symbol.encode()
+            parts.append(len(symbol_bytes).to_bytes(1, 'big'))
+            parts.append(symbol_bytes)
+    return b"".join(parts)
+
+
+def decode_inventories(data: bytes) -> list[list[str]]:
+    inventories = []
+    position = 0
+    while position < len(data):
+        inventory = []
+        for _ in range(int.from_bytes(data[position:position + 2], 'big')):
+            length = data[position + 2]
+            inventory.append(data[position + 3:position + 3 + length].decode())
+            position += 1 + length
+        inventories.append(inventory)
+        position += 2
+    return inventories
+
+
+def _encode_strings(strings: list[str], length_bytes: int) -> bytes:
+    parts = [len(strings).to_bytes(4, 'big')]
+    for string in strings:
+        string_bytes = string.encode()
+        parts.append(len(string_bytes).to_bytes(length_bytes, 'big'))
+        parts.append(string_bytes)
+    return b"".join(parts)
+
+
+def _decode_strings(data: bytes, length_bytes: int) -> list[str]:
+    strings = []
+    position = 4
+    for _ in range(int.from_bytes(data[:4], 'big')):
+        length = int.from_bytes(data[position:position + length_bytes], 'big')
+        position += length_bytes
+        strings.append(data[position:position + length].decode())
+        position += length
+    return strings
+
+
+def encode_lexicon(words: list[str]) -> bytes:
+    """Encode words as a 4 byte count, with a 2 byte length before every word.
+
+    Arguments:
+        words: list[str]: The words.
+
+    Returns:
+        bytes: The section.
+    """
+    return _encode_strings(words, 2)
+
+
+def decode_lexicon(data: bytes) -> list[str]:
+    return _decode_strings(data, 2)
+
+
+def encode_order(positions: list[int]) -> bytes:
+    """Encode the position in the sorted lexicon blocks of each word, in lexicon order, as a 4 byte count
+    with 4 bytes for every position.
+
+    Arguments:
+        positions: list[int]: The positions.
+
+    Returns:
+        bytes: The section.
+    """
+    return struct.pack(f">I{len(positions)}I", len(positions), *positions)
+
+
+def decode_order(data: bytes) -> list[int]:
+    return list(struct.unpack_from(f">{int.from_bytes(data[:4], 'big')}I", data, 4))
+
+
+def encode_glosses(glosses: list[str]) -> bytes:
+    """Encode the gloss of each word, in lexicon order, as a 4 byte count with a 4 byte length before every gloss.
+
+    Arguments:
+        glosses: list[str]: The glosses.
+
+    Returns:
+        bytes: The section.
+    """
+    return _encode_strings(glosses, 4)
+
+
+def decode_glosses(data: bytes) -> list[str]:
+    return _decode_strings(data, 4)
+
+
+def encode_generator(settings: dict) -> bytes:
+    """Encode generator settings, such as ``phoneme_weights``, as JSON so settings can be added later.
+
+    Arguments:
+        settings: dict: The settings.
+
+    Returns:
+        bytes: The section.
+    """
+    return json.dumps(settings, ensure_ascii=False).encode()
+
+
+def decode_generator(data: bytes) -> dict:
+    return json.loads(data.decode())
+
+
+DECODERS = {
+    SECTION_NAME: decode_name,
+    SECTION_INVENTORIES: decode_inventories,
+    SECTION_LEXICON: decode_lexicon,
+    SECTION_LEXICON_BLOCKS: decode_blocks,
+    SECTION_LEXICON_ORDER: decode_order,
+    SECTION_GLOSSES: decode_glosses,
+    SECTION_GENERATOR: decode_generator,
+}
+
+
+__all__ = [
+    "SECTION_NAME",
+    "SECTION_INVENTORIES",
+    "SECTION_LEXICON",
+    "SECTION_LEXICON_BLOCKS",
+    "SECTION_LEXICON_ORDER",
+    "SECTION_GLOSSES",
+    "SECTION_GENERATOR",
+    "SECTIONS",
+    "SectionFile",
+    "write_sections",
+    "encode_name",
+    "decode_name",
+    "encode_inventories",
+    "decode_inventories",
+    "encode_lexicon",
+    "decode_lexicon",
+    "encode_order",
+    "decode_order",
+    "encode_glosses",
+    "decode_glosses",
+    "encode_generator",
+    "decode_generator",
+]
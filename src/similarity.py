@@ -0,0 +1,295 @@
+# similarity.py
+
+import heapq
+
+from phoneme_word import PhonemeAlphabet
+
+# Distances are rounded so that the same distance reached by different sums
+# of substitution costs lands on the same child of a node
+PRECISION = 9
+
+
+class PhonemeDistance:
+    def __init__(self, alphabet: PhonemeAlphabet | None = None, features=None):
+        """
+        Initialize a feature-weighted edit distance between words.
+
+        Inserting or deleting a phoneme costs 1, and substituting one phoneme
+        for another costs the Jaccard distance of their feature values, so
+        ``p`` for ``b`` costs less than ``p`` for ``a``. Phonemes without
+        features cost 1 to substitute. The distance is a metric, which is what
+        a ``SimilarityIndex`` needs to prune its search.
+
+        :param alphabet: PhonemeAlphabet | None: The phonemes words are split into; words
+            may add new phonemes to it.
+        :param features: dict[str, Iterable[str]] | None: The feature values of each phoneme,
+            such as the ipapy descriptors from ``NaturalClassIndex.features``.
+        """
+        self.alphabet = alphabet if alphabet is not None else PhonemeAlphabet()
+        self.features = {symbol: frozenset(values) for symbol, values in (features or {}).items()}
+        # The substitution costs of each pair of phoneme ids, grown with the alphabet
+        self._costs = []
+
+    @staticmethod
+    def from_project(project) -> "PhonemeDistance":
+        """Create a distance over the phonemes and natural classes of a project.
+
+        Arguments:
+            project: WordweaverProject: The project.
+
+        Returns:
+            PhonemeDistance: The distance.
+        """
+        classes = project.natural_classes
+        features = {symbol: classes.features(symbol) for symbol in classes.bits}
+        return PhonemeDistance(PhonemeAlphabet(project.alphabet.symbols), features)
+
+    def substitution(self, a: str, b: str) -> float:
+        """Get the cost of substituting one phoneme for another.
+
+        Arguments:
+            a: str: The unicode representation of the first phoneme.
+            b: str: The unicode representation of the second phoneme.
+
+        Returns:
+            float: The cost, from 0 for the same phoneme to 1.
+        """
+        if a == b:
+            return 0.0
+        features_a = self.features.get(a)
+        features_b = self.features.get(b)
+        if not features_a or not features_b:
+            return 1.0
+        return round(1 - len(features_a & features_b) / len(features_a | features_b), PRECISION)
+
+    def _cost_table(self) -> list[list[float]]:
+        costs = self._costs
+        symbols = self.alphabet.symbols
+        if len(costs) < len(symbols):
+            # extend every row for the phonemes added since the last word
+            for i, row in enumerate(costs):
+                row.extend(self.substitution(symbols[i], b) for b in symbols[len(row):])
+            for a in symbols[len(costs):]:
+                costs.append([self.substitution(a, b) for b in symbols])
+        return costs
+
+    def encode(self, word: str) -> tuple[int, ...]:
+        """Split a word into phoneme ids.
+
+        Arguments:
+            word: str: The word as a unicode string.
+
+        Returns:
+            tuple[int, ...]: The phoneme ids.
+        """
+        return tuple(self.alphabet.tokenize(word))
+
+    def between(self, a: tuple[int, ...], b: tuple[int, ...]) -> float:
+        """Get the distance between two encoded words.
+
+        Arguments:
+            a: tuple[int, ...]: The phoneme ids of the first word.
+            b: tuple[int, ...]: The phoneme ids of the second word.
+
+        Returns:
+            float: The smallest total cost of edits turning one word into the other.
+        """
+        if len(a) < len(b):
+            a, b = b, a
+        if not b:
+            return float(len(a))
+        costs = self._cost_table()
+        previous = list(map(float, range(len(b) + 1)))
+        for i, x in enumerate(a, 1):
+            row = costs[x]
+            current = [float(i)]
+            for j, y in enumerate(b, 1):
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + row[y]))
+            previous = current
+        return round(previous[-1], PRECISION)
+
+    def __call__(self, a: str, b: str) -> float:
+        return self.between(self.encode(a), self.encode(b))
+
+
+class SimilarityIndex:
+    def __init__(self, distance: PhonemeDistance | None = None, words=()):
+        """
+        Initialize a BK-tree of words for similarity searches.
+
+        Each node keeps its children by their distance to it. By the triangle
+        inequality, a search for words within ``k`` of a query at distance
+        ``d`` from a node only needs the children whose distance to the node
+        is within ``k`` of ``d``, so most of the lexicon is never compared.
+
+        :param distance: PhonemeDistance | None: The distance between words; plain
+            edit distance over phonemes if None.
+        :param words: Iterable[str]: The words to add.
+        """
+        self.distance = distance if distance is not None else PhonemeDistance()
+        self.words = []
+        self._ids = []
+        self._children = []
+        self._index = {}
+        self.update(words)
+
+    @staticmethod
+    def from_project(project) -> "SimilarityIndex":
+        """Create an index of the lexicon of a project with ``PhonemeDistance.from_project``.
+
+        Words of the lexicon stored as PhonemeWords are indexed as unicode strings.
+
+        Arguments:
+            project: WordweaverProject: The project.
+
+        Returns:
+            SimilarityIndex: The index.
+        """
+        return SimilarityIndex(PhonemeDistance.from_project(project), (str(word) for word in project.lexicon))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._index
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} words: {len(self.words)}>"
+
+    def add(self, word: str) -> bool:
+        """Add a word to the index.
+
+        Arguments:
+            word: str: The word as a unicode string.
+
+        Returns:
+            bool: False if the word was already in the index.
+        """
+        if word in self._index:
+            return False
+        ids = self.distance.encode(word)
+        node = len(self.words)
+        self._index[word] = node
+        self.words.append(word)
+        self._ids.append(ids)
+        self._children.append({})
+        if node == 0:
+            return True
+        between = self.distance.between
+        parent = 0
+        while True:
+            d = between(ids, self._ids[parent])
+            child = self._children[parent].get(d)
+            if child is None:
+                self._children[parent][d] = node
+                return True
+            parent = child
+
+    def update(self, words):
+        """Add every word of an iterable, such as the new entries of a lexicon.
+
+        Arguments:
+            words: Iterable[str]: The words.
+        """
+        for word in words:
+            self.add(word)
+
+    def _within(self, ids: tuple[int, ...], k: float) -> list[tuple[float, str]]:
+        if not self.words:
+            return []
+        between = self.distance.between
+        words = self.words
+        stored = self._ids
+        children = self._children
+        limit = k + 10 ** -PRECISION
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            d = between(ids, stored[node])
+            if d <= limit:
+                found.append((d, words[node]))
+            for key, child in children[node].items():
+                if d - limit <= key <= d + limit:
+                    stack.append(child)
+        found.sort()
+        return found
+
+    def within(self, word: str, k: float) -> list[tuple[float, str]]:
+        """Find the words within a distance of a word.
+
+        Arguments:
+            word: str: The word as a unicode string.
+            k: float: The largest distance to include.
+
+        Returns:
+            list[tuple[float, str]]: The distances and words, nearest first.
+        """
+        return self._within(self.distance.encode(word), k)
+
+    def nearest(self, word: str, n: int = 1, exclude_self: bool = False) -> list[tuple[float, str]]:
+        """Find the words nearest to a word.
+
+        Arguments:
+            word: str: The word as a unicode string.
+            n: int: The number of words to find.
+            exclude_self: bool: Whether to leave the word itself out if it is in the index.
+
+        Returns:
+            list[tuple[float, str]]: The distances and words, nearest first.
+        """
+        if not self.words or n <= 0:
+            return []
+        ids = self.distance.encode(word)
+        between = self.distance.between
+        words = self.words
+        stored = self._ids
+        children = self._children
+        # a max-heap of the best words so far, as negated distances
+        best = []
+        # every word under a child is at the child's key from the parent, so
+        # the difference of the key and the parent's distance is a lower bound
+        stack = [(0.0, 0)]
+        while stack:
+            bound, node = stack.pop()
+            if len(best) == n and bound > -best[0][0]:
+                continue
+            d = between(ids, stored[node])
+            if not (exclude_self and words[node] == word):
+                if len(best) < n:
+                    heapq.heappush(best, (-d, words[node]))
+                elif d < -best[0][0]:
+                    heapq.heapreplace(best, (-d, words[node]))
+            # push the children with the lowest bound last, so they are searched first
+            stack.extend(sorted(((abs(key - d), child) for key, child in children[node].items()), reverse=True))
+        return sorted((-d, w) for d, w in best)
+
+    def screen(self, candidates, k: float, add: bool = False) -> dict[str, list[tuple[float, str]]]:
+        """Check candidate words, such as generated roots, against the index.
+
+        Arguments:
+            candidates: Iterable[str]: The candidate words.
+            k: float: The largest distance that counts as too similar.
+            add: bool: Whether to add each candidate with no word within ``k``, so
+                later candidates are also screened against it.
+
+        Returns:
+            dict[str, list[tuple[float, str]]]: The words within ``k`` of each candidate,
+            nearest first; an empty list means the candidate is far enough from every word.
+        """
+        results = {}
+        encode = self.distance.encode
+        for candidate in candidates:
+            if candidate in results:
+                continue
+            matches = self._within(encode(candidate), k)
+            results[candidate] = matches
+            if add and not matches:
+                self.add(candidate)
+        return results
+
+
+__all__ = [
+    "PhonemeDistance",
+    "SimilarityIndex",
+]
@@ -0,0 +1,326 @@
+# sound_change.py
+
+import re
+import warnings
+
+from phoneme_word import PhonemeAlphabet
+from phonology_const import CHART_NAMES
+from phonology_features import natural_classes, phoneme_features
+
+# Phoneme ids are written as private use characters so every phoneme is one
+# character and a whole lexicon can be rewritten with one regular expression
+PHONEME_CHAR_BASE = 0xE000
+
+CONSONANT_FEATURES = ("manner", "place", "voicing")
+VOWEL_FEATURES = ("height", "backness", "rounding")
+
+
+class SoundChange:
+    def __init__(self, rule: str, alphabet: PhonemeAlphabet | None = None,
+                 classes: dict[str, list[str]] | None = None):
+        """
+        Initialize a sound change from a rule such as ``p > f / V_V``.
+
+        A rule is ``target > replacement``, optionally followed by
+        ``/ environment`` with ``_`` marking the target and ``#`` the edge of
+        the word. Each side is a sequence of phonemes, class letters such as
+        ``C`` and ``V``, sets such as ``{p,t,k}`` and feature bundles such as
+        ``[voiceless plosive]``. ``∅`` or ``0`` is the empty sequence, for
+        deletion and insertion. A set or feature bundle in the replacement
+        maps each phoneme of the target at the same position, by order for
+        sets and by changing the given features for bundles; phonemes with no
+        such counterpart, such as ``ʔ`` for ``[voiced]``, are left unchanged
+        with a warning.
+
+        The rule is compiled to a single regular expression over phoneme
+        characters, with the environment as lookarounds, so every match is
+        found in the input and replaced at once.
+
+        :param rule: str: The rule.
+        :param alphabet: PhonemeAlphabet | None: The alphabet of the words the rule applies
+            to; phonemes of the rule are added to it.
+        :param classes: dict[str, list[str]] | None: Classes by letter, in addition to
+            ``C`` for consonants and ``V`` for vowels.
+        :raises ValueError: If the rule cannot be parsed.
+        """
+        self.rule = rule
+        self.alphabet = alphabet if alphabet is not None else PhonemeAlphabet()
+        natural = natural_classes()
+        self.classes = {"C": list(natural["consonant"]), "V": list(natural["vowel"])}
+        self.classes.update(classes or {})
+        change, _, environment = rule.partition('/')
+        if '>' not in change:
+            raise ValueError(f"A sound change must have the form 'target > replacement': {rule}")
+        target, replacement = (self._parse(side) for side in change.split('>', 1))
+        if environment.strip():
+            if environment.count('_') != 1:
+                raise ValueError(f"An environment must contain exactly one '_': {rule}")
+            before, after = (self._parse(side, True) for side in environment.split('_'))
+        else:
+            before, after = [], []
+        self.target = target
+        self.replacement = replacement
+        self.pattern = re.compile(self._lookbehind(before) + ''.join(self._regex(s) for s in target)
+                                  + self._lookahead(after), re.MULTILINE)
+        self._mapping = self._compile_replacement(target, replacement)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} {self.rule}>"
+
+    def _parse(self, text: str, environment: bool = False) -> list:
+        # Split one side of a rule into segments: a phoneme string, a list of
+        # phonemes for a class, a dict of features for a bundle, or '#'
+        segments = []
+        for token in self._tokens(text):
+            if token.startswith('['):
+                segments.append(self._bundle(token[1:-1]))
+            elif token.startswith('{'):
+                segments.append([symbol for symbol in re.split(r'[\s,]+', token[1:-1]) if symbol])
+            elif token in self.classes:
+                segments.append(list(self.classes[token]))
+            elif token == '#':
+                if not environment:
+                    raise ValueError(f"'#' can only be used in the environment: {self.rule}")
+                segments.append('#')
+            elif token in ('∅', '0'):
+                continue
+            else:
+                segments.append(token)
+        return segments
+
+    def _tokens(self, text: str):
+        # Phonemes are split by greedy longest match, so ``t͡ʃ`` is one phoneme
+        symbols = set(phoneme_features()) | set(self.alphabet.symbols) | set(self.classes)
+        longest = max(map(len, symbols))
+        for run in re.findall(r'\[[^\]]*\]|\{[^}]*\}|[^\s\[\]{}]+', text):
+            if run[0] in '[{':
+                yield run
+                continue
+            i = 0
+            while i < len(run):
+                j = next((j for j in range(min(len(run), i + longest), i + 1, -1) if run[i:j] in symbols), i + 1)
+                yield run[i:j]
+                i = j
+
+    def _bundle(self, text: str) -> dict[str, str]:
+        natural = natural_classes()
+        features = {}
+        for name in re.split(r'[\s,]+', text.strip()):
+            if not name:
+                continue
+            name = CHART_NAMES.get(name, name)
+            if name not in natural:
+                raise ValueError(f"Unknown feature {name} in {self.rule}")
+            category = next((c for c in CONSONANT_FEATURES + VOWEL_FEATURES
+                             if any(f.get(c) == name for f in phoneme_features().values())), name)
+            features[category] = name
+        return features
+
+    def _members(self, segment) -> list[str]:
+        if isinstance(segment, str):
+            return [segment]
+        if isinstance(segment, list):
+            return segment
+        members = None
+        for category, name in segment.items():
+            if category in ("consonant", "vowel"):
+                names = natural_classes()[category]
+            else:
+                names = natural_classes()[name]
+            members = list(names) if members is None else [m for m in members if m in names]
+        return members or []
+
+    def _char(self, symbol: str) -> str:
+        return chr(PHONEME_CHAR_BASE + self.alphabet.add(symbol))
+
+    def _regex(self, segment) -> str:
+        if segment == '#':
+            return ''
+        chars = ''.join(re.escape(self._char(symbol)) for symbol in self._members(segment))
+        if not chars:
+            raise ValueError(f"A class in {self.rule} has no phonemes.")
+        return f"[{chars}]" if len(chars) > 1 else chars
+
+    def _lookbehind(self, segments: list) -> str:
+        if not segments:
+            return ''
+        edge = '^' if segments[0] == '#' else ''
+        return f"(?<={edge}{''.join(self._regex(s) for s in segments)})"
+
+    def _lookahead(self, segments: list) -> str:
+        if not segments:
+            return ''
+        edge = '$' if segments[-1] == '#' else ''
+        return f"(?={''.join(self._regex(s) for s in segments)}{edge})"
+
+    def _compile_replacement(self, target: list, replacement: list) -> str | list[dict[str, str]]:
+        if all(isinstance(segment, str) for segment in replacement):
+            return ''.join(self._char(symbol) for symbol in replacement)
+        if len(target) != len(replacement):
+            raise ValueError(f"A replacement with classes must be as long as its target: {self.rule}")
+        features = phoneme_features()
+        mapping = []
+        for source, result in zip(target, replacement):
+            members = self._members(source)
+            if isinstance(result, str):
+                mapping.append({self._char(m): self._char(result) for m in members})
+            elif isinstance(result, list):
+                if len(result) != len(members):
+                    raise ValueError(f"Sets must have the same number of phonemes: {self.rule}")
+                mapping.append({self._char(m): self._char(r) for m, r in zip(members, result)})
+            else:
+                changed = {}
+                missing = []
+                for m in members:
+                    wanted = dict(features.get(m, {}), **result)
+                    match = next((p for p, f in features.items() if f == wanted), None)
+                    if match is None:
+                        missing.append(m)
+                        match = m
+                    changed[self._char(m)] = self._char(match)
+                if missing:
+                    warnings.warn(f"No counterpart with [{' '.join(result.values())}] for {', '.join(missing)}, "
+                                  f"which are left unchanged: {self.rule}", stacklevel=3)
+                mapping.append(changed)
+        return mapping
+
+    def sub(self, text: str) -> str:
+        """Apply the change to words written as phoneme characters.
+
+        Arguments:
+            text: str: The words, one per line, written with ``PHONEME_CHAR_BASE``.
+
+        Returns:
+            str: The changed words.
+        """
+        if isinstance(self._mapping, str):
+            return self.pattern.sub(self._mapping, text)
+        mapping = self._mapping
+        return self.pattern.sub(lambda m: ''.join(table[c] for table, c in zip(mapping, m.group())), text)
+
+
+class SoundChangeCascade:
+    def __init__(self, rules=(), alphabet: PhonemeAlphabet | None = None,
+                 classes: dict[str, list[str]] | None = None):
+        """
+        Initialize an ordered list of sound changes applied to a whole lexicon.
+
+        The lexicon is written as one string of phoneme characters and each
+        rule rewrites all of it with one regular expression substitution.
+        The output of every rule is kept, so after a rule is edited, inserted
+        or removed only the rules from that point on are applied again.
+
+        :param rules: Iterable[str]: The rules, in the order they apply.
+        :param alphabet: PhonemeAlphabet | None: The alphabet used to split words into phonemes.
+        :param classes: dict[str, list[str]] | None: Classes by letter, such as ``{"N": ["m", "n"]}``.
+        """
+        self.alphabet = alphabet if alphabet is not None else PhonemeAlphabet()
+        self.classes = dict(classes or {})
+        self._changes = [self._compile(rule) for rule in rules]
+        self._words = None
+        self._input = None
+        self._stages = []
+        self.applied = 0
+
+    def _compile(self, rule: str | SoundChange) -> SoundChange:
+        if isinstance(rule, SoundChange):
+            rule = rule.rule
+        return SoundChange(rule, self.alphabet, self.classes)
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def __getitem__(self, index: int) -> SoundChange:
+        return self._changes[index]
+
+    def __setitem__(self, index: int, rule: str | SoundChange):
+        index = range(len(self._changes))[index]
+        self._changes[index] = self._compile(rule)
+        del self._stages[index:]
+
+    def __delitem__(self, index: int):
+        index = range(len(self._changes))[index]
+        del self._changes[index]
+        del self._stages[index:]
+
+    def insert(self, index: int, rule: str | SoundChange):
+        """Insert a rule before ``index``.
+
+        Arguments:
+            index: int: The position of the new rule.
+            rule: str | SoundChange: The rule.
+        """
+        index = min(max(index + len(self._changes) if index < 0 else index, 0), len(self._changes))
+        self._changes.insert(index, self._compile(rule))
+        del self._stages[index:]
+
+    def append(self, rule: str | SoundChange):
+        """Add a rule after the last rule.
+
+        Arguments:
+            rule: str | SoundChange: The rule.
+        """
+        self.insert(len(self._changes), rule)
+
+    def _encode(self, words) -> str:
+        chars = [chr(PHONEME_CHAR_BASE + i) for i in range(len(self.alphabet))]
+        lines = []
+        for word in words:
+            ids = self.alphabet.tokenize(word)
+            if len(chars) < len(self.alphabet):
+                chars.extend(chr(PHONEME_CHAR_BASE + i) for i in range(len(chars), len(self.alphabet)))
+            lines.append(''.join([chars[i] for i in ids]))
+        return '\n'.join(lines)
+
+    def _decode(self, text: str, count: int) -> list[str]:
+        if count == 0:
+            return []
+        table = {PHONEME_CHAR_BASE + i: symbol for i, symbol in enumerate(self.alphabet.symbols)}
+        return text.translate(table).split('\n')
+
+    def apply(self, words) -> list[str]:
+        """Apply every rule, in order, to a list of words.
+
+        Stages kept from the last call are reused if the words are the same.
+
+        Arguments:
+            words: Iterable[str | PhonemeWord]: The words, such as ``WordweaverProject.lexicon``.
+
+        Returns:
+            list[str]: The changed words, in the same order.
+        """
+        words = [str(word) for word in words]
+        if words != self._words:
+            self._words = words
+            self._input = self._encode(words)
+            self._stages = []
+        self.applied = len(self._changes) - len(self._stages)
+        for change in self._changes[len(self._stages):]:
+            text = self._stages[-1] if self._stages else self._input
+            self._stages.append(change.sub(text))
+        return self.stage(len(self._changes) - 1)
+
+    def stage(self, index: int) -> list[str]:
+        """Get the words of the last ``apply`` call after the rule at ``index``.
+
+        Arguments:
+            index: int: The index of the rule; -1 before the first rule.
+
+        Returns:
+            list[str]: The words at that stage.
+
+        Raises:
+            ValueError: If the stage has not been computed.
+        """
+        if self._input is None or index >= len(self._stages):
+            raise ValueError("The stage has not been computed; call apply first.")
+        return self._decode(self._input if index < 0 else self._stages[index], len(self._words))
+
+
+__all__ = [
+    "PHONEME_CHAR_BASE",
+    "CONSONANT_FEATURES",
+    "VOWEL_FEATURES",
+    "SoundChange",
+    "SoundChangeCascade",
+]
@@ -0,0 +1,239 @@
+# syllabifier.py
+
+import re
+
+# The state a word is in before its first phoneme
+START = -1
+
+
+class Syllabifier:
+    def __init__(self, templates, inventory, alphabet=None):
+        """
+        Initialize a syllabifier compiled from syllable templates.
+
+        A word conforms if it is a sequence of non-empty syllables where the
+        syllable at index ``i`` matches ``templates[i]``, and syllables past
+        the last template match the last template, as generated by
+        ``PhonemeGenerator``. The templates are compiled into a deterministic
+        automaton over the phoneme types of the inventory, so checking a word
+        reads each phoneme once whatever the optional slots.
+
+        :param templates: Sequence[tuple[PhonemeConstraint]]: The constraint of each syllable position.
+        :param inventory: dict[Phonemes, list[IPAChar]]: The phonemes of each type.
+        :param alphabet: PhonemeAlphabet | None: The phonemes words are split into; built
+            from the inventory if None.
+        :raises ValueError: If there are no templates or a template is empty.
+        """
+        from phonology import phoneme_symbol
+        self.templates = tuple(tuple(template) for template in templates)
+        if not self.templates or any(len(template) == 0 for template in self.templates):
+            raise ValueError("A syllabifier needs at least one template and every template needs a slot.")
+        # Phonemes belonging to the same types are interchangeable, so the
+        # automaton reads one class id per phoneme type set
+        types = {}
+        for t, phonemes in inventory.items():
+            for phoneme in phonemes:
+                types.setdefault(phoneme_symbol(phoneme), set()).add(t)
+        symbols = alphabet.symbols if alphabet is not None else list(types)
+        self.classes = []
+        self._class = {}
+        for symbol in symbols:
+            key = frozenset(types.get(symbol, ()))
+            if key not in self.classes:
+                self.classes.append(key)
+            self._class[symbol] = self.classes.index(key)
+        long_symbols = sorted((s for s in symbols if len(s) > 1), key=len, reverse=True)
+        self._pattern = re.compile(''.join(re.escape(s) + '|' for s in long_symbols) + '.', re.DOTALL)
+        self._build_slots()
+        self._build_automaton()
+
+    @staticmethod
+    def from_generator(generator) -> "Syllabifier":
+        """Create a syllabifier for the words a generator can produce.
+
+        Arguments:
+            generator: PhonemeGenerator: The generator.
+
+        Returns:
+            Syllabifier: The syllabifier.
+        """
+        templates = [generator.syllable_constraint(i) for i in range(len(generator.secondary_constraints) + 1)]
+        return Syllabifier(templates, generator.inventory, generator.alphabet)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} \
+templates: {len(self.templates)} - states: {self.states}>"
+
+    @property
+    def states(self) -> int:
+        """The number of states of the automaton."""
+        return len(self._sets)
+
+    def _build_slots(self):
+        # Slot states are (template, slot) pairs: "the last phoneme filled this slot"
+        last = len(self.templates) - 1
+        self._slots = [(t, j) for t, template in enumerate(self.templates) for j in range(len(template))]
+        index = {slot: q for q, slot in enumerate(self._slots)}
+
+        def entries(t):
+            # the slots a syllable can start at: every slot before them is optional
+            template = self.templates[t]
+            j = 0
+            while True:
+                yield j
+                if j == len(template) - 1 or not template[j].optional:
+                    return
+                j += 1
+
+        self._final = set()
+        self._successors = {START: [(index[0, j], False) for j in entries(0)]}
+        for q, (t, j) in enumerate(self._slots):
+            template = self.templates[t]
+            successors = []
+            # later slots of the same syllable, skipping optional slots
+            for k in range(j + 1, len(template)):
+                successors.append((index[t, k], False))
+                if not template[k].optional:
+                    break
+            else:
+                # every slot after this one is optional, so the syllable can end here
+                self._final.add(q)
+                following = min(t + 1, last)
+                successors.extend((index[following, k], True) for k in entries(following))
+            self._successors[q] = successors
+        self._predecessors = {q: [] for q in range(len(self._slots))}
+        for p, successors in self._successors.items():
+            for q, boundary in successors:
+                self._predecessors[q].append((p, boundary))
+        for predecessors in self._predecessors.values():
+            # extending the syllable is tried first, which puts boundaries as
+            # early as possible and gives the following syllable the longest onset
+            predecessors.sort(key=lambda item: (item[1], -item[0]))
+
+    def _build_automaton(self):
+        # Subset construction over the slot states; state 0 is the start
+        n_classes = len(self.classes)
+        slot_types = [self.templates[t][j].phoneme for t, j in self._slots]
+        self._sets = [frozenset((START,))]
+        ids = {self._sets[0]: 0}
+        self._delta = []
+        self._accepting = []
+        i = 0
+        while i < len(self._sets):
+            current = self._sets[i]
+            self._accepting.append(any(q in self._final for q in current))
+            for c in range(n_classes):
+                types = self.classes[c]
+                target = frozenset(
+                    q for p in current for q, _ in self._successors[p] if slot_types[q] in types
+                )
+                if not target:
+                    self._delta.append(-1)
+                    continue
+                if target not in ids:
+                    ids[target] = len(self._sets)
+                    self._sets.append(target)
+                self._delta.append(ids[target])
+            i += 1
+
+    def _classes(self, word: str) -> list[int]:
+        get = self._class.get
+        return [get(token, -1) for token in self._pattern.findall(str(word))]
+
+    def _run(self, classes: list[int]) -> list[int]:
+        # The states after each phoneme, stopping at the first phoneme that cannot be read
+        delta = self._delta
+        n_classes = len(self.classes)
+        state = 0
+        states = []
+        for c in classes:
+            state = delta[state * n_classes + c] if c >= 0 else -1
+            if state < 0:
+                break
+            states.append(state)
+        return states
+
+    def failure(self, word: str) -> int | None:
+        """Find where a word stops conforming to the templates.
+
+        Arguments:
+            word: str | PhonemeWord: The word as a unicode string or a PhonemeWord.
+
+        Returns:
+            int | None: The index of the first phoneme that no template allows, the
+            number of phonemes if the word ends in the middle of a syllable, or None
+            if the word conforms.
+        """
+        classes = self._classes(word)
+        states = self._run(classes)
+        if len(states) < len(classes):
+            return len(states)
+        if not states or not self._accepting[states[-1]]:
+            return len(states)
+        return None
+
+    def conforms(self, word: str) -> bool:
+        """Check whether a word conforms to the templates.
+
+        Arguments:
+            word: str | PhonemeWord: The word as a unicode string or a PhonemeWord.
+
+        Returns:
+            bool: True if the word conforms.
+        """
+        return self.failure(word) is None
+
+    def syllabify(self, word: str) -> list[str]:
+        """Split a word into syllables.
+
+        When a word can be split in several ways, consonants between vowels
+        go to the onset of the following syllable where the templates allow.
+
+        Arguments:
+            word: str | PhonemeWord: The word as a unicode string or a PhonemeWord.
+
+        Returns:
+            list[str]: The syllables.
+
+        Raises:
+            ValueError: If the word does not conform to the templates.
+        """
+        tokens = self._pattern.findall(str(word))
+        classes = [self._class.get(token, -1) for token in tokens]
+        states = self._run(classes)
+        if len(states) < len(classes) or not states or not self._accepting[states[-1]]:
+            raise ValueError(f"\"{word}\" does not conform to the syllable templates at phoneme {len(states)}.")
+        # Walk back from a final slot through slots that were reachable going forward
+        sets = self._sets
+        q = min(q for q in sets[states[-1]] if q in self._final)
+        starts = []
+        for i in range(len(states) - 1, 0, -1):
+            previous = sets[states[i - 1]]
+            for p, boundary in self._predecessors[q]:
+                if p in previous:
+                    break
+            if boundary:
+                starts.append(i)
+            q = p
+        bounds = [0] + starts[::-1] + [len(tokens)]
+        return [''.join(tokens[bounds[k]:bounds[k + 1]]) for k in range(len(bounds) - 1)]
+
+    def check_lexicon(self, words) -> dict[str, int]:
+        """Check every word of a lexicon against the templates.
+
+        Arguments:
+            words: Iterable[str | PhonemeWord]: The words, such as ``WordweaverProject.lexicon``.
+
+        Returns:
+            dict[str, int]: The words that do not conform, as unicode strings, with the
+            position from ``failure``.
+        """
+        failures = {}
+        for word in words:
+            position = self.failure(word)
+            if position is not None:
+                failures[str(word)] = position
+        return failures
+
+
+__all__ = ["Syllabifier"]
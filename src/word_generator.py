@@ -0,0 +1,269 @@
+# word_generator.py
+
+from PyQt6.QtWidgets import (
+        QApplication, QHBoxLayout, QLabel, QMainWindow, QPlainTextEdit,
+        QProgressBar, QPushButton, QSpinBox, QVBoxLayout, QWidget
+)
+from PyQt6.QtGui import QCloseEvent, QFont
+from PyQt6.QtCore import QObject, Qt, QThread, pyqtSignal
+
+import logging
+import time
+from itertools import islice
+
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from wordweaver_project import WordweaverProject
+
+GENERATOR_TEXT = """Choose how many words to generate and how many syllables each has. \
+Generation runs in the background and can be cancelled at any time."""
+
+# Words sent to the window per signal; large enough that signals are rare,
+# small enough that progress updates several times a second
+CHUNK_SIZE = 10000
+# Only the first words are shown, as laying out millions of lines would
+# freeze the window; every word is kept for the lexicon
+DISPLAY_LIMIT = 10000
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+
+class GenerationWorker(QObject):
+    # The rendered words of one chunk
+    chunk = pyqtSignal(list)
+    # The number of words generated so far and the words generated per second
+    progress = pyqtSignal(int, float)
+    # Whether the run was cancelled before all words were generated
+    finished = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+
+    def __init__(self, generator: PhonemeGenerator, syllable_length: int, n: int,
+                 separator: str = '', chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize a worker that generates words on a background thread.
+
+        :param generator: PhonemeGenerator: The generator the words are drawn from.
+        :param syllable_length: int: The number of syllables in each word.
+        :param n: int: The number of words to generate.
+        :param separator: str: The string placed between syllables.
+        :param chunk_size: int: The number of words sent with each ``chunk`` signal.
+        """
+        super().__init__()
+        self.logger = logging.getLogger(__name__ + "." + self.__class__.__name__)
+        self.generator = generator
+        self.syllable_length = syllable_length
+        self.n = n
+        self.separator = separator
+        self.chunk_size = chunk_size
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop the run after the current chunk; safe to call from any thread."""
+        self._cancelled = True
+
+    def run(self):
+        """Generate the words, emitting them chunk by chunk until done or cancelled."""
+        try:
+            words = self.generator.iter_words(self.syllable_length, self.n, self.separator)
+            start = time.perf_counter()
+            done = 0
+            while done < self.n and not self._cancelled:
+                chunk = list(islice(words, min(self.chunk_size, self.n - done)))
+                if not chunk:
+                    break
+                done += len(chunk)
+                self.chunk.emit(chunk)
+                self.progress.emit(done, done / max(time.perf_counter() - start, 1e-9))
+        except Exception as e:
+            self.logger.error(f"Word generation failed: {e}")
+            self.failed.emit(str(e))
+        self.finished.emit(self._cancelled)
+
+
+class WordGenerator(QMainWindow):
+    def __init__(self, project: WordweaverProject = None):
+        super().__init__()
+
+        self.logger = logging.getLogger(__name__ + "." + self.__class__.__name__)
+
+        # Setup defaults for the class
+        self.project = project
+        self.words = []
+        self._thread = None
+        self._worker = None
+
+        # Construct GUI
+        self.logger.debug("Constructing WordGenerator GUI")
+        self.setWindowTitle("Word Generator")
+
+        self.setGeometry(100, 100, 640, 480)
+
+        widget = QWidget(self)
+        self.setCentralWidget(widget)
+        self.layout = QVBoxLayout(widget)
+
+        # Add text and header
+        header = QLabel("Word Generator", self)
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        header.setFont(QFont("Arial", 32, QFont.Weight.Bold))
+        header.setContentsMargins(0, 0, 0, 20)
+        self.layout.addWidget(header)
+        text = QLabel(GENERATOR_TEXT, self)
+        text.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        text.setContentsMargins(20, 0, 0, 20)
+        text.setWordWrap(True)
+        self.layout.addWidget(text)
+
+        # Add the generation settings
+        settings = QWidget(self)
+        settings_layout = QHBoxLayout(settings)
+
+        settings_layout.addWidget(QLabel("Words:", settings))
+        self.count_input = QSpinBox(settings)
+        self.count_input.setRange(1, 10 ** 7)
+        self.count_input.setValue(100)
+        self.count_input.setGroupSeparatorShown(True)
+        settings_layout.addWidget(self.count_input)
+
+        settings_layout.addWidget(QLabel("Syllables:", settings))
+        self.syllable_input = QSpinBox(settings)
+        self.syllable_input.setRange(1, 10)
+        self.syllable_input.setValue(2)
+        settings_layout.addWidget(self.syllable_input)
+
+        self.layout.addWidget(settings)
+
+        # Add the progress and the generated words
+        self.progress_bar = QProgressBar(self)
+        self.layout.addWidget(self.progress_bar)
+        self.status = QLabel("", self)
+        self.layout.addWidget(self.status)
+
+        self.words_text = QPlainTextEdit(self)
+        self.words_text.setReadOnly(True)
+        self.layout.addWidget(self.words_text)
+
+        # Add the buttons
+        buttons = QWidget(self)
+        buttons_layout = QHBoxLayout(buttons)
+
+        self.generate_button = QPushButton("Generate", buttons)
+        self.generate_button.clicked.connect(self.generate)
+        buttons_layout.addWidget(self.generate_button)
+
+        self.cancel_button = QPushButton("Cancel", buttons)
+        self.cancel_button.clicked.connect(self.cancel)
+        self.cancel_button.setEnabled(False)
+        buttons_layout.addWidget(self.cancel_button)
+
+        self.add_button = QPushButton("Add to Lexicon", buttons)
+        self.add_button.clicked.connect(self.add_to_lexicon)
+        self.add_button.setEnabled(False)
+        buttons_layout.addWidget(self.add_button)
+
+        self.layout.addWidget(buttons)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def generate(self):
+        if self.running or self.project is None:
+            return
+        try:
+            generator = PhonemeGenerator(self.project.pulmonic_inventory + self.project.vowel_inventory,
+                                         CONSTRAINTS, weights=self.project.phoneme_weights)
+        except ValueError as e:
+            self.status.setText(f"Cannot generate words: {e}")
+            return
+        n = self.count_input.value()
+        self.words = []
+        self.words_text.clear()
+        self.progress_bar.setRange(0, n)
+        self.progress_bar.setValue(0)
+        self.status.setText("Generating...")
+        self._set_running(True)
+
+        # The worker lives on its own thread; its signals are queued to this window
+        self._thread = QThread(self)
+        self._worker = GenerationWorker(generator, self.syllable_input.value(), n)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.chunk.connect(self._on_chunk)
+        self._worker.progress.connect(self._on_progress)
+        self._worker.failed.connect(self._on_failed)
+        self._worker.finished.connect(self._on_finished)
+        self._thread.start()
+        self.logger.info(f"Started generating {n} words")
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.status.setText("Cancelling...")
+
+    def add_to_lexicon(self):
+        if self.project is None:
+            return
+        for word in self.words:
+            self.project.lexicon.setdefault(word, "")
+        self.logger.info(f"Added {len(self.words)} generated words to the lexicon")
+
+    def _set_running(self, running: bool):
+        self.generate_button.setEnabled(not running)
+        self.count_input.setEnabled(not running)
+        self.syllable_input.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+        self.add_button.setEnabled(not running and len(self.words) > 0)
+
+    def _on_chunk(self, words: list[str]):
+        shown = len(self.words)
+        self.words.extend(words)
+        if shown < DISPLAY_LIMIT:
+            self.words_text.appendPlainText("\n".join(words[:DISPLAY_LIMIT - shown]))
+
+    def _on_progress(self, done: int, rate: float):
+        self.progress_bar.setValue(done)
+        self.status.setText(f"Generated {done:,} of {self.progress_bar.maximum():,} words ({rate:,.0f} words/s)")
+
+    def _on_failed(self, message: str):
+        self.status.setText(f"Generation failed: {message}")
+
+    def _on_finished(self, cancelled: bool):
+        if self._thread is None:
+            # the window was closed while the run was finishing
+            return
+        self._thread.quit()
+        self._thread.wait()
+        self._thread = None
+        self._worker = None
+        self._set_running(False)
+        if cancelled:
+            self.status.setText(f"Cancelled after {len(self.words):,} words")
+        self.logger.info(f"Finished generating {len(self.words)} words{' (cancelled)' if cancelled else ''}")
+
+    def closeEvent(self, a0: QCloseEvent | None) -> None:
+        # Stop a running generation before the window and its thread go away
+        if self._worker is not None:
+            self._worker.cancel()
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+            self._worker = None
+        return super().closeEvent(a0)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(filename="word_generator.log",
+                        level=logging.DEBUG,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    app = QApplication([])
+    window = WordGenerator(WordweaverProject("Untitled Project", pulmonic_inventory=["p", "t", "k"],
+                                             vowel_inventory=["a", "i", "u"]))
+    window.show()
+    app.exec()
+
+
+__all__ = ["GenerationWorker", "WordGenerator"]
@@ -0,0 +1,121 @@
+# word_sink.py
+
+from typing import BinaryIO, Iterable
+
+# Framing of the words written to a sink
+NEWLINE = "newline"
+LENGTH_PREFIXED = "length"
+
+
+class WordSink:
+    def __init__(self, target: str | BinaryIO, framing: str = NEWLINE, buffer_size: int = 1 << 16):
+        """
+        Initialize a buffered sink that writes words to a file or pipe.
+
+        Words are encoded as UTF-8 and framed either by a trailing newline or
+        by a 2 byte big-endian length prefix, as in the project file format.
+        Encoded words are collected until ``buffer_size`` bytes are pending and
+        then written with a single call.
+
+        :param target: str | BinaryIO: A file path, or a binary stream such as
+            ``sys.stdout.buffer``. Streams are flushed but not closed.
+        :param framing: str: ``NEWLINE`` or ``LENGTH_PREFIXED``.
+        :param buffer_size: int: The number of bytes to collect before writing.
+        :raises ValueError: If the framing is unknown.
+        """
+        if framing not in (NEWLINE, LENGTH_PREFIXED):
+            raise ValueError(f"Unknown framing: {framing}")
+        self.framing = framing
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._owns_stream = isinstance(target, str)
+        self._stream = open(target, 'wb') if self._owns_stream else target
+        self._buffer = []
+        self._pending = 0
+
+    def __enter__(self) -> "WordSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, word: str):
+        """Write a single word to the sink.
+
+        Arguments:
+            word: str: The word to write.
+
+        Raises:
+            ValueError: If a length prefixed word is longer than 65535 bytes.
+        """
+        data = word.encode()
+        if self.framing == NEWLINE:
+            self._buffer.append(data + b'\n')
+        else:
+            if len(data) > 0xFFFF:
+                raise ValueError("Words are limited to 65535 bytes.")
+            self._buffer.append(len(data).to_bytes(2, 'big') + data)
+        self._pending += len(data) + 2
+        self.count += 1
+        if self._pending >= self.buffer_size:
+            self._write_buffer()
+
+    def write_all(self, words: Iterable[str]) -> int:
+        """Write every word from an iterable, such as ``PhonemeGenerator.iter_words``.
+
+        Arguments:
+            words: Iterable[str]: The words to write.
+
+        Returns:
+            int: The number of words written.
+        """
+        count = self.count
+        for word in words:
+            self.write(word)
+        return self.count - count
+
+    def _write_buffer(self):
+        self._stream.write(b''.join(self._buffer))
+        self._buffer = []
+        self._pending = 0
+
+    def flush(self):
+        """Write any buffered words and flush the underlying stream."""
+        if self._buffer:
+            self._write_buffer()
+        self._stream.flush()
+
+    def close(self):
+        """Flush the sink and close the file if the sink opened it."""
+        if self._stream is None:
+            return
+        self.flush()
+        if self._owns_stream:
+            self._stream.close()
+        self._stream = None
+
+
+def read_words(source: str | BinaryIO, framing: str = NEWLINE):
+    """Lazily read the words written by a WordSink.
+
+    Arguments:
+        source: str | BinaryIO: A file path or binary stream.
+        framing: str: ``NEWLINE`` or ``LENGTH_PREFIXED``.
+
+    Yields:
+        word: str: The next word.
+    """
+    stream = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        if framing == NEWLINE:
+            for line in stream:
+                yield line.rstrip(b'\n').decode()
+        else:
+            while length := stream.read(2):
+                yield stream.read(int.from_bytes(length, 'big')).decode()
+    finally:
+        if isinstance(source, str):
+            stream.close()
+
+
+__all__ = ["NEWLINE", "LENGTH_PREFIXED", "WordSink", "read_words"]
@@ -1,11 +1,28 @@
 # wordweaver_project.py
 
+from __future__ import annotations
+
 import logging
+import math
 
 from os.path import exists
+from typing import TYPE_CHECKING
+
+from instrumentation import count, traced
+from phoneme_word import PhonemeAlphabet, PhonemeWord, PhonemeWordList
+from phonology_classes import NaturalClassIndex
+import project_sections
+from lexicon_blocks import encode_blocks
+
+# ipapy loads its whole IPA database on import, so it is only imported
+# when an inventory is converted, as in ``phonology``.
+if TYPE_CHECKING:
+    from ipapy.ipachar import IPAChar
 
-from ipapy.ipachar import IPAChar
-from ipapy import IPA_TO_UNICODE, UNICODE_TO_IPA
+
+def _is_ipa_inventory(inventory) -> bool:
+    from ipapy.ipachar import IPAChar
+    return all(isinstance(sound, IPAChar) for sound in inventory)
 
 
 class WordweaverProject:
@@ -15,7 +32,8 @@ class WordweaverProject:
                  pulmonic_inventory: list[IPAChar] | list[str] = None,
                  non_pulmonic_inventory: list[IPAChar] | list[str] = None,
                  vowel_inventory: list[IPAChar] | list[str] = None,
-                 lexicon: dict[str, str] = None):
+                 lexicon: dict[str | PhonemeWord, str] = None,
+                 phoneme_weights: dict[str, float] = None):
         """
         Initialize a new WordweaverProject object.
 
@@ -29,7 +47,10 @@ class WordweaverProject:
         :param non_pulmonic_inventory: list[IPAChar] | list[str]: A list of
             non-pulmonic consonants.
         :param vowel_inventory: list[IPAChar] | list[str]: A list of vowels.
-        :param lexicon: dict[str, str]: A dictionary of words.
+        :param lexicon: dict[str | PhonemeWord, str]: A dictionary of words.
+        :param phoneme_weights: dict[str, float]: The relative frequency of
+            phonemes by unicode representation, as used by
+            ``PhonemeGenerator.weights``. Phonemes left out have a weight of 1.
         :raises ValueError: If the inventory is not a list of IPAChar objects or
             unicode strings. Each lists must contain only one type.
         """
@@ -47,21 +68,27 @@ class WordweaverProject:
         self._non_pulmonic_inventory = non_pulmonic_inventory
         self._vowel_inventory = vowel_inventory
         self._lexicon = lexicon
+        self.phoneme_weights = phoneme_weights if phoneme_weights is not None else {}
+        self._alphabet = None
+        self._natural_classes = None
         # Convert strings to Phoneme objects
         if all(isinstance(sound, str) for sound in pulmonic_inventory):
             self._pulmonic_inventory = self._inventory_to_ipa(pulmonic_inventory)
-        elif not all(isinstance(sound, IPAChar) for sound in pulmonic_inventory):
+        elif not _is_ipa_inventory(pulmonic_inventory):
             raise ValueError("Invalid pulmonic inventory; values must be of type str or IPAChar")
         if all(isinstance(sound, str) for sound in non_pulmonic_inventory):
             self._non_pulmonic_inventory = self._inventory_to_ipa(non_pulmonic_inventory)
-        elif not all(isinstance(sound, IPAChar) for sound in non_pulmonic_inventory):
+        elif not _is_ipa_inventory(non_pulmonic_inventory):
             raise ValueError("Invalid non-pulmonic inventory; values must be of type str or IPAChar")
         if all(isinstance(sound, str) for sound in vowel_inventory):
             self._vowel_inventory = self._inventory_to_ipa(vowel_inventory)
-        elif not all(isinstance(sound, IPAChar) for sound in vowel_inventory):
+        elif not _is_ipa_inventory(vowel_inventory):
             raise ValueError("Invalid vowel inventory; values must be of type str or IPAChar")
 
     def _inventory_to_ipa(self, inv: list[str]) -> list[IPAChar]:
+        if not inv:
+            return []
+        from ipapy import UNICODE_TO_IPA
         ipa_inv = []
         for sound in inv:
             try:
@@ -78,10 +105,12 @@ class WordweaverProject:
     def pulmonic_inventory(self, value: list[IPAChar] | list[str]):
         if all(isinstance(sound, str) for sound in value):
             self._pulmonic_inventory = self._inventory_to_ipa(value)
-        elif not all(isinstance(sound, IPAChar) for sound in value):
+        elif not _is_ipa_inventory(value):
             raise ValueError("Invalid pulmonic inventory; values must be of type IPAChar or str")
         else:
             self._pulmonic_inventory = value
+        self._alphabet = None
+        self._update_natural_classes()
 
     @property
     def non_pulmonic_inventory(self) -> list[IPAChar]:
@@ -91,10 +120,12 @@ class WordweaverProject:
     def non_pulmonic_inventory(self, value: list[IPAChar] | list[str]):
         if all(isinstance(sound, str) for sound in value):
             self._non_pulmonic_inventory = self._inventory_to_ipa(value)
-        elif not all(isinstance(sound, IPAChar) for sound in value):
+        elif not _is_ipa_inventory(value):
             raise ValueError("Invalid non-pulmonic inventory; values must be of type IPAChar or str")
         else:
             self._non_pulmonic_inventory = value
+        self._alphabet = None
+        self._update_natural_classes()
 
     @property
     def vowel_inventory(self) -> list[IPAChar]:
@@ -104,10 +135,12 @@ class WordweaverProject:
     def vowel_inventory(self, value: list[IPAChar] | list[str]):
         if all(isinstance(sound, str) for sound in value):
             self._vowel_inventory = self._inventory_to_ipa(value)
-        elif not all(isinstance(sound, IPAChar) for sound in value):
+        elif not _is_ipa_inventory(value):
             raise ValueError("Invalid vowel inventory; values must be of type IPAChar or str")
         else:
             self._vowel_inventory = value
+        self._alphabet = None
+        self._update_natural_classes()
 
     @property
     def inventory(self) -> dict[str, IPAChar]:
@@ -118,16 +151,64 @@ class WordweaverProject:
         }
 
     @property
-    def lexicon(self) -> dict[str, str]:
+    def natural_classes(self) -> NaturalClassIndex:
+        """The natural classes of the pulmonic, non-pulmonic and vowel inventories.
+
+        The index is built on first use and then updated in place when an
+        inventory is replaced, so it can be shared by other subsystems.
+        """
+        if self._natural_classes is None:
+            self._natural_classes = NaturalClassIndex(
+                self.pulmonic_inventory + self.non_pulmonic_inventory + self.vowel_inventory
+            )
+        return self._natural_classes
+
+    def _update_natural_classes(self):
+        if self._natural_classes is not None:
+            self._natural_classes.update(
+                self.pulmonic_inventory + self.non_pulmonic_inventory + self.vowel_inventory
+            )
+
+    @property
+    def alphabet(self) -> PhonemeAlphabet:
+        """The alphabet of phoneme ids for the pulmonic, non-pulmonic and vowel inventories."""
+        if self._alphabet is None:
+            self._alphabet = PhonemeAlphabet.from_inventory(
+                self.pulmonic_inventory + self.non_pulmonic_inventory + self.vowel_inventory
+            )
+        return self._alphabet
+
+    @property
+    def lexicon(self) -> dict[str | PhonemeWord, str]:
         return self._lexicon
 
     @lexicon.setter
-    def lexicon(self, value: dict[str, str]):
+    def lexicon(self, value: dict[str | PhonemeWord, str]):
         self._lexicon = value
 
-    def save(self) -> bool:
+    def encode_lexicon(self) -> PhonemeWordList:
+        """Pack the words of the lexicon as phoneme ids of the project's alphabet.
+
+        Returns:
+            PhonemeWordList: The encoded words, in lexicon order.
+        """
+        return PhonemeWordList(self.alphabet, self.lexicon)
+
+    @traced()
+    def save(self, version: int = 2, compression: str | None = "zlib") -> bool:
         """Save the project to the file specified in the project.
 
+        Version 2 files are a directory of sections followed by the
+        sections; see ``project_sections.SectionFile`` for the layout.
+        They store the glosses of the lexicon and have no limits below
+        65535 phonemes per inventory, 65535 bytes per word and 4294967295
+        words. Unless ``compression`` is None, the lexicon is sorted and
+        written as front-coded blocks compressed with ``zlib`` or ``lzma``
+        (see ``lexicon_blocks.encode_blocks``), which makes large lexicons
+        several times smaller. The order of the words is then kept as the
+        position of each word in the blocks, so it is restored on load.
+        Version 1 files are written as follows.
+
         .. code-block::
 
             File format is as follows:
@@ -143,17 +224,46 @@ class WordweaverProject:
             Vowels:               n bytes     vowel_inventory
             Lexicon length:       3 bytes     len(lexicon)
             Lexicon:
-                Word length:      1 byte      len(word)
+                Word length:      1 byte      len(word.encode())
                 Word:             n bytes     word
 
         Given the format. There is a maximum length of
         65535 characters for the name; 255 for the
         phonology_inventory, and vowel_inventory.
         The lexicon is limited to 16777215 words. With
-        each word limited to 255 characters.
+        each word limited to 255 bytes. Words may be
+        strings or PhonemeWord objects, which are
+        written as their unicode representation.
+        Glosses and phoneme weights are only stored
+        in version 2 files.
+
+        Arguments:
+            version: int: The file format version to write, 1 or 2.
+            compression: str | None: How version 2 files compress the lexicon, ``"zlib"``,
+                ``"lzma"`` or None to keep it uncompressed.
+
+        Returns:
+            bool: False if the project has no file.
+
+        Raises:
+            ValueError: If the version is not 1 or 2, the compression is not supported, or
+                the phoneme weights cannot be stored. Nothing is written in that case.
         """
+        if version not in (0x01, 0x02):
+            raise ValueError(f"Unsupported project version {version}.")
+        if compression not in (None, "zlib", "lzma"):
+            raise ValueError(f"Unsupported lexicon compression {compression}.")
+        # Checked before the file is opened, which would truncate it
+        if version == 0x01 and self.phoneme_weights:
+            raise ValueError("Phoneme weights can only be saved in version 2 project files.")
+        for phoneme, weight in self.phoneme_weights.items():
+            if not isinstance(phoneme, str) or not isinstance(weight, (int, float)) or not math.isfinite(weight):
+                raise ValueError(f"Invalid phoneme weight {phoneme!r}: {weight!r}")
         if self.file is None:
             return False
+        if version == 0x02:
+            self._save_sections(compression)
+            return True
         with open(self.file, 'wb') as f_out:
             f_out.write(0x87AFFA87.to_bytes(4, 'big'))
             f_out.write(0x01.to_bytes(1, 'big'))
@@ -164,21 +274,69 @@ class WordweaverProject:
             self._write_inventory(f_out, self.vowel_inventory)
             f_out.write(len(self.lexicon).to_bytes(3, 'big'))
             for word in self.lexicon:
-                f_out.write(len(word).to_bytes(1, 'big'))
-                f_out.write(word.encode())
+                self._write_word(f_out, word)
+            count("lexicon words written", len(self.lexicon))
         return True
 
+    def _save_sections(self, compression: str | None):
+        entries = [(str(word), gloss or "") for word, gloss in self.lexicon.items()]
+        if compression is None:
+            lexicon = (project_sections.SECTION_LEXICON,
+                       project_sections.encode_lexicon([word for word, _ in entries]))
+        else:
+            ranks = sorted(range(len(entries)), key=lambda i: entries[i][0])
+            lexicon = (project_sections.SECTION_LEXICON_BLOCKS,
+                       encode_blocks([entries[i][0] for i in ranks], compression))
+        sections = [
+            (project_sections.SECTION_NAME, project_sections.encode_name(self.name)),
+            (project_sections.SECTION_INVENTORIES, project_sections.encode_inventories(
+                [self._inventory_symbols(inventory) for inventory in
+                 (self.pulmonic_inventory, self.non_pulmonic_inventory, self.vowel_inventory)])),
+            lexicon,
+        ]
+        if compression is not None and any(i != rank for i, rank in enumerate(ranks)):
+            # Blocks are sorted, so the position of each word in them keeps the lexicon order
+            positions = [0] * len(ranks)
+            for position, i in enumerate(ranks):
+                positions[i] = position
+            sections.append((project_sections.SECTION_LEXICON_ORDER, project_sections.encode_order(positions)))
+        count("lexicon words written", len(entries))
+        # Empty sections are left out, and read back as their defaults
+        if any(gloss for _, gloss in entries):
+            sections.append((project_sections.SECTION_GLOSSES,
+                             project_sections.encode_glosses([gloss for _, gloss in entries])))
+        if self.phoneme_weights:
+            sections.append((project_sections.SECTION_GENERATOR,
+                             project_sections.encode_generator({"phoneme_weights": self.phoneme_weights})))
+        with open(self.file, 'wb') as f_out:
+            project_sections.write_sections(f_out, sections)
+
     @staticmethod
-    def _write_inventory(f_stream, inventory: list[IPAChar]):
-        f_stream.write(len(inventory).to_bytes(1, 'big'))
+    def _inventory_symbols(inventory: list[IPAChar]) -> list[str]:
+        symbols = []
         for sound in inventory:
             sound_unicode = sound.unicode_repr
             if sound_unicode is None:
+                from ipapy import IPA_TO_UNICODE
                 sound_unicode = IPA_TO_UNICODE[sound.canonical_representation]
+            symbols.append(sound_unicode)
+        return symbols
+
+    @staticmethod
+    def _write_word(f_stream, word: str | PhonemeWord):
+        word_bytes = str(word).encode()
+        f_stream.write(len(word_bytes).to_bytes(1, 'big'))
+        f_stream.write(word_bytes)
+
+    @staticmethod
+    def _write_inventory(f_stream, inventory: list[IPAChar]):
+        f_stream.write(len(inventory).to_bytes(1, 'big'))
+        for sound_unicode in WordweaverProject._inventory_symbols(inventory):
             f_stream.write(len(sound_unicode.encode()).to_bytes(1, 'big'))
             f_stream.write(sound_unicode.encode())
 
     @staticmethod
+    @traced("WordweaverProject.from_file")
     def from_file(file):
         # Check that the file exists
         if not exists(file):
@@ -191,6 +349,8 @@ class WordweaverProject:
             if magic_number != 0x87AFFA87:
                 return None
             version = int.from_bytes(f_in.read(1), 'big')
+            if version == 0x02:
+                return WordweaverProject._from_sections(file)
             if version != 0x01:
                 # TODO: Handle older versions
                 # As a fallback, return None
@@ -202,13 +362,95 @@ class WordweaverProject:
             vowel_inventory = WordweaverProject._read_inventory(f_in)
             lexicon_length = int.from_bytes(f_in.read(3), 'big')
             lexicon = {}
-            # TODO: format lexicon
+            # Version 1 files do not store definitions
             for _ in range(lexicon_length):
-                lexicon.append(f_in.read(1).decode())
+                lexicon[WordweaverProject._read_word(f_in)] = ""
+            count("lexicon words read", lexicon_length)
         return WordweaverProject(name, file, pulmonic_inventory, non_pulmonic_inventory, vowel_inventory, lexicon)
 
+    @staticmethod
+    def _from_sections(file):
+        name, inventories, lexicon, glosses, generator = WordweaverProject.read_sections(
+            file, "name", "inventories", "lexicon", "glosses", "generator")
+        from ipapy import UNICODE_TO_IPA
+        pulmonic_inventory, non_pulmonic_inventory, vowel_inventory = (
+            [UNICODE_TO_IPA[symbol] for symbol in inventory] for inventory in inventories)
+        if glosses:
+            lexicon = dict(zip(lexicon, glosses))
+        else:
+            lexicon = dict.fromkeys(lexicon, "")
+        count("lexicon words read", len(lexicon))
+        return WordweaverProject(name, file, pulmonic_inventory, non_pulmonic_inventory, vowel_inventory, lexicon,
+                                 generator.get("phoneme_weights", {}))
+
+    @staticmethod
+    def read_sections(file, *names: str) -> list:
+        """Read only some sections of a project file.
+
+        Version 2 files are read through their section directory, so only
+        the requested sections are read and checked. Version 1 files have
+        no directory, so they are read in full.
+
+        Arguments:
+            file: str | Path: The path of the project file.
+            *names: str: The sections to read, out of ``"name"``, ``"inventories"``,
+                ``"lexicon"``, ``"glosses"`` and ``"generator"``.
+
+        Returns:
+            list: The value of each section, in the order requested. The inventories are
+            three lists of unicode strings, the lexicon and glosses are lists of strings,
+            and the generator settings are a dict such as ``{"phoneme_weights": {...}}``.
+            Sections missing from the file are read as empty values.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not a project file, a section name is unknown
+                or a section does not match its checksum.
+        """
+        for name in names:
+            if name not in project_sections.SECTIONS:
+                raise ValueError(f"Unknown project section: {name}")
+        with open(file, 'rb') as f_in:
+            header = f_in.read(5)
+        if len(header) < 5 or int.from_bytes(header[:4], 'big') != 0x87AFFA87:
+            raise ValueError(f"Not a Wordweaver project: {file}")
+        if header[4] == 0x01:
+            project = WordweaverProject.from_file(file)
+            values = {
+                "name": project.name,
+                "inventories": [project._inventory_symbols(inventory) for inventory in
+                                (project.pulmonic_inventory, project.non_pulmonic_inventory,
+                                 project.vowel_inventory)],
+                "lexicon": list(project.lexicon),
+                "glosses": list(project.lexicon.values()),
+                "generator": {"phoneme_weights": project.phoneme_weights} if project.phoneme_weights else {},
+            }
+            return [values[name] for name in names]
+        defaults = {"name": "", "inventories": [[], [], []], "lexicon": [], "glosses": [], "generator": {}}
+        values = []
+        with project_sections.SectionFile(file) as sections:
+            for name in names:
+                tag = project_sections.SECTIONS[name]
+                if tag == project_sections.SECTION_LEXICON and tag not in sections:
+                    tag = project_sections.SECTION_LEXICON_BLOCKS
+                data = sections.read(tag)
+                value = defaults[name] if data is None else project_sections.DECODERS[tag](data)
+                if tag == project_sections.SECTION_LEXICON_BLOCKS:
+                    # Put the sorted words of the blocks back in lexicon order
+                    order = sections.read(project_sections.SECTION_LEXICON_ORDER)
+                    if order is not None:
+                        value = [value[position] for position in project_sections.decode_order(order)]
+                values.append(value)
+        return values
+
+    @staticmethod
+    def _read_word(f_stream) -> str:
+        word_len = int.from_bytes(f_stream.read(1), 'big')
+        return f_stream.read(word_len).decode()
+
     @staticmethod
     def _read_inventory(f_stream):
+        from ipapy import UNICODE_TO_IPA
         inventory = []
         inventory_len = int.from_bytes(f_stream.read(1), 'big')
         for _ in range(inventory_len):
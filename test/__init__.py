@@ -1,10 +1,49 @@
 # test/__init__.py
 
-from .test_phonology import TestPhonemeGenerator
+from .test_instrumentation import TestInstrumentation
+from .test_lexicon_blocks import TestLexiconBlocks
+from .test_minimal_pairs import TestMinimalPairFinder
+from .test_phoneme_word import TestPhonemeWord
+from .test_phonology import TestPhonemes, TestPhonemeGenerator
+from .test_phonology_batch import TestWordBatch
+from .test_phonology_classes import TestNaturalClassIndex
+from .test_phonology_features import TestFeatureMatrix
+from .test_phonology_markov import TestMarkovGenerator
+from .test_phonology_parallel import TestGeneratorSpec
+from .test_phonology_random import TestRandomStream
+from .test_phonology_space import TestWordSpace
+from .test_phonology_unique import TestGenerateUnique
+from .test_phonotactics import TestPhonotacticFilter
+from .test_project_reader import TestProjectReader
+from .test_project_sections import TestProjectSections
+from .test_similarity import TestSimilarityIndex
+from .test_sound_change import TestSoundChange
+from .test_syllabifier import TestSyllabifier
+from .test_word_sink import TestWordSink
 from .test_wordweaver_project import TestWordweaverProject
 
 __all__ = [
+    "TestInstrumentation",
+    "TestLexiconBlocks",
+    "TestMinimalPairFinder",
+    "TestPhonemeWord",
+    "TestPhonemes",
     "TestPhonemeGenerator",
+    "TestWordBatch",
+    "TestNaturalClassIndex",
+    "TestFeatureMatrix",
+    "TestMarkovGenerator",
+    "TestGeneratorSpec",
+    "TestRandomStream",
+    "TestWordSpace",
+    "TestGenerateUnique",
+    "TestPhonotacticFilter",
+    "TestProjectReader",
+    "TestProjectSections",
+    "TestSimilarityIndex",
+    "TestSoundChange",
+    "TestSyllabifier",
+    "TestWordSink",
     "TestWordweaverProject",
 ]
 
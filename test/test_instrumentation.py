@@ -0,0 +1,95 @@
+# test/test_instrumentation.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+import json
+import tempfile
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from ipapy.ipachar import IPAChar
+
+import instrumentation
+from phonology import PhonemeGenerator
+from wordweaver_project import WordweaverProject
+
+INVENTORY = [
+    IPAChar("bilabial consonant plosive voiceless"),
+    IPAChar("front open unrounded vowel"),
+]
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled(self):
+        self.assertFalse(instrumentation.enabled())
+        PhonemeGenerator(INVENTORY, rng=1).generate_random(2, 10)
+        with instrumentation.span("block"):
+            instrumentation.count("calls")
+        self.assertIsNone(instrumentation.disable())
+        self.assertEqual(instrumentation.chrome_trace(), {"traceEvents": []})
+
+    def test_generator(self):
+        recorder = instrumentation.enable()
+        generator = PhonemeGenerator(INVENTORY, rng=1)
+        generator.generate_random(2, 10)
+        names = [name for name, *_ in recorder.spans]
+        self.assertIn("PhonemeGenerator.__init__", names)
+        self.assertIn("PhonemeGenerator.generate_range", names)
+        self.assertEqual(recorder.counters["words generated"], 10)
+        self.assertIs(instrumentation.disable(), recorder)
+        generator.generate_random(2, 10)
+        self.assertEqual(recorder.counters["words generated"], 10)
+
+    def test_project(self):
+        recorder = instrumentation.enable()
+        with tempfile.TemporaryDirectory() as directory:
+            project = WordweaverProject("Test", path.join(directory, "test.wwproj"),
+                                        pulmonic_inventory=["p"], vowel_inventory=["a"],
+                                        lexicon={"pa": "", "apa": ""})
+            project.save()
+            WordweaverProject.from_file(project.file)
+        names = [name for name, *_ in recorder.spans]
+        self.assertIn("WordweaverProject.save", names)
+        self.assertIn("WordweaverProject.from_file", names)
+        self.assertEqual(recorder.counters["lexicon words written"], 2)
+        self.assertEqual(recorder.counters["lexicon words read"], 2)
+
+    def test_chrome_trace(self):
+        instrumentation.enable()
+        with instrumentation.span("outer", size=3):
+            with instrumentation.span("inner"):
+                pass
+        instrumentation.count("items", 3)
+        events = instrumentation.chrome_trace()["traceEvents"]
+        self.assertEqual([event["ph"] for event in events], ["X", "X", "C"])
+        inner, outer, counter = events
+        self.assertEqual(outer["name"], "outer")
+        self.assertEqual(outer["args"], {"size": 3})
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+        self.assertEqual(counter["args"], {"items": 3})
+
+    def test_write(self):
+        instrumentation.enable()
+        with instrumentation.span("block"):
+            instrumentation.count("items")
+        with tempfile.TemporaryDirectory() as directory:
+            trace_file = path.join(directory, "trace.json")
+            instrumentation.write(trace_file)
+            with open(trace_file, encoding="utf-8") as f_in:
+                self.assertEqual(json.load(f_in), instrumentation.chrome_trace())
+            summary_file = path.join(directory, "summary.txt")
+            instrumentation.write(summary_file)
+            with open(summary_file, encoding="utf-8") as f_in:
+                summary = f_in.read()
+        self.assertIn("block", summary)
+        self.assertIn("items", summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
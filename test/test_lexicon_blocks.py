@@ -0,0 +1,67 @@
+# test/test_lexicon_blocks.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from lexicon_blocks import *
+
+WORDS = sorted(["", "pa", "pata", "patak", "pati", "t͡ʃa", "t͡ʃima", "ɯ", "mana" * 60])
+
+
+class TestLexiconBlocks(unittest.TestCase):
+    def test_round_trip(self):
+        # Test every codec, with blocks that split the words unevenly
+        for codec in CODECS:
+            data = encode_blocks(WORDS, codec, block_size=4)
+            lexicon = BlockLexicon(data)
+            self.assertEqual(len(lexicon), len(WORDS))
+            self.assertEqual(list(lexicon), WORDS)
+            self.assertEqual(decode_blocks(data), WORDS)
+            self.assertEqual([lexicon[i] for i in reversed(range(len(WORDS)))], WORDS[::-1])
+            self.assertEqual(lexicon[-1], WORDS[-1])
+            self.assertEqual(lexicon[3:6], WORDS[3:6])
+            with self.assertRaises(IndexError):
+                lexicon[len(WORDS)]
+
+    def test_index(self):
+        # Test finding words, including the first word of a block and missing words
+        lexicon = BlockLexicon(encode_blocks(WORDS, block_size=2))
+        for i, word in enumerate(WORDS):
+            self.assertEqual(lexicon.index(word), i)
+        self.assertIn("pati", lexicon)
+        self.assertNotIn("pat", lexicon)
+        self.assertNotIn("zzz", lexicon)
+        with self.assertRaises(ValueError):
+            lexicon.index("a")
+
+    def test_offset(self):
+        # Test reading blocks out of a larger buffer, such as a memory-mapped file
+        data = encode_blocks(WORDS, "lzma", block_size=3)
+        lexicon = BlockLexicon(b"header" + data + b"trailer", 6, len(data))
+        self.assertEqual(list(lexicon), WORDS)
+        self.assertEqual(lexicon.index("t͡ʃima"), WORDS.index("t͡ʃima"))
+
+    def test_compression(self):
+        # Test that front coding and compression make a large lexicon much smaller
+        words = sorted(f"{a}{b}{c}{d}" for a in "ptkmn" for b in "aiu" for c in "ptkmnsl" for d in "aiueo")
+        plain = sum(1 + len(word.encode()) for word in words)
+        self.assertLess(len(encode_blocks(words)) * 3, plain)
+
+    def test_invalid(self):
+        # Test unsorted words, unknown codecs and truncated blocks
+        with self.assertRaises(ValueError):
+            encode_blocks(["pa", "ka"])
+        with self.assertRaises(ValueError):
+            encode_blocks(["pa", "pb", "ka"], block_size=2)
+        with self.assertRaises(ValueError):
+            encode_blocks(WORDS, "bz2")
+        with self.assertRaises(ValueError):
+            BlockLexicon(encode_blocks(WORDS)[:-5])
+
+
+if __name__ == '__main__':
+    unittest.main()
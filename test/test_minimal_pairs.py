@@ -0,0 +1,86 @@
+# test/test_minimal_pairs.py
+
+import unittest
+from itertools import combinations
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from minimal_pairs import MinimalPairFinder
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from wordweaver_project import WordweaverProject
+
+from ipapy import UNICODE_TO_IPA
+
+LEXICON = {
+    "pata": "bread",
+    "bata": "water",
+    "pada": "stone",
+    "pa.ta": "to bake",
+    "pat": "hand",
+    "t͡ʃa": "tea",
+    "ta": "this",
+}
+
+
+class TestMinimalPairFinder(unittest.TestCase):
+    def setUp(self):
+        self.project = WordweaverProject("Test", pulmonic_inventory=["p", "b", "t", "d", "t͡ʃ"],
+                                         vowel_inventory=["a"], lexicon=dict(LEXICON))
+        self.finder = MinimalPairFinder.from_project(self.project)
+
+    def test_minimal_pairs(self):
+        # Test finding pairs that differ in one phoneme, treating t͡ʃ as one phoneme
+        pairs = {(frozenset((a, b)), i) for a, b, i in self.finder.minimal_pairs(self.project.lexicon)}
+        self.assertEqual(pairs, {
+            (frozenset(("pata", "bata")), 0),
+            (frozenset(("pa.ta", "bata")), 0),
+            (frozenset(("pata", "pada")), 2),
+            (frozenset(("pa.ta", "pada")), 2),
+            (frozenset(("t͡ʃa", "ta")), 0),
+        })
+
+    def test_contrast(self):
+        # Test restricting pairs to one contrast, in the order of the contrast
+        pairs = list(self.finder.minimal_pairs(self.project.lexicon, ("b", "p")))
+        self.assertEqual(sorted(pairs), [("bata", "pa.ta", 0), ("bata", "pata", 0)])
+        self.assertEqual(list(self.finder.minimal_pairs(self.project.lexicon, ("t", "d"))),
+                         [("pata", "pada", 2), ("pa.ta", "pada", 2)])
+        with self.assertRaises(ValueError):
+            list(self.finder.minimal_pairs(self.project.lexicon, ("p", "p")))
+
+    def test_homophones(self):
+        # Test entries that only differ in separators
+        self.assertEqual(list(self.finder.homophones(self.project.lexicon)), [("pata", "pa.ta")])
+
+    def test_phoneme_words(self):
+        # Test a lexicon stored as PhonemeWords
+        project = WordweaverProject("Test", pulmonic_inventory=["p", "b", "t", "d", "t͡ʃ"], vowel_inventory=["a"])
+        project.lexicon = {project.alphabet.encode(word): gloss for word, gloss in LEXICON.items()}
+        finder = MinimalPairFinder.from_project(project)
+        self.assertEqual(list(finder.minimal_pairs(project.lexicon)),
+                         list(self.finder.minimal_pairs(self.project.lexicon)))
+        self.assertEqual(list(finder.minimal_pairs(project.lexicon, ("b", "p"))),
+                         list(self.finder.minimal_pairs(self.project.lexicon, ("b", "p"))))
+        self.assertEqual(list(finder.homophones(project.lexicon)), [("pata", "pa.ta")])
+
+    def test_generated_lexicon(self):
+        # Test against comparing every pair of words
+        generator = PhonemeGenerator([UNICODE_TO_IPA[s] for s in "ptkmaiu"], (
+            PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+            PhonemeConstraint(Phonemes.VOWEL),
+        ), rng=2)
+        words = list(dict.fromkeys(generator.iter_words(3, 300)))
+        finder = MinimalPairFinder()
+        expected = set()
+        for a, b in combinations(words, 2):
+            ids_a, ids_b = finder.encode(a), finder.encode(b)
+            if len(ids_a) == len(ids_b) and sum(x != y for x, y in zip(ids_a, ids_b)) == 1:
+                expected.add(frozenset((a, b)))
+        self.assertEqual({frozenset((a, b)) for a, b, _ in finder.minimal_pairs(words)}, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
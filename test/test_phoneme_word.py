@@ -0,0 +1,66 @@
+# test/test_phoneme_word.py
+
+import pickle
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phoneme_word import PhonemeAlphabet, PhonemeWord, PhonemeWordList
+
+from ipapy.ipachar import IPAChar
+
+SYMBOLS = ["p", "t", "t͡s", "a", "i", "ə"]
+
+
+class TestPhonemeWord(unittest.TestCase):
+    def test_encode(self):
+        # Test encoding strings by longest match and rendering them again
+        alphabet = PhonemeAlphabet(SYMBOLS)
+        word = alphabet.encode("pa.t͡sə", separator=".")
+        self.assertEqual(word.ids, bytes([0, 3, 2, 5]))
+        self.assertEqual(word.syllable_starts, (2,))
+        self.assertEqual(word.syllable_count, 2)
+        self.assertEqual(len(word), 4)
+        self.assertEqual(str(word), "pat͡sə")
+        self.assertEqual(alphabet.decode(word, "."), "pa.t͡sə")
+
+    def test_encode_syllables(self):
+        # Test encoding syllables of phonemes as made by PhonemeGenerator
+        alphabet = PhonemeAlphabet.from_inventory([IPAChar("plosive bilabial voiceless consonant"),
+                                                   IPAChar("open front unrounded vowel")])
+        word = alphabet.encode([[IPAChar("plosive bilabial voiceless consonant"), "a"], ["a"]])
+        self.assertEqual(alphabet.decode(word, "-"), "pa-a")
+
+    def test_unknown_symbols(self):
+        # Test that unknown characters are added to the alphabet
+        alphabet = PhonemeAlphabet(SYMBOLS)
+        self.assertEqual(str(alphabet.encode("pok")), "pok")
+        self.assertEqual(alphabet.symbols[-2:], ["o", "k"])
+        with self.assertRaises(ValueError):
+            PhonemeAlphabet(chr(i) for i in range(257))
+
+    def test_hash_and_order(self):
+        # Test that words are hashable and ordered by their phoneme ids
+        alphabet = PhonemeAlphabet(SYMBOLS)
+        words = [alphabet.encode(w) for w in ["ta", "pa", "pi", "pa"]]
+        self.assertEqual(len(set(words)), 3)
+        self.assertEqual([str(w) for w in sorted(words)], ["pa", "pa", "pi", "ta"])
+        self.assertEqual(pickle.loads(pickle.dumps(words[0])), words[0])
+
+    def test_word_list(self):
+        # Test packing words into a single buffer
+        alphabet = PhonemeAlphabet(SYMBOLS)
+        words = PhonemeWordList(alphabet, ["pata", "t͡si", alphabet.encode("ə")])
+        self.assertEqual(len(words), 3)
+        self.assertEqual([str(w) for w in words], ["pata", "t͡si", "ə"])
+        self.assertEqual(words[-1], alphabet.encode("ə"))
+        self.assertEqual(words.nbytes, 10 + 8 * 4)
+        with self.assertRaises(IndexError):
+            words[3]
+
+
+if __name__ == "__main__":
+    unittest.main()
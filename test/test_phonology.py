@@ -1,13 +1,16 @@
 # test/test_phonology.py
 
+import subprocess
 import unittest
+from itertools import islice
 
 # Add the parent directory to the path so we can import the module we want to test
 import sys
 from os import path
 sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
 
-from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator, index_phoneme_types
+from phonology_random import shard_ranges
 
 from ipapy.ipachar import IPAChar
 
@@ -42,6 +45,22 @@ SECONDARY_CONSTRAINTS = (
     PhonemeConstraint(Phonemes.CONSONANT, optional=True),
 )
 
+class TestPhonemes(unittest.TestCase):
+    def test_lazy_import(self):
+        # Test that importing the module does not load the ipapy database
+        script = "import sys; sys.path.append(sys.argv[1]); import phonology; print('ipapy' in sys.modules)"
+        src = path.abspath(path.join(path.dirname(__file__), '../src'))
+        result = subprocess.run([sys.executable, "-c", script, src], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_phoneme_tables(self):
+        # Test that the lazy tables behave like the lists of IPA characters
+        self.assertTrue(all(char.is_consonant for char in Phonemes.CONSONANT.value))
+        self.assertTrue(all(char.is_vowel for char in Phonemes.VOWEL.value))
+        self.assertEqual(len(Phonemes.VOWEL.value), len(list(Phonemes.VOWEL.value)))
+        self.assertNotEqual(Phonemes.CONSONANT.value, Phonemes.VOWEL.value)
+
+
 class TestPhonemeGenerator(unittest.TestCase):
     def test_init(self):
         # Test the init method
@@ -60,6 +79,15 @@ class TestPhonemeGenerator(unittest.TestCase):
         with self.assertRaises(ValueError):
             phoneme_generator = PhonemeGenerator([], (), (PhonemeConstraint(Phonemes.VOWEL),))
     
+    def test_sort_inventory_index(self):
+        # Test that the classification index matches a scan of every enum member
+        phoneme_generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        expected = {t: [p for p in INVENTORY for char in t.value if char.is_equivalent(p)] for t in Phonemes}
+        self.assertEqual(phoneme_generator.inventory, expected)
+        index = index_phoneme_types()
+        self.assertEqual(index[INVENTORY[0].canonical_representation], (Phonemes.CONSONANT,))
+        self.assertEqual(index[INVENTORY[3].canonical_representation], (Phonemes.VOWEL,))
+
     def test_generate_syllables(self):
         # Test the generate_syllables method
         phoneme_generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
@@ -70,5 +98,70 @@ class TestPhonemeGenerator(unittest.TestCase):
             # so this produces a range of 2 to 3 inclusive
             self.assertIn(len(syllable), range(2, 4))
 
+    def test_plan(self):
+        # Test that the plan follows the constraints and is compiled again after constrain
+        phoneme_generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        plan = phoneme_generator.plan
+        self.assertIs(phoneme_generator.plan, plan)
+        for i in range(4):
+            slots = plan.syllable(i)
+            constraint = phoneme_generator.syllable_constraint(i)
+            self.assertEqual(len(slots), len(constraint))
+            for (pool, symbols, probability, table), cons in zip(slots, constraint):
+                self.assertIs(pool, phoneme_generator.inventory[cons.phoneme])
+                self.assertEqual(symbols, tuple(p.unicode_repr for p in pool))
+                self.assertEqual(probability, cons.probability if cons.optional else None)
+        phoneme_generator.constrain(CONSTRAINTS)
+        self.assertIsNot(phoneme_generator.plan, plan)
+        self.assertEqual(phoneme_generator.plan.render([[INVENTORY[0], INVENTORY[3]], [INVENTORY[4]]], '.'),
+                         "ba.i")
+
+    def test_weights(self):
+        # Test that weighted phonemes are generated more often
+        phoneme_generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=42, weights={"a": 4})
+        self.assertEqual(list(phoneme_generator.alias_tables), [Phonemes.VOWEL])
+        vowels = [syllable[1].unicode_repr for syllable in phoneme_generator.generate_syllables(10000)]
+        self.assertAlmostEqual(vowels.count("a") / len(vowels), 0.8, delta=0.02)
+
+    def test_probability(self):
+        # Test that optional phonemes are generated with the constraint's probability
+        constraints = (PhonemeConstraint(Phonemes.CONSONANT, optional=True, probability=0.9),
+                       PhonemeConstraint(Phonemes.VOWEL))
+        syllables = PhonemeGenerator(INVENTORY, constraints, rng=42).generate_syllables(10000)
+        self.assertAlmostEqual(sum(len(s) == 2 for s in syllables) / 10000, 0.9, delta=0.02)
+        with self.assertRaises(ValueError):
+            PhonemeConstraint(Phonemes.VOWEL, optional=True, probability=1.5)
+
+    def test_seed(self):
+        # Test that generators with the same seed generate the same words
+        words = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42).generate_random(3, 20)
+        same_words = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42).generate_random(3, 20)
+        self.assertEqual(words, same_words)
+
+    def test_generate_range(self):
+        # Test that sharded generation matches generation in a single call
+        phoneme_generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42)
+        words = phoneme_generator.generate_random(2, 3000)
+        stream = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42).rng.spawn()[0]
+        shards = [phoneme_generator.generate_range(2, start, stop, stream) for start, stop in shard_ranges(3000, 7)]
+        self.assertEqual(words, [word for shard in shards for word in shard])
+
+    def test_generate_words(self):
+        # Test that encoded words match the generated words
+        words = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42).generate_random(3, 1500)
+        encoded = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42).generate_words(3, 1500)
+        self.assertEqual(len(encoded), 1500)
+        self.assertEqual([encoded.alphabet.decode(w, '.') for w in encoded],
+                         ['.'.join(''.join(p.unicode_repr for p in s) for s in word) for word in words])
+
+    def test_iter_words(self):
+        # Test that streamed words match the rendered generated words
+        words = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42).generate_random(3, 2000)
+        phoneme_generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42)
+        self.assertEqual(list(phoneme_generator.iter_words(3, 2000, '-')),
+                         ['-'.join(''.join(p.unicode_repr for p in s) for s in word) for word in words])
+        # Without a count the words never run out
+        self.assertEqual(len(list(islice(phoneme_generator.iter_words(3), 5000))), 5000)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+# test/test_phonology_batch.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from phonology_batch import np, WordBatch
+
+from ipapy.ipachar import IPAChar
+
+CONSONANTS = [
+    IPAChar("plosive bilabial voiceless consonant"),
+    IPAChar("plosive alveolar voiceless consonant"),
+]
+
+VOWELS = [
+    IPAChar("open front unrounded vowel"),
+    IPAChar("close front unrounded vowel"),
+]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT),
+    PhonemeConstraint(Phonemes.VOWEL),
+)
+
+SECONDARY_CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestWordBatch(unittest.TestCase):
+    def test_generate_batch(self):
+        # Test the shape of a generated batch and the rendered words
+        generator = PhonemeGenerator(CONSONANTS + VOWELS, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        batch = generator.generate_batch(3, 200, rng=1)
+        self.assertIsInstance(batch, WordBatch)
+        self.assertEqual(len(batch), 200)
+        self.assertEqual(batch.ids.shape, (200, 6))
+        self.assertEqual(batch.syllable_starts, (0, 2, 4))
+        consonants = {c.unicode_repr for c in CONSONANTS}
+        vowels = {v.unicode_repr for v in VOWELS}
+        for word in batch.to_strings('.'):
+            first, *rest = word.split('.')
+            self.assertIn(first[0], consonants)
+            self.assertIn(first[1], vowels)
+            for syllable in rest:
+                # the last constraint repeats with an optional coda
+                self.assertIn(len(syllable), range(1, 3))
+                self.assertIn(syllable[0], vowels)
+
+    def test_optional_slots(self):
+        # Test that optional slots are generated about half the time
+        generator = PhonemeGenerator(CONSONANTS + VOWELS, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        batch = generator.generate_batch(2, 10000, rng=2)
+        self.assertTrue(batch.mask[:, :3].all())
+        self.assertAlmostEqual(batch.mask[:, 3].mean(), 0.5, delta=0.05)
+
+    def test_weights(self):
+        # Test that weighted phonemes and slot probabilities are used by the batch
+        constraints = (PhonemeConstraint(Phonemes.CONSONANT, optional=True, probability=0.2),
+                       PhonemeConstraint(Phonemes.VOWEL))
+        generator = PhonemeGenerator(CONSONANTS + VOWELS, constraints, weights={"i": 3})
+        batch = generator.generate_batch(1, 10000, rng=4)
+        self.assertAlmostEqual(batch.mask[:, 0].mean(), 0.2, delta=0.02)
+        vowels = [batch.symbols[i] for i in batch.ids[:, 1]]
+        self.assertAlmostEqual(vowels.count("i") / len(vowels), 0.75, delta=0.02)
+
+    def test_seed(self):
+        # Test that the same seed gives the same batch
+        generator = PhonemeGenerator(CONSONANTS + VOWELS, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        self.assertEqual(generator.generate_batch(4, 50, rng=3).to_strings(),
+                         generator.generate_batch(4, 50, rng=3).to_strings())
+
+    def test_generate_batch_invalid(self):
+        # Test that a constrained phoneme type must be in the inventory
+        generator = PhonemeGenerator(VOWELS, (PhonemeConstraint(Phonemes.VOWEL),))
+        generator.constrain(CONSTRAINTS)
+        with self.assertRaises(ValueError):
+            generator.generate_batch(1, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
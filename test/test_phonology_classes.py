@@ -0,0 +1,70 @@
+# test/test_phonology_classes.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology_classes import NaturalClassIndex
+from phonology_features import natural_classes
+from wordweaver_project import WordweaverProject
+
+from ipapy import UNICODE_TO_IPA
+
+
+class TestNaturalClassIndex(unittest.TestCase):
+    def test_queries(self):
+        # Test conjunctions and disjunctions of feature values
+        index = NaturalClassIndex(UNICODE_TO_IPA[symbol] for symbol in ["p", "t", "b", "m", "a", "y", "u"])
+        self.assertEqual(index.select("voiceless", "plosive"), ["p", "t"])
+        self.assertEqual(index.select("front", "rounded"), ["y"])
+        self.assertEqual(index.phonemes(index.any_of("bilabial", "back")), ["p", "b", "m", "u"])
+        self.assertEqual(index.phonemes(index.all_of("consonant") & ~index.any_of("plosive")), ["m"])
+        self.assertEqual(index.select(), ["p", "t", "b", "m", "a", "y", "u"])
+        self.assertEqual(index.select("plosive", "uvular"), [])
+        self.assertEqual(index.any_of(), 0)
+        self.assertIn("voiced", index.features("b"))
+
+    def test_chart_names(self):
+        # Test that classes are spelled as in phonology_features, accepting ipapy names too
+        symbols = ["p", "b", "m", "t", "s", "ʃ", "f", "ɾ", "a", "ɪ"]
+        index = NaturalClassIndex(UNICODE_TO_IPA[symbol] for symbol in symbols)
+        classes = natural_classes()
+        for name in ("bi-labial", "post-alveolar", "fricative", "tap", "medial-close-mid"):
+            self.assertEqual(index.select(name), [s for s in symbols if s in classes[name]], name)
+        self.assertEqual(index.select("bilabial"), index.select("bi-labial"))
+        self.assertEqual(index.select("sibilant-fricative"), ["s", "ʃ"])
+        self.assertIn("bi-labial", index.features("p"))
+        self.assertNotIn("bilabial", index.features("p"))
+
+    def test_remove(self):
+        # Test that removed phonemes leave every class and their bits are reused
+        index = NaturalClassIndex(UNICODE_TO_IPA[symbol] for symbol in ["p", "t", "a"])
+        bit = index.bits["t"]
+        index.remove("t")
+        self.assertNotIn("t", index)
+        self.assertEqual(index.select("plosive"), ["p"])
+        self.assertEqual(index.add(UNICODE_TO_IPA["k"]), bit)
+        self.assertEqual(index.select("plosive"), ["p", "k"])
+        with self.assertRaises(KeyError):
+            index.remove("t")
+
+    def test_project(self):
+        # Test that the project's index follows changes to its inventories
+        project = WordweaverProject("Test", pulmonic_inventory=["p", "t", "m"], vowel_inventory=["a", "i"])
+        index = project.natural_classes
+        self.assertEqual(index.select("vowel"), ["a", "i"])
+        project.vowel_inventory = ["a", "y"]
+        self.assertIs(project.natural_classes, index)
+        self.assertEqual(index.select("vowel"), ["a", "y"])
+        self.assertEqual(index.select("front", "rounded"), ["y"])
+        project.pulmonic_inventory = ["p", "k"]
+        self.assertEqual(index.select("voiceless", "plosive"), ["p", "k"])
+        self.assertEqual(index.select("nasal"), [])
+        self.assertEqual(len(index), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# test/test_phonology_features.py
+
+import unittest
+import tempfile
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology_features import np, CACHE_FILE, COLUMNS, NONE, FeatureMatrix, feature_matrix
+from phonology_features import natural_classes
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFeatureMatrix(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.matrix = FeatureMatrix.build()
+
+    def test_build(self):
+        # Test the rows of a consonant and a vowel
+        matrix = self.matrix
+        self.assertEqual(matrix.matrix.shape, (len(matrix), len(COLUMNS)))
+        self.assertEqual(matrix.features("p"), {"manner": "plosive", "place": "bi-labial", "voicing": "voiceless"})
+        self.assertEqual(matrix.features("u"), {"place": "back", "voicing": "voiced", "height": "close",
+                                                "rounding": "rounded"})
+        self.assertEqual(matrix.column("height")[matrix.ids["p"]], NONE)
+        self.assertEqual(matrix.symbols[matrix.ids["a"]], "a")
+
+    def test_natural_class(self):
+        # Test that natural classes match the ones built by walking the tables
+        matrix = self.matrix
+        classes = natural_classes()
+        for name in ("plosive", "front", "voiceless", "rounded", "consonant", "vowel"):
+            self.assertEqual(matrix.natural_class(name), list(classes[name]))
+        self.assertEqual(matrix.natural_class("voiceless", "bi-labial", "plosive"), ["p"])
+        self.assertEqual(matrix.natural_class("voiceless", "bilabial", "plosive"), ["p"])
+        self.assertEqual(matrix.natural_class("vowel", "front", "rounded"), ["y", "ʏ", "ø", "œ", "ɶ"])
+        with self.assertRaises(KeyError):
+            matrix.mask("sonorant")
+
+    def test_distances(self):
+        # Test counting differing features
+        matrix = self.matrix
+        distances = matrix.distances("p")
+        self.assertEqual(distances[matrix.ids["p"]], 0)
+        self.assertEqual(distances[matrix.ids["t"]], 1)
+        self.assertEqual(distances[matrix.ids["m"]], 2)
+        pairs = matrix.distance_matrix(["p", "t", "a"])
+        self.assertEqual(pairs.tolist(), [[0, 1, 5], [1, 0, 5], [5, 5, 0]])
+
+    def test_sort(self):
+        # Test sorting in chart order
+        matrix = self.matrix
+        self.assertEqual(matrix.sort(["k", "m", "p", "t"]), ["p", "t", "k", "m"])
+        self.assertEqual(matrix.sort(["k", "m", "p", "t"], by=("place", "manner")), ["p", "m", "t", "k"])
+        self.assertEqual(matrix.sort(["a", "u", "i"], by=("height",)), ["u", "i", "a"])
+
+    def test_cache(self):
+        # Test that the matrix is written to the cache and loaded from it
+        with tempfile.TemporaryDirectory() as parent:
+            # The cache directory does not exist yet on a new machine
+            directory = path.join(parent, "cache", "Wordweaver")
+            built = feature_matrix(directory)
+            self.assertTrue(path.exists(path.join(directory, CACHE_FILE)))
+            loaded = FeatureMatrix.load(path.join(directory, CACHE_FILE))
+            self.assertEqual(loaded.symbols, built.symbols)
+            self.assertEqual(loaded.values, built.values)
+            self.assertTrue((loaded.matrix == built.matrix).all())
+            # A cache written from other tables is rejected
+            with open(path.join(directory, CACHE_FILE), "r+b") as f_out:
+                f_out.write(b"0" * 40)
+            with self.assertRaises(ValueError):
+                FeatureMatrix.load(path.join(directory, CACHE_FILE))
+            # So is one written with another version of ipapy
+            built.save(path.join(directory, CACHE_FILE))
+            with mock.patch("phonology_features._ipapy_version", return_value="ipapy-0.0.1.dist-info"):
+                with self.assertRaises(ValueError):
+                    FeatureMatrix.load(path.join(directory, CACHE_FILE))
+        feature_matrix.cache_clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
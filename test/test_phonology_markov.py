@@ -0,0 +1,76 @@
+# test/test_phonology_markov.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phoneme_word import PhonemeAlphabet
+from phonology_markov import MarkovGenerator
+from wordweaver_project import WordweaverProject
+
+LEXICON = ["pata", "tapa", "papi", "tipa", "pita"]
+
+
+class TestMarkovGenerator(unittest.TestCase):
+    def test_train(self):
+        # Test the trained transition probabilities
+        generator = MarkovGenerator(1)
+        generator.train(LEXICON)
+        self.assertEqual(generator.words, 5)
+        self.assertAlmostEqual(generator.probability([], "p"), 0.6)
+        self.assertAlmostEqual(generator.probability(["p"], "a"), 4 / 6)
+        self.assertAlmostEqual(generator.probability(["a"], None), 4 / 7)
+        self.assertEqual(generator.probability(["x"], "a"), 0.0)
+
+    def test_incremental_training(self):
+        # Test that training in parts gives the same model as training at once
+        generator = MarkovGenerator(2)
+        generator.train(LEXICON[:2])
+        generator.generate(10)
+        generator.train(LEXICON[2:] + ["t͡sa"])
+        trained = MarkovGenerator(2)
+        trained.train(LEXICON + ["t͡sa"])
+        for context in ([], ["p"], ["t", "a"], ["p", "i"]):
+            for phoneme in ("p", "t", "a", "i", "t͡", None):
+                self.assertAlmostEqual(generator.probability(context, phoneme), trained.probability(context, phoneme))
+
+    def test_generate(self):
+        # Test that every generated bigram was seen in training
+        generator = MarkovGenerator(2, rng=4)
+        generator.train(LEXICON)
+        words = generator.generate(1000)
+        self.assertEqual(len(words), 1000)
+        for word in words:
+            phonemes = list(word) + [None]
+            for i in range(len(phonemes)):
+                self.assertGreater(generator.probability(phonemes[max(0, i - 2):i], phonemes[i]), 0)
+
+    def test_seed(self):
+        # Test that generators with the same seed generate the same words
+        first = MarkovGenerator(2, rng=4)
+        first.train(LEXICON)
+        second = MarkovGenerator(2, rng=4)
+        second.train(LEXICON)
+        self.assertEqual(first.generate(50), second.generate(50))
+
+    def test_untrained(self):
+        with self.assertRaises(ValueError):
+            MarkovGenerator().generate(1)
+        with self.assertRaises(ValueError):
+            MarkovGenerator(0)
+
+    def test_from_project(self):
+        # Test training on a project lexicon with multi-character phonemes
+        project = WordweaverProject('Test Project', pulmonic_inventory=["t͡s", "p"], vowel_inventory=["a"],
+                                    lexicon={"t͡sapa": "", "pat͡sa": ""})
+        generator = MarkovGenerator.from_project(project, 1, rng=2)
+        self.assertEqual(generator.alphabet, PhonemeAlphabet(["t͡s", "p", "a"]))
+        self.assertAlmostEqual(generator.probability(["t͡s"], "a"), 1.0)
+        self.assertEqual(generator.max_length, 255)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# test/test_phonology_parallel.py
+
+import tempfile
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeConstraint, GeneratorSpec, PhonemeGenerator
+from phonology_parallel import generate_parallel
+
+from ipapy.ipachar import IPAChar
+
+INVENTORY = [
+    IPAChar("plosive bilabial voiceless consonant"),
+    IPAChar("plosive alveolar voiceless consonant"),
+    IPAChar("open front unrounded vowel"),
+    IPAChar("close front unrounded vowel"),
+]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.VOWEL),
+)
+
+SECONDARY_CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT),
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+
+def render(words: list, separator: str = '') -> list[str]:
+    return [separator.join(''.join(p.unicode_repr for p in syllable) for syllable in word) for word in words]
+
+
+class TestGeneratorSpec(unittest.TestCase):
+    def test_generate_range(self):
+        # Test that a spec draws the same words as the generator it describes
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=5)
+        spec = GeneratorSpec.from_generator(generator, 3)
+        stream = generator.rng.spawn()[0]
+        self.assertEqual(spec.generate_range(1000, 1100, stream, '.'),
+                         render(generator.generate_range(3, 1000, 1100, stream), '.'))
+
+    def test_generate_parallel(self):
+        # Test that parallel generation matches single-process generation
+        words = render(PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=5).generate_random(3, 5000))
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=5)
+        self.assertEqual(generate_parallel(generator, 3, 5000, workers=2), words)
+
+    def test_generate_parallel_sink(self):
+        # Test that workers write their shards to files
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=5)
+        words = generator.generate_parallel(2, 3000, workers=2)
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=5)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = generator.generate_parallel(2, 3000, workers=2, sink=path.join(directory, "words.{shard}.txt"))
+            self.assertEqual(len(paths), 3)
+            lines = []
+            for shard_path in paths:
+                with open(shard_path, encoding='utf-8') as f_in:
+                    lines.extend(f_in.read().splitlines())
+        self.assertEqual(lines, words)
+
+    def test_generate_parallel_sink_invalid(self):
+        # Test that a sink path without {shard} is rejected before any file is written
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=5)
+        with tempfile.TemporaryDirectory() as directory:
+            sink = path.join(directory, "words.txt")
+            for workers in (1, 2):
+                with self.assertRaises(ValueError):
+                    generator.generate_parallel(2, 3000, workers=workers, sink=sink)
+            self.assertFalse(path.exists(sink))
+
+
+if __name__ == "__main__":
+    unittest.main()
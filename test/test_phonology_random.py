@@ -0,0 +1,78 @@
+# test/test_phonology_random.py
+
+import pickle
+import random
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology_random import AliasTable, RandomStream, as_stream, shard_ranges
+
+
+class TestRandomStream(unittest.TestCase):
+    def test_seed(self):
+        # Test that streams with the same seed produce the same numbers
+        self.assertEqual([RandomStream(7).random() for _ in range(3)],
+                         [RandomStream(7).random() for _ in range(3)])
+        self.assertNotEqual(RandomStream(7).random(), RandomStream(8).random())
+
+    def test_child(self):
+        # Test that child streams are reproducible and independent of their parent
+        stream = RandomStream(7)
+        self.assertEqual(stream.child(0).random(), RandomStream(7).child(0).random())
+        self.assertNotEqual(stream.child(0).random(), stream.child(1).random())
+        self.assertNotEqual(stream.child(0).random(), RandomStream(7).random())
+
+    def test_spawn(self):
+        # Test that spawned streams are new children in order
+        stream = RandomStream(7)
+        first, second = stream.spawn(2)
+        third, = stream.spawn()
+        self.assertEqual([first.key, second.key, third.key], [(0,), (1,), (2,)])
+
+    def test_pickle(self):
+        # Test that a stream keeps its position and children when pickled
+        stream = RandomStream(7)
+        stream.random()
+        stream.spawn()
+        copy = pickle.loads(pickle.dumps(stream))
+        self.assertEqual(copy.random(), stream.random())
+        self.assertEqual(copy.spawn()[0].key, stream.spawn()[0].key)
+
+    def test_as_stream(self):
+        # Test converting seeds and generators into streams
+        stream = RandomStream(7)
+        self.assertIs(as_stream(stream), stream)
+        self.assertEqual(as_stream(7).random(), RandomStream(7).random())
+        self.assertIsInstance(as_stream(random.Random(7)), RandomStream)
+        self.assertIsInstance(as_stream(None), RandomStream)
+        with self.assertRaises(TypeError):
+            as_stream("seed")
+
+    def test_alias_table(self):
+        # Test that indices are drawn in proportion to their weight
+        table = AliasTable([1, 0, 3])
+        stream = RandomStream(7)
+        counts = [0, 0, 0]
+        for _ in range(20000):
+            counts[table.sample(stream)] += 1
+        self.assertEqual(counts[1], 0)
+        self.assertAlmostEqual(counts[2] / counts[0], 3, delta=0.2)
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0])
+        with self.assertRaises(ValueError):
+            AliasTable([1, -1])
+
+    def test_shard_ranges(self):
+        # Test splitting a count into contiguous ranges
+        self.assertEqual(shard_ranges(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(shard_ranges(2, 3), [(0, 1), (1, 2), (2, 2)])
+        with self.assertRaises(ValueError):
+            shard_ranges(10, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
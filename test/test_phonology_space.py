@@ -0,0 +1,108 @@
+# test/test_phonology_space.py
+
+import unittest
+from itertools import product
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from phonology_random import RandomPermutation, RandomStream
+
+from ipapy.ipachar import IPAChar
+
+INVENTORY = [
+    IPAChar("plosive bilabial voiceless consonant"),
+    IPAChar("plosive alveolar voiceless consonant"),
+    IPAChar("nasal bilabial voiced consonant"),
+    IPAChar("open front unrounded vowel"),
+    IPAChar("close front unrounded vowel"),
+]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+SECONDARY_CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT),
+    PhonemeConstraint(Phonemes.VOWEL),
+    # two optional slots of the same type produce the same shapes twice
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+
+def enumerate_words(generator, syllable_length):
+    # Brute force every choice of every slot
+    words = set()
+    syllables = []
+    for i in range(syllable_length):
+        options = [[[p] for p in generator.inventory[c.phoneme]] + ([[]] if c.optional else [])
+                   for c in generator.syllable_constraint(i)]
+        syllables.append({tuple(p.unicode_repr for part in choice for p in part) for choice in product(*options)})
+    for word in product(*syllables):
+        words.add(word)
+    return words
+
+
+class TestWordSpace(unittest.TestCase):
+    def test_count(self):
+        # Test that the exact count matches brute force enumeration
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        for syllable_length in range(1, 4):
+            space = generator.word_space(syllable_length)
+            self.assertEqual(space.count, len(enumerate_words(generator, syllable_length)))
+
+    def test_rank_unrank(self):
+        # Test that unranking visits every word once and ranking inverts it
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        space = generator.word_space(2)
+        words = [space.unrank(rank) for rank in range(space.count)]
+        self.assertEqual({tuple(tuple(p.unicode_repr for p in s) for s in w) for w in words},
+                         enumerate_words(generator, 2))
+        self.assertEqual([space.rank(word) for word in words], list(range(space.count)))
+        self.assertEqual(space.rank([["p", "a"], ["m", "i", "t"]]), space.rank(space.unrank(space.rank([["p", "a"], ["m", "i", "t"]]))))
+        self.assertNotIn([["a", "p"], ["a"]], space)
+        with self.assertRaises(IndexError):
+            space.unrank(space.count)
+
+    def test_big_count(self):
+        # Test that large spaces are counted and ranked without enumeration
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        space = generator.word_space(40)
+        self.assertGreater(space.count, 2 ** 64)
+        rank = space.count - 12345
+        self.assertEqual(space.rank(space.unrank(rank)), rank)
+
+    def test_generated_words(self):
+        # Test that generated words are in the space
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS, rng=42)
+        space = generator.word_space(3)
+        for word in generator.generate_random(3, 200):
+            self.assertIn(word, space)
+
+    def test_sample(self):
+        # Test that sampling the whole space gives every word exactly once
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, SECONDARY_CONSTRAINTS)
+        space = generator.word_space(2)
+        words = list(space.sample(separator='.', rng=3))
+        self.assertEqual(len(words), space.count)
+        self.assertEqual(len(set(words)), space.count)
+        self.assertEqual(words[:10], list(space.sample(10, '.', rng=3)))
+        with self.assertRaises(ValueError):
+            next(space.sample(space.count + 1))
+
+    def test_permutation(self):
+        # Test that permutations of any size are bijections
+        for n in (0, 1, 2, 5, 64, 1000):
+            self.assertEqual(sorted(RandomPermutation(n, RandomStream(n))), list(range(n)))
+        permutation = RandomPermutation(10 ** 30, RandomStream(1))
+        self.assertEqual(len({permutation[i] for i in range(1000)}), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
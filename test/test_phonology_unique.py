@@ -0,0 +1,64 @@
+# test/test_phonology_unique.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from phonology_unique import BloomFilter, max_distinct_words
+
+from ipapy.ipachar import IPAChar
+
+INVENTORY = [
+    IPAChar("plosive bilabial voiceless consonant"),
+    IPAChar("plosive alveolar voiceless consonant"),
+    IPAChar("open front unrounded vowel"),
+    IPAChar("close front unrounded vowel"),
+]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.VOWEL),
+)
+
+
+class TestGenerateUnique(unittest.TestCase):
+    def test_generate_unique(self):
+        # Test that words are distinct and leave out excluded words
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=3)
+        words, stats = generator.generate_unique(3, 100, exclude={"papapa": "", "iii": ""}, separator='.')
+        self.assertEqual(len(words), 100)
+        keys = [word.replace('.', '') for word in words]
+        self.assertEqual(len(set(keys)), 100)
+        self.assertNotIn("papapa", keys)
+        self.assertEqual(stats.accepted, 100)
+        self.assertEqual(stats.attempts, stats.accepted + stats.rejected)
+        self.assertFalse(stats.exhausted)
+
+    def test_exhausted(self):
+        # Test that generation stops once the constraint space is used up
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=3)
+        self.assertEqual(max_distinct_words(generator, 1), 6)
+        words, stats = generator.generate_unique(1, 10)
+        self.assertEqual(sorted(words), ["a", "i", "pa", "pi", "ta", "ti"])
+        self.assertTrue(stats.exhausted)
+        words, stats = generator.generate_unique(1, 10, exclude=["pa"], patience=50)
+        self.assertEqual(len(words), 5)
+        self.assertTrue(stats.exhausted)
+        self.assertGreater(stats.rejection_rate, 0)
+
+    def test_bloom_filter(self):
+        # Test that added words are always found and others rarely are
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"word{i}")
+        self.assertTrue(all(f"word{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
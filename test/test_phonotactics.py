@@ -0,0 +1,191 @@
+# test/test_phonotactics.py
+
+import os
+import tempfile
+import unittest
+from itertools import islice
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phoneme_word import PhonemeAlphabet
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from phonology_batch import generate_batch, np
+from phonology_parallel import generate_parallel
+from phonology_random import RandomStream
+from phonotactics import PhonotacticRule, PhonotacticFilter
+
+from ipapy.ipachar import IPAChar
+
+INVENTORY = [
+    IPAChar("plosive bilabial voiceless consonant"),
+    IPAChar("plosive alveolar voiceless consonant"),
+    IPAChar("open front unrounded vowel"),
+    IPAChar("close front unrounded vowel"),
+]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT),
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+RULES = [
+    PhonotacticRule.geminates("geminate", ["p", "t"]),
+    PhonotacticRule.sequence("no tp", "t", "p"),
+    PhonotacticRule.sequence("no high vowel after p", "p", ["i", "u"]),
+]
+
+
+class TestPhonotacticFilter(unittest.TestCase):
+    def test_rules(self):
+        # Test expanding rules into forbidden sequences
+        self.assertEqual(RULES[0].patterns, (("p", "p"), ("t", "t")))
+        self.assertEqual(RULES[2].patterns, (("p", "i"), ("p", "u")))
+        with self.assertRaises(ValueError):
+            PhonotacticRule("empty", [()])
+
+    def test_check(self):
+        # Test that words are rejected by the first rule that matches
+        phonotactics = PhonotacticFilter(RULES)
+        self.assertTrue(phonotactics.check("pata"))
+        self.assertFalse(phonotactics.check("pat.pa", '.'))
+        self.assertFalse(phonotactics.check("tappa"))
+        self.assertFalse(phonotactics.check("api"))
+        self.assertFalse(phonotactics.check("tatpi"))
+        self.assertEqual(phonotactics.checked, 5)
+        self.assertEqual(phonotactics.rejections, {"geminate": 1, "no tp": 2, "no high vowel after p": 1})
+        # the counts of another filter, in rule order, can be added
+        other = PhonotacticFilter(RULES)
+        other.add_counts(phonotactics.checked, phonotactics.rejection_counts)
+        self.assertEqual(other.rejection_counts, [1, 2, 1])
+        self.assertEqual(other.rejections, phonotactics.rejections)
+        other.rejection_counts.append(1)
+        self.assertEqual(other.rejection_counts, [1, 2, 1])
+        phonotactics.reset()
+        self.assertEqual(phonotactics.rejected, 0)
+
+    def test_alphabet_unchanged(self):
+        # Test that phonemes of the rules are not added to the alphabet passed in
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rules=RULES)
+        symbols = list(generator.alphabet.symbols)
+        self.assertIsNotNone(generator.phonotactics)
+        self.assertEqual(generator.alphabet.symbols, symbols)
+        self.assertNotIn("u", generator.alphabet)
+        # a pattern left out is used once the alphabet has its phonemes
+        alphabet = PhonemeAlphabet(["p", "a"])
+        phonotactics = PhonotacticFilter(RULES, alphabet)
+        self.assertEqual(alphabet.symbols, ["p", "a"])
+        self.assertTrue(phonotactics.check("pa"))
+        self.assertFalse(phonotactics.check("pu"))
+        self.assertEqual(phonotactics.rejections["no high vowel after p"], 1)
+        # without an alphabet, the filter has its own with the phonemes of the rules
+        self.assertEqual(PhonotacticFilter(RULES).alphabet.symbols, ["p", "t", "i", "u"])
+
+    def test_overlapping_patterns(self):
+        # Test that a pattern inside a longer pattern is found through failure links
+        phonotactics = PhonotacticFilter([PhonotacticRule("long", [("a", "p", "i", "t")]),
+                                          PhonotacticRule("short", [("p", "i", "p")])])
+        self.assertIs(phonotactics.match(phonotactics.alphabet.tokenize("apipa")), phonotactics.rules[1])
+        self.assertIs(phonotactics.match(phonotactics.alphabet.tokenize("apit")), phonotactics.rules[0])
+        self.assertIsNone(phonotactics.match(phonotactics.alphabet.tokenize("apia")))
+
+    def test_multicharacter_phonemes(self):
+        # Test that phonemes are matched as whole phonemes, not characters
+        alphabet = PhonemeAlphabet(["t", "s", "t͡s", "a"])
+        phonotactics = PhonotacticFilter([PhonotacticRule.sequence("no ts", "t", "s")], alphabet)
+        self.assertTrue(phonotactics.check("at͡sa"))
+        self.assertFalse(phonotactics.check("atsa"))
+        self.assertTrue(phonotactics.check(alphabet.encode("t͡sat͡s")))
+
+    def test_generator_rules(self):
+        # Test that the generator leaves out words that break its rules
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=42, rules=RULES)
+        words = list(generator.iter_words(3, 2000, '.'))
+        self.assertEqual(len(words), 2000)
+        for word in words:
+            joined = word.replace('.', '')
+            for sequence in ("pp", "tt", "tp", "pi"):
+                self.assertNotIn(sequence, joined)
+        self.assertGreater(generator.phonotactics.rejected, 0)
+        self.assertEqual(sum(generator.phonotactics.rejections.values()), generator.phonotactics.rejected)
+        # Without rules every word is kept
+        generator.rules = None
+        self.assertIsNone(generator.phonotactics)
+        self.assertEqual(len(list(islice(generator.iter_words(3), 100))), 100)
+
+    def assertAllowed(self, words):
+        for word in words:
+            for sequence in ("pp", "tt", "tp", "pi"):
+                self.assertNotIn(sequence, word)
+
+    def test_generator_methods_rules(self):
+        # Test that every generation method leaves out words that break the rules
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=42, rules=RULES)
+        words = generator.generate_random(3, 2000)
+        self.assertEqual(len(words), 2000)
+        self.assertAllowed(generator.plan.render(word) for word in words)
+        stream = RandomStream(7)
+        words = generator.generate_range(3, 0, 2000, stream)
+        self.assertLess(len(words), 2000)
+        self.assertAllowed(generator.plan.render(word) for word in words)
+        # joining ranges gives the same words
+        self.assertEqual(generator.generate_range(3, 0, 700, stream) + generator.generate_range(3, 700, 2000, stream),
+                         words)
+        words = generator.generate_words(3, 2000)
+        self.assertEqual(len(words), 2000)
+        self.assertAllowed(str(word) for word in words)
+        # the parallel words are the ones generate_random keeps from the same stream
+        stream = RandomStream(7)
+        rejected = generator.phonotactics.rejected
+        words = generate_parallel(generator, 3, 3000, workers=2, stream=stream)
+        self.assertEqual(len(words), 3000)
+        self.assertAllowed(words)
+        self.assertGreater(generator.phonotactics.rejected, rejected)
+        kept = [word for words in generator._generate_kept(3, 3000, stream, 3000) for word in words]
+        self.assertEqual(words, [generator.plan.render(word) for word in kept])
+
+    def test_generator_rules_forbid_everything(self):
+        # Test that generators give up when the rules reject every word
+        generator = PhonemeGenerator(INVENTORY[:1] + INVENTORY[2:3], CONSTRAINTS[:2], rng=42,
+                                     rules=[PhonotacticRule.sequence("no pa", "p", "a")])
+        for generate in (lambda: generator.generate_random(1, 3), lambda: generator.generate_words(1, 3),
+                         lambda: list(generator.iter_words(1, 3)),
+                         lambda: generate_parallel(generator, 1, 3, workers=1)):
+            with self.assertRaisesRegex(ValueError, "no pa"):
+                generate()
+        if np is not None:
+            with self.assertRaisesRegex(ValueError, "no pa"):
+                generate_batch(generator, 1, 3)
+
+    def test_generate_parallel_sink_rules(self):
+        # Test that shard files hold exactly the kept words when a range draws too many;
+        # a strict rule makes the generator draw more words after a range keeps none
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=42, rules=[PhonotacticRule.sequence("no a", "a")])
+        for seed in range(5):
+            words = generate_parallel(generator, 3, 2, workers=2, stream=RandomStream(seed))
+            self.assertEqual(len(words), 2)
+            with tempfile.TemporaryDirectory() as directory:
+                paths = generate_parallel(generator, 3, 2, workers=2, stream=RandomStream(seed),
+                                          sink=path.join(directory, "words.{shard}.txt"))
+                lines = []
+                for shard_path in paths:
+                    with open(shard_path, encoding='utf-8') as f_in:
+                        lines.extend(f_in.read().splitlines())
+                self.assertEqual(sorted(os.listdir(directory)), sorted(path.basename(p) for p in paths))
+            self.assertEqual(lines, words)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_generate_batch_rules(self):
+        # Test that batches leave out words that break the rules
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=42, rules=RULES)
+        batch = generate_batch(generator, 3, 2000, rng=1)
+        self.assertEqual(len(batch), 2000)
+        self.assertAllowed(batch.to_strings())
+        self.assertGreater(generator.phonotactics.rejected, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+# test/test_project_reader.py
+
+import os
+import unittest
+import tempfile
+from importlib.util import find_spec
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from project_reader import ProjectReader, index_path
+from wordweaver_project import WordweaverProject
+
+WORDS = ["pata", "t͡ʃima", "aku", "", "mana" * 60]
+
+
+class TestProjectReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = path.join(self.directory.name, "test.wwproj")
+        self.index_file = path.join(self.directory.name, "cache", "test.idx")
+        self.project = WordweaverProject("Test Project", self.file, ["p", "t", "k"], ["ǀ"], ["a", "i", "u"],
+                                         dict.fromkeys(WORDS, ""), {"p": 2.0})
+        self.project.save(compression=None)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_header(self):
+        # Test that the header is read without the lexicon
+        with ProjectReader(self.file, self.index_file) as reader:
+            self.assertEqual(reader.name, "Test Project")
+            self.assertEqual(reader.pulmonic_inventory, ["p", "t", "k"])
+            self.assertEqual(reader.non_pulmonic_inventory, ["ǀ"])
+            self.assertEqual(reader.vowel_inventory, ["a", "i", "u"])
+            self.assertEqual(len(reader), len(WORDS))
+            self.assertFalse(path.exists(self.index_file))
+
+    def test_random_access(self):
+        # Test reading words by position, which builds and then reuses the index
+        with ProjectReader(self.file, self.index_file) as reader:
+            self.assertEqual(reader.lexicon[1], "t͡ʃima")
+            self.assertEqual(reader.lexicon[-1], "mana" * 60)
+            self.assertEqual(reader.lexicon[1:3], ["t͡ʃima", "aku"])
+            self.assertEqual(list(reader.lexicon), WORDS)
+            with self.assertRaises(IndexError):
+                reader.lexicon[len(WORDS)]
+        self.assertTrue(path.exists(self.index_file))
+        # nothing is written next to the project
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["cache", "test.wwproj"])
+        with ProjectReader(self.file, self.index_file) as reader:
+            self.assertEqual([reader.word(i) for i in range(len(WORDS))], WORDS)
+            self.assertEqual(reader.phoneme_weights, {"p": 2.0})
+
+    def test_index_not_written(self):
+        # Test that a failed write of the index leaves no temporary file behind
+        with mock.patch("os.replace", side_effect=OSError):
+            with ProjectReader(self.file, self.index_file) as reader:
+                self.assertEqual(reader.lexicon[1], "t͡ʃima")
+        self.assertFalse(path.exists(self.index_file))
+        self.assertEqual(os.listdir(path.dirname(self.index_file)), [])
+
+    def test_stale_index(self):
+        # Test that an index of an older version of the file is rebuilt
+        with ProjectReader(self.file, self.index_file) as reader:
+            reader.lexicon[0]
+        self.project.lexicon = dict.fromkeys(["ku"] + WORDS, "")
+        self.project.save(compression=None)
+        with ProjectReader(self.file, self.index_file) as reader:
+            self.assertEqual(reader.lexicon[0], "ku")
+            self.assertEqual(reader.lexicon[-1], "mana" * 60)
+
+    def test_to_project(self):
+        # Test decoding the whole project
+        with ProjectReader(self.file, self.index_file) as reader:
+            project = reader.to_project()
+        expected = WordweaverProject.from_file(self.file)
+        self.assertEqual(project.name, expected.name)
+        self.assertEqual(project.lexicon, expected.lexicon)
+        self.assertEqual(project.phoneme_weights, expected.phoneme_weights)
+        self.assertEqual(project.inventory, expected.inventory)
+
+    def test_blocks(self):
+        # Test reading a lexicon saved in compressed blocks, which needs no offset index
+        self.project.lexicon = {"ku": "", **dict.fromkeys(WORDS, "a gloss")}
+        self.project.save()
+        with ProjectReader(self.file, self.index_file) as reader:
+            self.assertIsNotNone(reader.blocks)
+            self.assertEqual(len(reader), len(WORDS) + 1)
+            self.assertEqual(list(reader.lexicon), sorted(["ku"] + WORDS))
+            self.assertEqual(reader.lexicon[-1], "t͡ʃima")
+            self.assertEqual(reader.lexicon.index("mana" * 60), 3)
+            self.assertEqual(reader.phoneme_weights, {"p": 2.0})
+            self.assertEqual(list(reader.to_project().lexicon.items()), list(self.project.lexicon.items()))
+        self.assertFalse(path.exists(self.index_file))
+
+    def test_version_1(self):
+        # Test reading a version 1 file, which has 1 byte word lengths and no weights
+        self.project.phoneme_weights = {}
+        self.project.save(version=1)
+        with ProjectReader(self.file, self.index_file) as reader:
+            self.assertEqual(reader.version, 1)
+            self.assertEqual(reader.name, "Test Project")
+            self.assertEqual(reader.vowel_inventory, ["a", "i", "u"])
+            self.assertEqual(reader.lexicon[-1], "mana" * 60)
+            self.assertEqual(list(reader.lexicon), WORDS)
+            self.assertEqual(reader.phoneme_weights, {})
+
+    @unittest.skipIf(find_spec("platformdirs") is None, "platformdirs is not installed")
+    def test_default_index(self):
+        # Test that the offset index defaults to the user cache directory
+        cache = path.join(self.directory.name, "user cache")
+        with mock.patch("platformdirs.user_cache_path", return_value=cache):
+            self.assertEqual(path.dirname(path.dirname(index_path(self.file))), cache)
+            self.assertEqual(index_path(self.file), index_path(path.relpath(self.file)))
+            with ProjectReader(self.file) as reader:
+                self.assertEqual(reader.lexicon[1], "t͡ʃima")
+                self.assertTrue(path.exists(reader.index_file))
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["test.wwproj", "user cache"])
+
+    def test_corrupt(self):
+        # Test that sections are checked against their checksums when they are decoded
+        with open(self.file, "r+b") as f_in:
+            data = f_in.read()
+            # flip a byte of the name, then of the last word of the lexicon
+            f_in.seek(data.index(b"Test Project"))
+            f_in.write(b"t")
+        # the map of a file that fails to open is closed
+        with mock.patch.object(ProjectReader, "close", autospec=True, side_effect=ProjectReader.close) as close:
+            with self.assertRaisesRegex(ValueError, "NAME"):
+                ProjectReader(self.file, self.index_file)
+        close.assert_called_once()
+        self.assertTrue(close.call_args.args[0]._map.closed)
+        self.project.save(compression=None)
+        with open(self.file, "r+b") as f_in:
+            data = f_in.read()
+            f_in.seek(data.rindex(b"mana"))
+            f_in.write(b"n")
+        with ProjectReader(self.file, self.index_file) as reader:
+            self.assertEqual(reader.name, "Test Project")
+            with self.assertRaisesRegex(ValueError, "LEXI"):
+                reader.lexicon[0]
+            with self.assertRaisesRegex(ValueError, "LEXI"):
+                list(reader.iter_words())
+        self.assertFalse(path.exists(self.index_file))
+        self.project.save()
+        with open(self.file, "r+b") as f_in:
+            f_in.seek(-1, os.SEEK_END)
+            last = f_in.read(1)
+            f_in.seek(-1, os.SEEK_END)
+            f_in.write(bytes([last[0] ^ 0xFF]))
+        with self.assertRaises(ValueError):
+            with ProjectReader(self.file, self.index_file) as reader:
+                reader.to_project()
+
+    def test_invalid(self):
+        # Test files that are not projects
+        other = path.join(self.directory.name, "other.wwproj")
+        with open(other, "wb") as f_out:
+            f_out.write(b"not a project")
+        with self.assertRaises(ValueError):
+            ProjectReader(other)
+        with self.assertRaises(FileNotFoundError):
+            ProjectReader(path.join(self.directory.name, "missing.wwproj"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# test/test_project_sections.py
+
+import unittest
+import tempfile
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from project_sections import *
+
+
+class TestProjectSections(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file = path.join(self.directory.name, "test.wwproj")
+        with open(self.file, "wb") as f_out:
+            write_sections(f_out, [
+                (SECTION_NAME, encode_name("Test Project")),
+                (SECTION_LEXICON, encode_lexicon(["pata", "t͡ʃima", ""])),
+                (SECTION_GENERATOR, encode_generator({"phoneme_weights": {"p": 2.0}})),
+            ])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read(self):
+        # Test reading sections out of order, and missing sections
+        with SectionFile(self.file) as sections:
+            self.assertEqual(sections.version, 2)
+            self.assertIn(SECTION_LEXICON, sections)
+            self.assertNotIn(SECTION_GLOSSES, sections)
+            self.assertEqual(decode_generator(sections.read(SECTION_GENERATOR)), {"phoneme_weights": {"p": 2.0}})
+            self.assertEqual(decode_name(sections.read(SECTION_NAME)), "Test Project")
+            self.assertEqual(decode_lexicon(sections.read(SECTION_LEXICON)), ["pata", "t͡ʃima", ""])
+            self.assertIsNone(sections.read(SECTION_GLOSSES))
+
+    def test_checksum(self):
+        # Test that a corrupt section is found, without failing the others
+        with open(self.file, "r+b") as f_out:
+            f_out.seek(-3, 2)
+            f_out.write(b"!")
+        with SectionFile(self.file) as sections:
+            self.assertEqual(decode_name(sections.read(SECTION_NAME)), "Test Project")
+            with self.assertRaises(ValueError):
+                sections.read(SECTION_GENERATOR)
+            self.assertIsNotNone(sections.read(SECTION_GENERATOR, verify=False))
+
+    def test_encodings(self):
+        # Test the sections that are larger than version 1 files allow
+        inventories = [["p"] * 300, [], ["a", "ɯ"]]
+        self.assertEqual(decode_inventories(encode_inventories(inventories)), inventories)
+        words = ["a" * 1000, "ba"]
+        self.assertEqual(decode_lexicon(encode_lexicon(words)), words)
+        glosses = ["", "a gloss\nwith lines" * 10000]
+        self.assertEqual(decode_glosses(encode_glosses(glosses)), glosses)
+        positions = [2, 0, 70000, 1]
+        self.assertEqual(decode_order(encode_order(positions)), positions)
+        self.assertEqual(decode_order(encode_order([])), [])
+
+    def test_invalid(self):
+        # Test files that are not version 2 projects
+        other = path.join(self.directory.name, "other.wwproj")
+        for data in (b"not a project", b"\x87\xaf\xfa\x87\x01\x00\x0c", b"\x87\xaf\xfa\x87\x02\x00\x05"):
+            with open(other, "wb") as f_out:
+                f_out.write(data)
+            with self.assertRaises(ValueError):
+                SectionFile(other)
+
+
+if __name__ == '__main__':
+    unittest.main()
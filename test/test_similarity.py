@@ -0,0 +1,85 @@
+# test/test_similarity.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from similarity import PhonemeDistance, SimilarityIndex
+from wordweaver_project import WordweaverProject
+
+from ipapy import UNICODE_TO_IPA
+
+CONSONANTS = ["p", "t", "k", "b", "m", "s"]
+VOWELS = ["a", "i", "u"]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT),
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        generator = PhonemeGenerator([UNICODE_TO_IPA[s] for s in CONSONANTS + VOWELS], CONSTRAINTS, rng=5)
+        self.words = list(dict.fromkeys(generator.iter_words(2, 1000)))
+        self.project = WordweaverProject("Test", pulmonic_inventory=CONSONANTS, vowel_inventory=VOWELS,
+                                         lexicon=dict.fromkeys(self.words, ""))
+        self.index = SimilarityIndex.from_project(self.project)
+        self.distance = self.index.distance
+
+    def test_distance(self):
+        # Test that substitutions of similar phonemes cost less
+        distance = self.distance
+        self.assertEqual(distance("pata", "pata"), 0)
+        self.assertEqual(distance("pata", "pa"), 2)
+        self.assertLess(distance("pata", "bata"), distance("pata", "mata"))
+        self.assertEqual(distance("pata", "aata"), 1)
+        self.assertEqual(distance("pata", "bata"), distance("bata", "pata"))
+        # Plain edit distance over phonemes without features
+        self.assertEqual(PhonemeDistance()("kat", "kit"), 1)
+
+    def test_within(self):
+        # Test range queries against a linear scan
+        for query in ["pata", "kim", "sabu", self.words[0]]:
+            expected = sorted((d, w) for w in self.words if (d := self.distance(query, w)) <= 1)
+            self.assertEqual(self.index.within(query, 1), expected)
+        self.assertEqual(self.index.within(self.words[0], 0), [(0, self.words[0])])
+
+    def test_nearest(self):
+        # Test that the nearest words are as near as a linear scan finds
+        for query in ["pata", "kim", self.words[1]]:
+            nearest = self.index.nearest(query, 5, exclude_self=True)
+            expected = sorted((self.distance(query, w), w) for w in self.words if w != query)[:5]
+            self.assertEqual([d for d, _ in nearest], [d for d, _ in expected])
+        self.assertEqual(SimilarityIndex().nearest("pata"), [])
+
+    def test_from_project_phoneme_words(self):
+        # Test indexing a lexicon stored as PhonemeWords
+        project = WordweaverProject("Test", pulmonic_inventory=CONSONANTS, vowel_inventory=VOWELS)
+        project.lexicon = {project.alphabet.encode(word): "" for word in self.words}
+        index = SimilarityIndex.from_project(project)
+        self.assertEqual(len(index), len(self.words))
+        self.assertIn(self.words[0], index)
+        self.assertEqual(index.within(self.words[0], 1), self.index.within(self.words[0], 1))
+
+    def test_add(self):
+        # Test incremental insertion and screening candidates
+        index = SimilarityIndex(self.distance, ["pata"])
+        self.assertTrue(index.add("kimu"))
+        self.assertFalse(index.add("pata"))
+        self.assertEqual(len(index), 2)
+        results = index.screen(["bata", "sus", "sus", "sut"], 0.5, add=True)
+        self.assertEqual([w for _, w in results["bata"]], ["pata"])
+        self.assertEqual(results["sus"], [])
+        self.assertEqual([w for _, w in results["sut"]], ["sus"])
+        self.assertIn("sus", index)
+        self.assertNotIn("bata", index)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# test/test_sound_change.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from sound_change import SoundChange, SoundChangeCascade, natural_classes, phoneme_features
+
+WORDS = ["apa", "ata", "kape", "askt", "si", "at͡ʃa", "pa"]
+
+
+class TestSoundChange(unittest.TestCase):
+    def test_natural_classes(self):
+        # Test the features built from phonology_const
+        self.assertEqual(phoneme_features()["p"], {"manner": "plosive", "place": "bi-labial", "voicing": "voiceless"})
+        self.assertEqual(phoneme_features()["u"], {"height": "close", "backness": "back", "rounding": "rounded"})
+        self.assertIn("b", natural_classes()["voiced"])
+        # t and d sit in different cells of the chart but share a place
+        self.assertEqual(phoneme_features()["d"], {"manner": "plosive", "place": "alveolar", "voicing": "voiced"})
+        self.assertEqual(phoneme_features()["n"]["place"], "alveolar")
+        self.assertEqual(phoneme_features()["ʃ"]["place"], "post-alveolar")
+        self.assertNotIn("a", natural_classes()["consonant"])
+
+    def test_rules(self):
+        # Test single rules with environments, classes and features
+        self.assertEqual(SoundChangeCascade(["p > f / V_V"]).apply(WORDS)[:3], ["afa", "ata", "kafe"])
+        with self.assertWarns(UserWarning):
+            self.assertEqual(SoundChangeCascade(["[voiceless plosive] > [voiced] / V_V"]).apply(["apa", "aka", "ata"]),
+                             ["aba", "aga", "ada"])
+        self.assertEqual(SoundChangeCascade(["[plosive voiced] > [voiceless]"]).apply(["adag"]), ["atak"])
+        # ipapy names of features are accepted too
+        self.assertEqual(SoundChangeCascade(["[bilabial plosive] > [alveolar]"]).apply(["apab"]), ["atad"])
+        self.assertEqual(SoundChangeCascade(["e > ∅ / _#"]).apply(["kape", "eke"]), ["kap", "ek"])
+        self.assertEqual(SoundChangeCascade(["∅ > ə / C_C#"]).apply(["askt"]), ["askət"])
+        self.assertEqual(SoundChangeCascade(["{s,z} > {ʃ,ʒ} / _i"]).apply(["si", "zi", "sa"]), ["ʃi", "ʒi", "sa"])
+        self.assertEqual(SoundChangeCascade(["t͡ʃ > ts"]).apply(["at͡ʃa"]), ["atsa"])
+        self.assertEqual(SoundChangeCascade(["N > m / _p"], classes={"N": ["n", "ŋ"]}).apply(["anpa", "aŋpa"]),
+                         ["ampa", "ampa"])
+
+    def test_simultaneous(self):
+        # Test that environments are matched against the input of the rule
+        self.assertEqual(SoundChangeCascade(["a > e / _a"]).apply(["aaa"]), ["eea"])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SoundChange("p f")
+        with self.assertRaises(ValueError):
+            SoundChange("p > f / V")
+        with self.assertRaises(ValueError):
+            SoundChange("[wobbly] > f")
+        with self.assertRaises(ValueError):
+            SoundChange("{p,t} > {f} / _#")
+        # ʔ has no voiced counterpart, so the rule warns that it is kept
+        with self.assertWarnsRegex(UserWarning, "ʔ"):
+            cascade = SoundChangeCascade(["[plosive voiceless] > [voiced] / V_V"])
+        self.assertEqual(cascade.apply(["aʔa", "atak"]), ["aʔa", "adak"])
+
+    def test_incremental(self):
+        # Test that only the rules after an edit are applied again
+        cascade = SoundChangeCascade(["p > f / V_V", "a > e / _#", "k > x", "s > h / #_"])
+        words = cascade.apply(WORDS)
+        self.assertEqual(cascade.applied, 4)
+        cascade.apply(WORDS)
+        self.assertEqual(cascade.applied, 0)
+        cascade[2] = "k > g"
+        edited = cascade.apply(WORDS)
+        self.assertEqual(cascade.applied, 2)
+        self.assertEqual(edited, SoundChangeCascade(["p > f / V_V", "a > e / _#", "k > g", "s > h / #_"]).apply(WORDS))
+        self.assertNotEqual(edited, words)
+        cascade.insert(0, "a > o")
+        cascade.apply(WORDS)
+        self.assertEqual(cascade.applied, 5)
+        del cascade[0]
+        self.assertEqual(cascade.apply(WORDS), edited)
+        self.assertEqual(cascade.stage(-1), WORDS)
+        self.assertEqual(cascade.stage(0)[0], "afa")
+        # Different words start over
+        cascade.apply(WORDS[:2])
+        self.assertEqual(cascade.applied, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# test/test_syllabifier.py
+
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from phonology import Phonemes, PhonemeConstraint, PhonemeGenerator
+from syllabifier import Syllabifier
+from wordweaver_project import WordweaverProject
+
+from ipapy.ipachar import IPAChar
+
+INVENTORY = [
+    IPAChar("plosive bilabial voiceless consonant"),
+    IPAChar("plosive alveolar voiceless consonant"),
+    IPAChar("alveolar trill voiced consonant"),
+    IPAChar("open front unrounded vowel"),
+    IPAChar("close front unrounded vowel"),
+]
+
+CONSTRAINTS = (
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+    PhonemeConstraint(Phonemes.VOWEL),
+    PhonemeConstraint(Phonemes.CONSONANT, optional=True),
+)
+
+
+class TestSyllabifier(unittest.TestCase):
+    def test_failure(self):
+        # Test finding the first phoneme that breaks the templates
+        syllabifier = PhonemeGenerator(INVENTORY, CONSTRAINTS).syllabifier
+        self.assertIsNone(syllabifier.failure("pata"))
+        self.assertIsNone(syllabifier.failure("a"))
+        self.assertEqual(syllabifier.failure("ptra"), 2)
+        self.assertEqual(syllabifier.failure("patr"), 4)
+        self.assertEqual(syllabifier.failure("xa"), 0)
+        self.assertEqual(syllabifier.failure(""), 0)
+        self.assertTrue(syllabifier.conforms("aia"))
+        self.assertFalse(syllabifier.conforms("p"))
+
+    def test_secondary_constraints(self):
+        # Test that later syllables follow the secondary constraints
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS[1:3], (PhonemeConstraint(Phonemes.VOWEL),))
+        syllabifier = generator.syllabifier
+        self.assertEqual(syllabifier.syllabify("paii"), ["pa", "i", "i"])
+        self.assertEqual(syllabifier.failure("papa"), 2)
+        # Changing the constraints recompiles the automaton
+        generator.secondary_constraints = []
+        self.assertIsNot(generator.syllabifier, syllabifier)
+        self.assertIsNone(generator.syllabifier.failure("papa"))
+
+    def test_syllabify(self):
+        # Test that consonants between vowels start the following syllable
+        syllabifier = Syllabifier([CONSTRAINTS], PhonemeGenerator(INVENTORY).inventory)
+        self.assertEqual(syllabifier.syllabify("pata"), ["pa", "ta"])
+        self.assertEqual(syllabifier.syllabify("patra"), ["pa", "tra"])
+        self.assertEqual(syllabifier.syllabify("aptira"), ["a", "pti", "ra"])
+        with self.assertRaises(ValueError):
+            syllabifier.syllabify("ptra")
+
+    def test_generated_words(self):
+        # Test that every generated word conforms and splits back into its syllables
+        generator = PhonemeGenerator(INVENTORY, CONSTRAINTS, rng=3)
+        syllabifier = generator.syllabifier
+        for word in generator.iter_words(3, 500, separator='.'):
+            syllables = word.split('.')
+            self.assertTrue(syllabifier.conforms(''.join(syllables)))
+            self.assertEqual(len(syllabifier.syllabify(''.join(syllables))), 3)
+
+    def test_check_lexicon(self):
+        # Test reporting the words of a lexicon that do not conform
+        project = WordweaverProject("Test", pulmonic_inventory=["p", "t", "r"], vowel_inventory=["a", "i"],
+                                    lexicon={"pata": "", "tri": "", "ptra": "", "atr": "", "pax": ""})
+        syllabifier = PhonemeGenerator(INVENTORY, CONSTRAINTS).syllabifier
+        self.assertEqual(syllabifier.check_lexicon(project.lexicon), {"ptra": 2, "atr": 3, "pax": 2})
+        # a lexicon stored as PhonemeWords
+        project.lexicon = {project.alphabet.encode(word): "" for word in project.lexicon}
+        self.assertEqual(syllabifier.check_lexicon(project.lexicon), {"ptra": 2, "atr": 3, "pax": 2})
+        self.assertEqual(syllabifier.syllabify(project.alphabet.encode("pata")), ["pa", "ta"])
+
+
+if __name__ == '__main__':
+    unittest.main()
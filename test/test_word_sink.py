@@ -0,0 +1,56 @@
+# test/test_word_sink.py
+
+import io
+import tempfile
+import unittest
+
+# Add the parent directory to the path so we can import the module we want to test
+import sys
+from os import path
+sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
+
+from word_sink import NEWLINE, LENGTH_PREFIXED, WordSink, read_words
+
+WORDS = ["pata", "tiɸa", "", "əŋ.ka"]
+
+
+class TestWordSink(unittest.TestCase):
+    def test_newline(self):
+        # Test writing newline framed words to a stream
+        stream = io.BytesIO()
+        with WordSink(stream, NEWLINE) as sink:
+            self.assertEqual(sink.write_all(WORDS), 4)
+        self.assertEqual(stream.getvalue(), "pata\ntiɸa\n\nəŋ.ka\n".encode())
+        stream.seek(0)
+        self.assertEqual(list(read_words(stream, NEWLINE)), WORDS)
+
+    def test_length_prefixed(self):
+        # Test writing length prefixed words to a file
+        with tempfile.TemporaryDirectory() as directory:
+            file = path.join(directory, "words.bin")
+            with WordSink(file, LENGTH_PREFIXED, buffer_size=8) as sink:
+                sink.write_all(WORDS)
+            with open(file, 'rb') as f_in:
+                self.assertEqual(f_in.read(6), b"\x00\x04pata")
+            self.assertEqual(list(read_words(file, LENGTH_PREFIXED)), WORDS)
+
+    def test_buffer(self):
+        # Test that words are only written once the buffer is full
+        stream = io.BytesIO()
+        sink = WordSink(stream, buffer_size=10)
+        sink.write("pata")
+        self.assertEqual(stream.getvalue(), b"")
+        sink.write("tiki")
+        self.assertEqual(stream.getvalue(), b"pata\ntiki\n")
+        sink.close()
+
+    def test_invalid(self):
+        # Test invalid framing and word lengths
+        with self.assertRaises(ValueError):
+            WordSink(io.BytesIO(), "csv")
+        with self.assertRaises(ValueError):
+            WordSink(io.BytesIO(), LENGTH_PREFIXED).write("a" * 0x10000)
+
+
+if __name__ == "__main__":
+    unittest.main()
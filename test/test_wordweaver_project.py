@@ -1,5 +1,6 @@
 # test/wordweaver_project.py
 
+import subprocess
 import unittest
 
 # Add the parent directory to the path so we can import the module we want to test
@@ -9,6 +10,7 @@ sys.path.append(path.abspath(path.join(path.dirname(__file__), '../src')))
 
 from ipapy.ipachar import IPAChar
 
+from phoneme_word import PhonemeWord
 from wordweaver_project import WordweaverProject
 
 PULMONIC_INVENTORY_STR = [
@@ -44,6 +46,13 @@ VOWEL_INVENTORY = [
 LEXICON = {}
 
 class TestWordweaverProject(unittest.TestCase):
+    def test_lazy_import(self):
+        # Test that importing the module does not load the ipapy database
+        script = "import sys; sys.path.append(sys.argv[1]); import wordweaver_project; print('ipapy' in sys.modules)"
+        src = path.abspath(path.join(path.dirname(__file__), '../src'))
+        result = subprocess.run([sys.executable, "-c", script, src], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
     def test_init(self):
         # Test the init method
         project = WordweaverProject('Test Project',
@@ -98,7 +107,7 @@ class TestWordweaverProject(unittest.TestCase):
         project = WordweaverProject('Test Project',
                                     file='test_project.wwproj', pulmonic_inventory=PULMONIC_INVENTORY, non_pulmonic_inventory=NON_PULMONIC_INVENTORY, vowel_inventory=VOWEL_INVENTORY,
                                     lexicon=LEXICON)
-        project.save()
+        project.save(version=1)
         with open('test_project.wwproj', 'rb') as f:
             data = f.read()
         self.assertEqual(data, b"\x87\xaf\xfa\x87\x01"\
@@ -122,5 +131,110 @@ class TestWordweaverProject(unittest.TestCase):
         self.assertEqual(str(project.vowel_inventory), str(VOWEL_INVENTORY))
         self.assertEqual(project.lexicon, LEXICON)
 
+    def test_from_file_lexicon(self):
+        # Test that lexicon words, including encoded words, are saved and loaded
+        project = WordweaverProject('Test Project',
+                                    file='test_project.wwproj', pulmonic_inventory=PULMONIC_INVENTORY_STR,
+                                    vowel_inventory=VOWEL_INVENTORY_STR, lexicon={"pa": "", "dəɯ": ""})
+        project.lexicon[project.alphabet.encode("nun")] = ""
+        project.save()
+        project = WordweaverProject.from_file('test_project.wwproj')
+        self.assertEqual(project.lexicon, {"pa": "", "dəɯ": "", "nun": ""})
+
+    def test_encode_lexicon(self):
+        # Test packing the lexicon with the project's alphabet
+        project = WordweaverProject('Test Project', pulmonic_inventory=PULMONIC_INVENTORY_STR,
+                                    vowel_inventory=VOWEL_INVENTORY_STR, lexicon={"pa": "", "dəɯ": ""})
+        words = project.encode_lexicon()
+        self.assertEqual(words.alphabet.symbols, PULMONIC_INVENTORY_STR + VOWEL_INVENTORY_STR)
+        self.assertEqual(words[1], PhonemeWord.from_ids([1, 5, 7]))
+        self.assertEqual([str(word) for word in words], ["pa", "dəɯ"])
+
+    def test_from_file_weights(self):
+        # Test that phoneme weights are saved with full precision, however many there are
+        weights = {"a": 0.1, "ə": 2.5, **{chr(0x100 + i): i / 3 for i in range(300)}}
+        project = WordweaverProject('Test Project', file='test_project.wwproj',
+                                    vowel_inventory=VOWEL_INVENTORY_STR, phoneme_weights=weights)
+        project.save()
+        project = WordweaverProject.from_file('test_project.wwproj')
+        self.assertEqual(project.phoneme_weights, weights)
+
+    def test_save_weights_invalid(self):
+        # Test that weights that cannot be saved are rejected before the file is truncated
+        project = WordweaverProject('Test Project', file='test_project.wwproj', vowel_inventory=VOWEL_INVENTORY_STR)
+        project.save()
+        with open('test_project.wwproj', 'rb') as f:
+            data = f.read()
+        project.phoneme_weights = {"a": 2.5}
+        with self.assertRaises(ValueError):
+            project.save(version=1)
+        project.phoneme_weights = {"a": float("nan")}
+        with self.assertRaises(ValueError):
+            project.save()
+        with open('test_project.wwproj', 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_save_sections(self):
+        # Test that version 2 files start with a section directory
+        project = WordweaverProject('Test Project', file='test_project.wwproj',
+                                    vowel_inventory=VOWEL_INVENTORY_STR, lexicon={"pa": ""})
+        project.save(compression=None)
+        with open('test_project.wwproj', 'rb') as f:
+            data = f.read()
+        self.assertEqual(data[:7], b"\x87\xaf\xfa\x87\x02\x00\x03")
+        self.assertEqual([data[7 + 24 * i:11 + 24 * i] for i in range(3)], [b"NAME", b"INVT", b"LEXI"])
+        self.assertTrue(data.endswith(b"\x00\x00\x00\x01\x00\x02pa"))
+        with self.assertRaises(ValueError):
+            project.save(version=3)
+
+    def test_from_file_glosses(self):
+        # Test that glosses, which version 1 files drop, are saved in version 2 files
+        lexicon = {"pa": "father", "dəɯ": "", "nun": "now"}
+        project = WordweaverProject('Test Project', file='test_project.wwproj', pulmonic_inventory=PULMONIC_INVENTORY,
+                                    vowel_inventory=VOWEL_INVENTORY, lexicon=lexicon)
+        project.save()
+        project = WordweaverProject.from_file('test_project.wwproj')
+        self.assertEqual(project.lexicon, lexicon)
+        self.assertEqual(str(project.vowel_inventory), str(VOWEL_INVENTORY))
+        project.save(version=1)
+        project = WordweaverProject.from_file('test_project.wwproj')
+        self.assertEqual(project.lexicon, dict.fromkeys(lexicon, ""))
+
+    def test_from_file_compressed(self):
+        # Test that compressed lexicons are read back in order, with their glosses
+        lexicon = {"pa": "father", "dəɯ": "", "nun": "now", "pun": ""}
+        project = WordweaverProject('Test Project', file='test_project.wwproj', lexicon=lexicon)
+        for compression in ("zlib", "lzma"):
+            project.save(compression=compression)
+            loaded = WordweaverProject.from_file('test_project.wwproj')
+            self.assertEqual(list(loaded.lexicon.items()), list(lexicon.items()))
+            words, glosses = WordweaverProject.read_sections('test_project.wwproj', "lexicon", "glosses")
+            self.assertEqual(words, list(lexicon))
+            self.assertEqual(glosses, list(lexicon.values()))
+        # a sorted lexicon needs no order section
+        project.lexicon = dict(sorted(lexicon.items()))
+        project.save()
+        loaded = WordweaverProject.from_file('test_project.wwproj')
+        self.assertEqual(list(loaded.lexicon.items()), sorted(lexicon.items()))
+        with self.assertRaises(ValueError):
+            project.save(compression="bz2")
+
+    def test_read_sections(self):
+        # Test reading only some sections, of both versions
+        project = WordweaverProject('Test Project', file='test_project.wwproj', vowel_inventory=VOWEL_INVENTORY_STR,
+                                    lexicon={"pa": "father"})
+        for version, weights in ((1, {}), (2, {"a": 2.0})):
+            project.phoneme_weights = weights
+            project.save(version=version)
+            name, lexicon, generator = WordweaverProject.read_sections('test_project.wwproj', "name", "lexicon",
+                                                                       "generator")
+            self.assertEqual(name, 'Test Project')
+            self.assertEqual(lexicon, ["pa"])
+            self.assertEqual(generator, {"phoneme_weights": weights} if weights else {})
+            inventories, = WordweaverProject.read_sections('test_project.wwproj', "inventories")
+            self.assertEqual(inventories, [[], [], VOWEL_INVENTORY_STR])
+        with self.assertRaises(ValueError):
+            WordweaverProject.read_sections('test_project.wwproj', "definitions")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file